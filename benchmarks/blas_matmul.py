@@ -0,0 +1,30 @@
+"""Exact modular matrix products through float64 BLAS against a plain float64 product of the same size."""
+
+import timeit
+
+import numpy as np
+from zmodn import Zmodn
+from zmodn.utils.float_matmul import split_plan
+
+SIZES = [100, 500, 1000, 2000]
+MODULES = [65521, 2**30 - 35, 2**61 - 1]
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'size':>6}{'float64':>14}" + "".join(f"{module:>22}" for module in MODULES))
+    for size in SIZES:
+        floats = rng.random((size, size))
+        timings = [min(timeit.repeat(lambda: floats @ floats, number=1, repeat=3))]
+        for module in MODULES:
+            matrix = Zmodn.from_array(rng.integers(0, module, (size, size), dtype=np.int64), module)
+            timings.append(min(timeit.repeat(lambda: matrix @ matrix, number=1, repeat=3)))
+        print(f"{size:>6}" + "".join(f"{seconds * 1e3:11.1f} ms" for seconds in timings[:1]), end="")
+        print("".join(f"{seconds * 1e3:19.1f} ms" for seconds in timings[1:]))
+    for module in MODULES:
+        a_limbs, _, b_limbs, _, tile = split_plan(module, SIZES[-1])
+        print(f"module {module}: {a_limbs} x {b_limbs} limbs, inner tiles of {tile}")
+
+
+if __name__ == "__main__":
+    main()
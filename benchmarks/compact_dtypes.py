@@ -0,0 +1,37 @@
+"""Memory footprint and throughput of compact representative dtypes against a plain int64 baseline."""
+
+import timeit
+
+import numpy as np
+from zmodn import Zmodn
+
+SIZE = 10_000_000
+MODULES = [2, 251, 65521, 2**31 - 1, 2**61 - 1]
+
+
+def best_of(function, repeat=5):
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(
+        f"{'module':>20} {'dtype':>7} {'MB':>7} {'int64 MB':>9} "
+        f"{'add ms':>8} {'int64 add':>10} {'mul ms':>8} {'int64 mul':>10}"
+    )
+    for module in MODULES:
+        a = Zmodn.from_array(rng.integers(0, module, SIZE, dtype=np.int64), module)
+        b = Zmodn.from_array(rng.integers(0, module, SIZE, dtype=np.int64), module)
+        raw_a, raw_b = a.representatives.astype(np.int64), b.representatives.astype(np.int64)
+        add = best_of(lambda: a + b)
+        mul = best_of(lambda: a * b)
+        raw_add = best_of(lambda: (raw_a + raw_b) % module)
+        raw_mul = best_of(lambda: (raw_a * raw_b) % module) if module < 2**31 else float("nan")
+        print(
+            f"{module:>20} {str(a.dtype):>7} {a.representatives.nbytes / 2**20:7.1f} {raw_a.nbytes / 2**20:9.1f} "
+            f"{add * 1e3:8.1f} {raw_add * 1e3:10.1f} {mul * 1e3:8.1f} {raw_mul * 1e3:10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Elimination on composite moduli, directly and split into prime powers with the Chinese remainder theorem."""
+
+import timeit
+
+import numpy as np
+from zmodn import Zmod
+from zmodn.utils.chinese_remainder import crt_apply
+from zmodn.utils.modular_elimination import modular_determinant, stacked_determinant, stacked_matrix_inverse
+
+SIZE = 100
+STACK = 20_000
+MODULES = [10**12, 1000003 * 1000033, (2**31 - 1) * (2**31 - 19), (2**31 - 1) * (2**31 - 19) * 1000003 * 97]
+
+
+def _determinant(matrix, module):
+    return np.array([modular_determinant(matrix, module)], dtype=matrix.dtype)
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'module':>30}{'operation':>16}{'route':>10}{'direct':>12}{'crt':>12}")
+    for module in MODULES:
+        ring = Zmod(module)
+        moduli = ring.crt_moduli
+        matrix = np.array(rng.integers(0, 1 << 62, (SIZE, SIZE)).tolist(), dtype=object) % module
+        stack = np.array(rng.integers(0, 1 << 62, (STACK, 4, 4)).tolist(), dtype=object) % module
+        matrix, stack = matrix.astype(ring.dtype), stack.astype(ring.dtype)
+        # Stacks of invertible matrices, so that the inverses do not stop at the first singular one.
+        singular = np.gcd(stacked_determinant(stack, module).astype(object), module) != 1
+        stack[singular] = np.eye(4, dtype=ring.dtype)
+        cases = {
+            "matrix det": ("matrix", _determinant, matrix),
+            "stack det": ("matrix_stack", stacked_determinant, stack),
+            "stack inverse": ("matrix_stack", stacked_matrix_inverse, stack),
+        }
+        for operation, (kind, function, array) in cases.items():
+            runs = (lambda: function(array, module), lambda: crt_apply(function, (array,), moduli, ring.dtype))
+            assert np.array_equal(runs[0](), runs[1]())
+            timings = [min(timeit.repeat(run, number=1, repeat=2)) for run in runs]
+            cells = "".join(f"{seconds * 1e3:9.1f} ms" for seconds in timings)
+            print(f"{module:>30}{operation:>16}{ring.route(kind):>10}{cells}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Long chains of additions and subtractions over Z/nZ with and without deferred reduction."""
+
+import timeit
+
+import numpy as np
+from zmodn import Zmodn
+
+SIZE = 1_000_000
+TERMS = 100
+MODULES = [251, 65521, 2**31 - 1, 2**32 + 15, 10**12 + 39, 2**61 - 1]
+
+
+def chain(terms):
+    total = terms[0]
+    for index, term in enumerate(terms[1:]):
+        total = total - term if index % 3 == 0 else total + term
+    return total
+
+
+def accumulate(terms):
+    total = +terms[0]
+    for term in terms[1:]:
+        total += term
+    return total
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'module':>22}{'chain':>12}{'deferred':>12}{'+=':>12}{'deferred':>12}")
+    for module in MODULES:
+        terms = [Zmodn.from_array(rng.integers(0, module, SIZE, dtype=np.int64), module) for _ in range(TERMS)]
+        timings = []
+        for function in (chain, accumulate):
+            for deferred in (False, True):
+                Zmodn.deferred_reduction = deferred
+                # Observing the result reduces it, so the timing includes the final reduction.
+                timings.append(min(timeit.repeat(lambda: function(terms).representatives, number=1, repeat=3)))
+        Zmodn.deferred_reduction = False
+        print(f"{module:>22}" + "".join(f"{seconds * 1e3:9.1f} ms" for seconds in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Timings and per-iteration allocations of ``acc = acc + x`` versus ``acc += x`` in a long accumulation loop."""
+
+import timeit
+import tracemalloc
+
+import numpy as np
+from zmodn import Zmodn
+
+SIZE = 1_000_000
+ITERATIONS = 100
+MODULE = 1_000_000_007
+
+
+def accumulate_out_of_place(accumulator, term):
+    accumulator = accumulator + term
+    return accumulator
+
+
+def accumulate_in_place(accumulator, term):
+    accumulator += term
+    return accumulator
+
+
+def bytes_allocated_per_iteration(step):
+    accumulator = Zmodn.from_array(np.zeros(SIZE, dtype=np.int64), MODULE)
+    term = Zmodn.from_array(np.arange(SIZE, dtype=np.int64), MODULE)
+    tracemalloc.start()
+    allocated = 0
+    for _ in range(ITERATIONS):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        accumulator = step(accumulator, term)
+        allocated += tracemalloc.get_traced_memory()[1] - current
+    tracemalloc.stop()
+    return allocated / ITERATIONS
+
+
+def main():
+    term = Zmodn.from_array(np.arange(SIZE, dtype=np.int64), MODULE)
+    for name, step in (("acc = acc + x", accumulate_out_of_place), ("acc += x", accumulate_in_place)):
+        accumulator = Zmodn.from_array(np.zeros(SIZE, dtype=np.int64), MODULE)
+
+        def loop():
+            nonlocal accumulator
+            for _ in range(ITERATIONS):
+                accumulator = step(accumulator, term)
+
+        seconds = min(timeit.repeat(loop, number=1, repeat=3))
+        allocated = bytes_allocated_per_iteration(step)
+        print(f"{name:>14}: {seconds / ITERATIONS * 1e3:8.3f} ms/iter, {allocated:12.0f} bytes allocated/iter")
+        if step is accumulate_in_place:
+            # The in-place loop must reuse its buffers instead of allocating arrays of the size of the operands.
+            assert allocated < term.representatives.nbytes // 4, f"acc += x allocated {allocated:.0f} bytes/iter"
+
+
+if __name__ == "__main__":
+    main()
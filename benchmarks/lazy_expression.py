@@ -0,0 +1,30 @@
+"""Eager versus lazy block-wise evaluation of ``a * b + c * d - e`` over Z/nZ."""
+
+import timeit
+
+import numpy as np
+from zmodn import Zmodn
+
+SIZE = 10_000_000
+MODULES = [251, 65521, 2**31 - 1, 2**32, 2**61 - 1]
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'module':>22}{'eager':>12}{'lazy':>12}")
+    for module in MODULES:
+        a, b, c, d, e = (Zmodn.from_array(rng.integers(0, module, SIZE, dtype=np.int64), module) for _ in range(5))
+
+        def eager():
+            return a * b + c * d - e
+
+        def lazy():
+            return (a.lazy() * b + c * d.lazy() - e).evaluate()
+
+        assert eager() == lazy()
+        timings = [min(timeit.repeat(function, number=1, repeat=3)) for function in (eager, lazy)]
+        print(f"{module:>22}" + "".join(f"{seconds * 1e3:9.1f} ms" for seconds in timings))
+
+
+if __name__ == "__main__":
+    main()
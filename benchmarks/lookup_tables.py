@@ -0,0 +1,47 @@
+"""Table-driven inversion, division and powers against the generic kernels for moduli up to 2**16."""
+
+import timeit
+
+import numpy as np
+from zmodn import Zmod
+from zmodn.utils.lookup_tables import table_power
+from zmodn.utils.modular_arithmetic import modular_divide, modular_multiply, modular_power
+from zmodn.utils.modular_inverse import vectorize_modular_inverse
+
+SIZE = 1_000_000
+EXPONENT = 10**6 + 3
+MODULES = [251, 4096, 60000, 65521]
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'module':>8}{'operation':>12}{'generic':>12}{'table':>12}")
+    for module in MODULES:
+        ring = Zmod(module)
+        units = np.flatnonzero(np.gcd(np.arange(module), module) == 1)
+        a = rng.choice(units, SIZE).astype(ring.dtype)
+        b = rng.choice(units, SIZE).astype(ring.dtype)
+        table = ring.inverse_table
+        cases = {
+            "inverse": (
+                lambda: vectorize_modular_inverse(a, module),
+                lambda: vectorize_modular_inverse(a, module, table=table),
+            ),
+            "divide": (
+                lambda: modular_divide(a, b, module),
+                lambda: modular_multiply(a, vectorize_modular_inverse(b, module, table=table), module),
+            ),
+        }
+        if ring.log_tables is not None:
+            cases["power"] = (
+                lambda: modular_power(a, EXPONENT, module),
+                lambda: table_power(a, EXPONENT, module, *ring.log_tables),
+            )
+        for operation, (generic, tabulated) in cases.items():
+            assert np.array_equal(generic(), tabulated())
+            timings = [min(timeit.repeat(function, number=1, repeat=3)) for function in (generic, tabulated)]
+            print(f"{module:>8}{operation:>12}" + "".join(f"{seconds * 1e3:9.1f} ms" for seconds in timings))
+
+
+if __name__ == "__main__":
+    main()
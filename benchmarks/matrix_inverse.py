@@ -0,0 +1,25 @@
+"""Scaling of the exact Gauss-Jordan matrix inverse over Z/nZ with the matrix size."""
+
+import timeit
+
+import numpy as np
+from zmodn import Zmodn
+
+SIZES = [2, 5, 10, 20, 50, 100, 200, 500, 1000]
+MODULES = [65521, 2**31 - 1, 2**61 - 1]
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'size':>6}" + "".join(f"{module:>22}" for module in MODULES))
+    for size in SIZES:
+        timings = []
+        for module in MODULES:
+            matrix = Zmodn.from_array(rng.integers(0, module, (size, size), dtype=np.int64), module)
+            repeat = 3 if size <= 200 else 1
+            timings.append(min(timeit.repeat(matrix.inv, number=1, repeat=repeat)))
+        print(f"{size:>6}" + "".join(f"{seconds * 1e3:19.1f} ms" for seconds in timings))
+
+
+if __name__ == "__main__":
+    main()
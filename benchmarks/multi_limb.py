@@ -0,0 +1,31 @@
+"""Throughput of the multi-limb backend for moduli above 2**63 against NumPy object arrays of Python integers."""
+
+import random
+import timeit
+
+import numpy as np
+from zmodn import Zmodn
+
+ELEMENTS = 10**5
+BITS = [64, 96, 127, 256, 1024]
+
+
+def main():
+    random.seed(0)
+    print(f"{'bits':>6}{'add':>14}{'object add':>14}{'mul':>14}{'object mul':>14}")
+    for bits in BITS:
+        module = random.getrandbits(bits) | 1 | (1 << (bits - 1))
+        first = np.array([random.randrange(module) for _ in range(ELEMENTS)], dtype=object)
+        second = np.array([random.randrange(module) for _ in range(ELEMENTS)], dtype=object)
+        limbs_first, limbs_second = Zmodn.from_array(first, module), Zmodn.from_array(second, module)
+        timings = [
+            min(timeit.repeat(lambda: limbs_first + limbs_second, number=1, repeat=5)),
+            min(timeit.repeat(lambda: (first + second) % module, number=1, repeat=5)),
+            min(timeit.repeat(lambda: limbs_first * limbs_second, number=1, repeat=5)),
+            min(timeit.repeat(lambda: first * second % module, number=1, repeat=5)),
+        ]
+        print(f"{bits:>6}" + "".join(f"{seconds * 1e3:11.1f} ms" for seconds in timings))
+
+
+if __name__ == "__main__":
+    main()
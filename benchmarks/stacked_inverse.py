@@ -0,0 +1,28 @@
+"""Throughput of batched inversion and determinants over Z/nZ for a million 4x4 matrices."""
+
+import timeit
+
+import numpy as np
+from zmodn import Zmodn
+
+BATCH = 1_000_000
+SIZE = 4
+MODULES = [2, 26, 251, 65521, 2**31 - 1, 2**61 - 1]
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'module':>22}{'det':>12}{'inv':>12}")
+    for module in MODULES:
+        stack = Zmodn.from_array(rng.integers(0, module, (BATCH, SIZE, SIZE), dtype=np.int64), module)
+        determinants = stack.det().representatives
+        units = np.gcd(determinants.astype(np.int64), module) == 1
+        invertible = Zmodn.from_array(stack.representatives[units], module)
+        # Scale the inversion timing up to the full batch, since only units can be inverted.
+        det_seconds = min(timeit.repeat(stack.det, number=1, repeat=3))
+        inv_seconds = min(timeit.repeat(invertible.inv, number=1, repeat=3)) * BATCH / len(invertible)
+        print(f"{module:>22}{det_seconds:10.2f} s{inv_seconds:10.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""Crossover between the direct BLAS modular matmul and Strassen-Winograd recursion with several cutoffs."""
+
+import timeit
+
+import numpy as np
+from zmodn import Zmodn
+
+SIZES = [512, 1024, 2048, 4096]
+CUTOFFS = [None, 256, 512, 1024]
+MODULE = 2**30 - 35
+
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'size':>6}" + "".join(f"{'cutoff ' + str(cutoff):>16}" for cutoff in CUTOFFS))
+    for size in SIZES:
+        matrix = Zmodn.from_array(rng.integers(0, MODULE, (size, size), dtype=np.int64), MODULE)
+        timings = []
+        for cutoff in CUTOFFS:
+            Zmodn.strassen_cutoff = cutoff
+            repeat = 3 if size <= 1024 else 1
+            timings.append(min(timeit.repeat(lambda: matrix @ matrix, number=1, repeat=repeat)))
+        Zmodn.strassen_cutoff = None
+        print(f"{size:>6}" + "".join(f"{seconds * 1e3:13.1f} ms" for seconds in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Dot product of two residue files read whole into memory against streamed in chunks, with peak memory."""
+
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+from zmodn import Zmod, Zmodn
+
+SIZE = 20_000_000
+MODULE = 2**31 - 1
+CHUNK_SIZES = [1 << 14, 1 << 17, 1 << 20]
+
+
+def measure(function):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def main():
+    rng = np.random.default_rng(0)
+    dtype = Zmod(MODULE).dtype
+    with tempfile.TemporaryDirectory() as directory:
+        paths = [os.path.join(directory, name) for name in ("first.bin", "second.bin")]
+        for path in paths:
+            rng.integers(0, MODULE, SIZE, dtype=dtype).tofile(path)
+
+        def in_memory():
+            first, second = (Zmodn.from_array(np.fromfile(path, dtype=dtype), MODULE) for path in paths)
+            return np.add.reduce(first * second)
+
+        expected, seconds, peak = measure(in_memory)
+        print(f"{'chunk size':>12}{'time':>12}{'peak memory':>16}")
+        print(f"{'in memory':>12}{seconds * 1e3:9.1f} ms{peak / 2**20:12.1f} MiB")
+        for chunk_size in CHUNK_SIZES:
+            first, second = (Zmodn.stream(path, MODULE, chunk_size) for path in paths)
+            result, seconds, peak = measure(lambda: first.dot(second))
+            assert result == expected
+            print(f"{chunk_size:>12}{seconds * 1e3:9.1f} ms{peak / 2**20:12.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
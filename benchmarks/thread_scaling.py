@@ -0,0 +1,30 @@
+"""Scaling of threaded modular matmul and elementwise products with the number of workers."""
+
+import os
+import timeit
+
+import numpy as np
+from zmodn import Zmodn
+
+WORKERS = [None, 2, 4, 8, 16]
+MODULE = 2**61 - 1
+ELEMENTS = 10**7
+SIZE = 2000
+
+
+def main():
+    rng = np.random.default_rng(0)
+    vector = Zmodn.from_array(rng.integers(0, MODULE, ELEMENTS, dtype=np.int64), MODULE)
+    matrix = Zmodn.from_array(rng.integers(0, MODULE, (SIZE, SIZE), dtype=np.int64), MODULE)
+    print(f"{os.cpu_count()} cores")
+    print(f"{'workers':>8}{'multiply':>16}{'matmul':>16}")
+    for workers in WORKERS:
+        Zmodn.workers = workers
+        multiply = min(timeit.repeat(lambda: vector * vector, number=1, repeat=3))
+        matmul = min(timeit.repeat(lambda: matrix @ matrix, number=1, repeat=1))
+        print(f"{str(workers or 1):>8}{multiply * 1e3:13.1f} ms{matmul * 1e3:13.1f} ms")
+    Zmodn.workers = None
+
+
+if __name__ == "__main__":
+    main()
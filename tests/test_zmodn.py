@@ -1,5 +1,11 @@
+import math
+import operator
+import os
+import tempfile
+import tracemalloc
+
 import numpy as np
-from zmodn import Zmodn
+from zmodn import LazyZmodn, MultiLimbZmodn, RNSZmodn, Zmod, Zmodn, ZmodnStream
 
 
 def test_init():
@@ -13,6 +19,14 @@ def test_init():
     assert np.array_equal(zmodn.representatives, np.array([2, 3]))
     assert zmodn.module == 5
 
+    # Test initialization with integers beyond int64 next to negative ones, reduced to the compact dtype
+    zmodn = Zmodn([2**63 + 5, -1], 2**62)
+    assert zmodn.representatives.tolist() == [5, 2**62 - 1]
+    assert zmodn.dtype == np.uint64
+    zmodn = Zmodn([[2**64 + 3, -2], [1, 2]], 7)
+    assert zmodn.representatives.tolist() == [[5, 5], [1, 2]]
+    assert zmodn.dtype == np.uint8
+
     # Test initialization with a non-integer argument
     try:
         zmodn = Zmodn("2", 5)
@@ -38,6 +52,66 @@ def test_init():
         assert False, "Expected ValueError"
 
 
+def test_from_array():
+    # Test wrapping an already reduced array without copying it
+    array = np.array([2, 3, 4], dtype=np.uint8)
+    zmodn = Zmodn.from_array(array, 5)
+    assert zmodn.representatives is array
+    assert zmodn.module == 5
+
+    # Test that copy=True always copies
+    zmodn = Zmodn.from_array(array, 5, copy=True)
+    assert zmodn.representatives is not array
+    assert np.array_equal(zmodn.representatives, array)
+
+    # Test that unreduced entries are reduced without modifying the input
+    array = np.array([[7, -1], [5, 12]])
+    zmodn = Zmodn.from_array(array, 5)
+    assert np.array_equal(zmodn.representatives, np.array([[2, 4], [0, 2]]))
+    assert np.array_equal(array, np.array([[7, -1], [5, 12]]))
+    assert zmodn == Zmodn([[7, -1], [5, 12]], 5)
+
+    # Test wrapping a scalar array
+    zmodn = Zmodn.from_array(np.int64(7), 5)
+    assert zmodn == Zmodn(2, 5)
+
+    # Test with a non-integer array
+    try:
+        Zmodn.from_array(np.array([1.0, 2.0]), 5)
+    except TypeError:
+        pass
+    else:
+        assert False, "Expected TypeError"
+
+    # Test with a non-positive module
+    try:
+        Zmodn.from_array(np.array([1, 2]), 0)
+    except ValueError:
+        pass
+    else:
+        assert False, "Expected ValueError"
+
+
+def test_dtype():
+    # Test that representatives use the narrowest unsigned dtype that holds module - 1
+    assert Zmodn([1, 0], 2).dtype == np.uint8
+    assert Zmodn([1, 255], 256).dtype == np.uint8
+    assert Zmodn([1, 256], 257).dtype == np.uint16
+    assert Zmodn([1, 65520], 65521).dtype == np.uint16
+    assert Zmodn([1, 2], 2**31 - 1).dtype == np.uint32
+    assert Zmodn([1, 2], 2**61 - 1).dtype == np.uint64
+
+    # Test that results keep the compact dtype and are computed in wider intermediates
+    for module in [2, 251, 256, 65521, 65536, 2**31 - 1, 2**32]:
+        integers = [module - 1, module - 2, module // 2, 1]
+        zmodn = Zmodn(integers, module)
+        assert (zmodn * zmodn).dtype == zmodn.dtype
+        assert [int(x) for x in (zmodn * zmodn).representatives] == [x * x % module for x in integers]
+        assert [int(x) for x in (zmodn + zmodn).representatives] == [2 * x % module for x in integers]
+        assert [int(x) for x in (-zmodn - zmodn).representatives] == [-2 * x % module for x in integers]
+        assert int(zmodn @ zmodn) == sum(x * x for x in integers) % module
+
+
 def test_repr():
     # Test __repr__ with a single representative
     zmodn = Zmodn(2, 5)
@@ -55,6 +129,45 @@ def test_mod_inv():
     assert np.array_equal(zmodn_inverse.representatives, np.array([3]))
 
 
+def test_mod_inv_batch():
+    # Test inverting many residues at once, including composite moduli
+    for module in [7, 256, 65521, 2**32, 2**61 - 1, 1000003 * 999983]:
+        integers = [x for x in [1, 3, 5, 7, 11, 12345, module - 1] if np.gcd(x, module) == 1]
+        zmodn_inverse = Zmodn(integers, module).mod_inv()
+        assert [int(x) for x in zmodn_inverse.representatives] == [pow(x, -1, module) for x in integers]
+
+    # Test that the failing positions are reported
+    try:
+        Zmodn([1, 2, 5, 4], 6).mod_inv()
+    except ValueError as error:
+        assert "[(1,), (3,)]" in str(error)
+    else:
+        assert False, "Expected ValueError"
+
+
+def test_xgcd():
+    # Test Bezout coefficients for a composite module
+    zmodn = Zmodn([0, 1, 4, 9, 15, 35], 36)
+    gcd, x, y = zmodn.xgcd()
+    assert np.array_equal(gcd, np.array([36, 1, 4, 9, 3, 1]))
+    assert np.array_equal(zmodn.representatives * x + 36 * y, gcd)
+    assert int(x[5] % 36) == int(Zmodn(35, 36).mod_inv())
+
+    # Test a large composite module
+    module = 1000003 * 999983
+    zmodn = Zmodn([2, 1000003, module - 1], module)
+    gcd, x, y = zmodn.xgcd()
+    assert np.array_equal(gcd, np.array([1, 1000003, 1]))
+    assert [int(x[i]) % module for i in (0, 2)] == [pow(2, -1, module), module - 1]
+
+    # Test moduli above 2**64, in the multi-limb backend and in object arrays
+    for module in [2**64 + 13, 2**89 - 1, 2**200 + 1]:
+        integers = [0, 1, 6, 2**64 - 1, module - 1]
+        gcd, x, y = Zmodn(integers, module).xgcd()
+        assert gcd.tolist() == [math.gcd(value, module) for value in integers]
+        assert [a * b + module * c for a, b, c in zip(integers, x, y)] == gcd.tolist()
+
+
 def test_inv():
     # Test inverse of a square matrix
     zmodn_matrix = Zmodn([[1, 2], [3, 4]], 5)
@@ -98,6 +211,547 @@ def test_inv():
         assert False, "Expected ValueError"
 
 
+def test_inv_gauss_jordan():
+    # Test that the inverse is exact for larger matrices and large moduli
+    rng = np.random.default_rng(0)
+    for module in [65521, 2**31 - 1, 2**61 - 1]:
+        matrix = Zmodn.from_array(rng.integers(0, module, (30, 30), dtype=np.int64), module)
+        identity = Zmodn.from_array(np.eye(30, dtype=np.int64), module)
+        assert matrix @ matrix.inv() == identity
+        assert matrix.inv() @ matrix == identity
+
+    # Test a matrix that is invertible modulo a composite module although no entry of its first column is a unit
+    zmodn_matrix = Zmodn([[2, 3], [3, 2]], 6)
+    assert zmodn_matrix @ zmodn_matrix.inv() == Zmodn([[1, 0], [0, 1]], 6)
+
+    # Test a singular matrix modulo a prime
+    zmodn_matrix = Zmodn([[1, 2, 3], [4, 5, 6], [5, 7, 9]], 11)
+    try:
+        zmodn_matrix.inv()
+    except ValueError:
+        pass
+    else:
+        assert False, "Expected ValueError"
+
+    # Test a matrix that is singular modulo one prime factor of a composite module only
+    zmodn_matrix = Zmodn([[3, 1, 4], [1, 5, 9], [2, 6, 1]], 12)
+    try:
+        zmodn_matrix.inv()
+    except ValueError:
+        pass
+    else:
+        assert False, "Expected ValueError"
+
+
+def test_det():
+    # Test the determinant of small matrices
+    assert Zmodn([[1, 2], [3, 4]], 5).det() == Zmodn(3, 5)
+    assert Zmodn([[1, 2], [3, 4]], 6).det() == Zmodn(4, 6)
+    assert Zmodn([[2, 3], [3, 2]], 6).det() == Zmodn(1, 6)
+    assert Zmodn([[1, 2, 3], [4, 5, 6], [5, 7, 9]], 11).det() == Zmodn(0, 11)
+
+    # Test a determinant that would overflow in floating point
+    rng = np.random.default_rng(1)
+    module = 2**61 - 1
+    matrix = rng.integers(0, module, (12, 12), dtype=np.int64)
+    determinant = 1
+    rows = [[int(x) for x in row] for row in matrix]
+    for column in range(12):
+        pivot = next(row for row in range(column, 12) if rows[row][column] % module)
+        if pivot != column:
+            rows[column], rows[pivot] = rows[pivot], rows[column]
+            determinant = -determinant
+        determinant = determinant * rows[column][column] % module
+        inverse = pow(rows[column][column], -1, module)
+        for row in range(column + 1, 12):
+            factor = rows[row][column] * inverse % module
+            rows[row] = [(a - factor * b) % module for a, b in zip(rows[row], rows[column])]
+    assert int(Zmodn.from_array(matrix, module).det()) == determinant % module
+
+    # Test the determinant of a non-square matrix
+    try:
+        Zmodn([[1, 2, 3], [4, 5, 6]], 7).det()
+    except ValueError:
+        pass
+    else:
+        assert False, "Expected ValueError"
+
+
+def test_lu_solve():
+    # Test that P @ A == L @ U
+    rng = np.random.default_rng(2)
+    for module in [7, 65521, 2**61 - 1]:
+        matrix = Zmodn.from_array(rng.integers(0, module, (8, 8), dtype=np.int64), module)
+        factorization = matrix.lu()
+        assert factorization.P @ matrix == factorization.L @ factorization.U
+        assert np.array_equal(np.triu(factorization.U.representatives), factorization.U.representatives)
+        assert np.array_equal(np.tril(factorization.L.representatives), factorization.L.representatives)
+
+        # Test solving for a single vector and for a block of right-hand sides
+        vector = Zmodn.from_array(rng.integers(0, module, 8, dtype=np.int64), module)
+        assert matrix @ factorization.solve(vector) == vector
+        block = Zmodn.from_array(rng.integers(0, module, (8, 5), dtype=np.int64), module)
+        assert matrix @ matrix.solve(block) == block
+
+    # Test that the factorization is cached until the representatives change
+    matrix = Zmodn([[0, 1], [1, 1]], 5)
+    factorization = matrix.lu()
+    assert matrix.lu() is factorization
+    matrix[1] = 3
+    assert matrix.lu() is not factorization
+    assert matrix.lu().P @ matrix == matrix.lu().L @ matrix.lu().U
+
+    # Test a singular matrix
+    try:
+        Zmodn([[1, 2], [2, 4]], 5).lu()
+    except ValueError:
+        pass
+    else:
+        assert False, "Expected ValueError"
+
+    # Test solving an invertible matrix over a composite module whose first column has no unit
+    matrix = Zmodn([[2, 3], [3, 2]], 6)
+    assert matrix.solve(Zmodn([1, 0], 6)) == Zmodn([2, 3], 6)
+    block = Zmodn([[1, 4], [5, 0]], 6)
+    assert matrix @ matrix.solve(block) == block
+    try:
+        Zmodn([[2, 4], [3, 6]], 6).solve(Zmodn([1, 0], 6))
+    except ValueError:
+        pass
+    else:
+        assert False, "Expected ValueError"
+
+
+def test_matrix_power():
+    # Test Fibonacci numbers modulo a prime through a huge power of the transition matrix
+    module = 10**9 + 7
+    transition = Zmodn([[1, 1], [1, 0]], module)
+    fibonacci = [0, 1]
+    for _ in range(100):
+        fibonacci.append((fibonacci[-1] + fibonacci[-2]) % module)
+    assert int(transition.matrix_power(100)[0, 1].representatives[0]) == fibonacci[100]
+    assert transition.matrix_power(10**18) == transition.matrix_power(10**18 % (2 * (module + 1)))
+
+    # Test the zeroth and negative powers
+    assert transition.matrix_power(0) == Zmodn([[1, 0], [0, 1]], module)
+    assert transition.matrix_power(-5) @ transition.matrix_power(5) == Zmodn([[1, 0], [0, 1]], module)
+
+    # Test dispatch from numpy
+    matrix = Zmodn([[1, 2], [3, 4]], 5)
+    assert np.linalg.matrix_power(matrix, 3) == matrix @ matrix @ matrix
+
+    # Test a non-integer exponent
+    try:
+        matrix.matrix_power(2.0)
+    except TypeError:
+        pass
+    else:
+        assert False, "Expected TypeError"
+
+
+def test_matmul_exact_blas():
+    # Test products against Python integers, with inner dimensions spanning several float64 tiles
+    rng = np.random.default_rng(0)
+    for module, inner in [(7, 10), (2**30 - 35, 50), (2**61 - 1, 2100), (2**62, 30), (2**64, 30)]:
+        left = [[int(value) % module for value in row] for row in rng.integers(0, 2**63, (2, inner), dtype=np.int64)]
+        right = [[int(value) % module for value in row] for row in rng.integers(0, 2**63, (inner, 3), dtype=np.int64)]
+        left_matrix = Zmodn.from_array(np.array(left, dtype=np.uint64), module)
+        product = left_matrix @ Zmodn.from_array(np.array(right, dtype=np.uint64), module)
+        expected = [[sum(a * b for a, b in zip(row, column)) % module for column in zip(*right)] for row in left]
+        assert product.representatives.tolist() == expected
+
+    # Test matrix-vector and vector-vector products
+    matrix, vector = Zmodn([[1, 2], [3, 4]], 5), Zmodn([1, 1], 5)
+    assert np.array_equal((matrix @ vector).representatives, [3, 2])
+    assert np.array_equal((vector @ vector).representatives, [2])
+
+
+def test_strassen_winograd():
+    # Test that the recursion agrees with the direct product, including odd and rectangular shapes
+    rng = np.random.default_rng(0)
+    module = 2**61 - 1
+    left = Zmodn.from_array(rng.integers(0, module, (37, 41), dtype=np.int64), module)
+    right = Zmodn.from_array(rng.integers(0, module, (41, 29), dtype=np.int64), module)
+    expected = left @ right
+    try:
+        Zmodn.strassen_cutoff = 8
+        assert left @ right == expected
+        square = Zmodn.from_array(rng.integers(0, module, (33, 33), dtype=np.int64), module)
+        product = Zmodn.from_array(square.representatives, module, copy=True)
+        product @= square
+        Zmodn.strassen_cutoff = None
+        assert product == square @ square
+    finally:
+        Zmodn.strassen_cutoff = None
+
+
+def test_thread_pool():
+    # Test that threaded operations agree with the single-threaded ones
+    rng = np.random.default_rng(0)
+    module = 2**61 - 1
+    first = Zmodn.from_array(rng.integers(0, module, (30, 40), dtype=np.int64), module)
+    second = Zmodn.from_array(rng.integers(0, module, (30, 40), dtype=np.int64), module)
+    row = Zmodn.from_array(rng.integers(0, module, 40, dtype=np.int64), module)
+    transposed = Zmodn.from_array(second.representatives.T.copy(), module)
+    expected = [first + second, first - row, first * second, first @ transposed]
+    chunk_size = Zmodn.chunk_size
+    try:
+        Zmodn.workers, Zmodn.chunk_size = 4, 64
+        assert [first + second, first - row, first * second, first @ transposed] == expected
+        product = Zmodn.from_array(first.representatives, module, copy=True)
+        product *= second
+        assert product == expected[2]
+    finally:
+        Zmodn.workers, Zmodn.chunk_size = None, chunk_size
+
+
+def test_rns():
+    # Test arithmetic modulo a 1024-bit module against Python integers
+    rng = np.random.default_rng(0)
+    module = int.from_bytes(rng.bytes(128), "little") | 1
+    left = [[int.from_bytes(rng.bytes(128), "little") % module for _ in range(4)] for _ in range(3)]
+    right = [[int.from_bytes(rng.bytes(128), "little") % module for _ in range(3)] for _ in range(4)]
+    first, second = RNSZmodn(left, module), RNSZmodn(right, module)
+    expected = [[sum(a * b for a, b in zip(row, column)) % module for column in zip(*right)] for row in left]
+    assert (first @ second).to_integers().tolist() == expected
+    transposed = RNSZmodn([list(column) for column in zip(*right)], module)
+    assert (first * transposed - first).to_integers().tolist() == [
+        [(a * b - a) % module for a, b in zip(row, column)] for row, column in zip(left, zip(*right))
+    ]
+
+    # Test repeated squaring, which needs intermediate reductions through the Chinese remainder theorem
+    power = first
+    for _ in range(5):
+        power = power * power
+    assert power.to_integers().tolist() == [[pow(a, 32, module) for a in row] for row in left]
+
+    # Test a different module
+    try:
+        first + RNSZmodn(left, module + 2)
+    except ValueError:
+        pass
+    else:
+        assert False, "Expected ValueError"
+
+
+def test_multi_limb():
+    # Test that moduli above 2**63 select the multi-limb backend and agree with Python integers
+    rng = np.random.default_rng(0)
+    for module in [2**63 + 29, 2**64, 2**127 - 1, 2**130 + 3]:
+        left = [[int.from_bytes(rng.bytes(17), "little") % module for _ in range(3)] for _ in range(3)]
+        right = [[int.from_bytes(rng.bytes(17), "little") % module for _ in range(3)] for _ in range(3)]
+        first, second = Zmodn(left, module), Zmodn(right, module)
+        assert isinstance(first, MultiLimbZmodn) == (module < 2**128)
+        pairs = [(row_a, row_b) for row_a, row_b in zip(left, right)]
+        assert (first + second).representatives.tolist() == [
+            [(a + b) % module for a, b in zip(*pair)] for pair in pairs
+        ]
+        assert (first - second).representatives.tolist() == [
+            [(a - b) % module for a, b in zip(*pair)] for pair in pairs
+        ]
+        assert (first * second).representatives.tolist() == [[a * b % module for a, b in zip(*pair)] for pair in pairs]
+        assert (first**3).representatives.tolist() == [[pow(a, 3, module) for a in row] for row in left]
+        expected = [[sum(a * b for a, b in zip(row, column)) % module for column in zip(*right)] for row in left]
+        assert (first @ second).representatives.tolist() == expected
+
+    # Test in-place operators, indexing and inversion
+    module = 2**89 - 1
+    matrix = Zmodn([[2, 3], [5, 7]], module)
+    copy = Zmodn([[2, 3], [5, 7]], module)
+    copy += matrix
+    assert copy == Zmodn([[4, 6], [10, 14]], module)
+    copy[0, 0] = 1
+    assert int(copy[0, 0]) == 1
+    assert matrix.inv() @ matrix == Zmodn([[1, 0], [0, 1]], module)
+
+
+def test_stacked_matrices():
+    # Test that batched inversion, determinants and solves agree with the routines for a single matrix
+    rng = np.random.default_rng(0)
+    for module in [26, 97, 2**31 - 1, 2**61 - 1]:
+        stack = Zmodn(rng.integers(0, min(module, 2**62), (50, 3, 3)).tolist(), module)
+        assert stack.representatives.shape == (50, 3, 3)
+        determinants = stack.det()
+        for index in range(50):
+            matrix = Zmodn(stack.representatives[index].tolist(), module)
+            assert int(determinants[index]) == int(matrix.det())
+        invertible = [index for index in range(50) if np.gcd(int(determinants[index]), module) == 1]
+        subset = Zmodn(stack.representatives[invertible].tolist(), module)
+        inverses = subset.inv()
+        rhs = Zmodn(rng.integers(0, min(module, 2**62), (len(invertible), 3)).tolist(), module)
+        solutions = subset.solve(rhs)
+        for position, index in enumerate(invertible):
+            matrix = Zmodn(stack.representatives[index].tolist(), module)
+            assert inverses.representatives[position].tolist() == matrix.inv().representatives.tolist()
+            vector = Zmodn(rhs.representatives[position].tolist(), module)
+            assert solutions.representatives[position].tolist() == matrix.solve(vector).representatives.tolist()
+        assert (subset @ inverses).representatives.tolist() == [np.eye(3, dtype=int).tolist()] * len(invertible)
+
+    # Test that a singular matrix in the stack is reported with its position
+    stack = Zmodn([[[1, 2], [3, 4]], [[2, 4], [1, 2]], [[1, 0], [0, 1]]], 7)
+    try:
+        stack.inv()
+    except ValueError as error:
+        assert "[1]" in str(error)
+    else:
+        assert False, "Expected ValueError"
+
+
+def test_lazy():
+    # Test that lazy expressions agree with eager arithmetic for small, wrapping, word and multi-limb moduli
+    rng = np.random.default_rng(0)
+    for module in [7, 256, 65521, 2**31 - 1, 2**61 - 1, 2**89 - 1]:
+        a, b, c, d, e = (Zmodn(rng.integers(0, 2**62, (10, 3)).tolist(), module) for _ in range(5))
+        expression = a.lazy() * b + c * d.lazy() - e
+        assert isinstance(expression, LazyZmodn)
+        assert expression.evaluate(block_size=4) == a * b + c * d - e
+        chain, expected = a.lazy(), a
+        for _ in range(20):
+            chain, expected = chain * b - (-c) * 3, expected * b - (-c) * 3
+        assert chain.evaluate(block_size=7) == expected
+        assert (2 - a.lazy() ** 3 * np.array([1, -1, 2])).evaluate() == 2 - a**3 * np.array([1, -1, 2])
+
+    # Test that in-place operators with a lazy operand defer to it and give a lazy expression
+    for module in [7, 2**89 - 1]:
+        a, b = Zmodn([3, 1, 4, 1, 5], module), Zmodn([1, 2, 3, 4, 5], module)
+        for inplace, eager in [
+            (operator.iadd, operator.add),
+            (operator.isub, operator.sub),
+            (operator.imul, operator.mul),
+            (operator.itruediv, operator.truediv),
+        ]:
+            result = inplace(Zmodn([3, 1, 4, 1, 5], module), b.lazy())
+            assert isinstance(result, LazyZmodn)
+            assert result.evaluate() == eager(a, b)
+
+    # Test division, which reports non-invertible divisors with their positions
+    a = Zmodn([3, 1, 4, 1, 5], 7)
+    assert (a.lazy() / Zmodn([1, 2, 3, 4, 5], 7) + 1).evaluate() == a / Zmodn([1, 2, 3, 4, 5], 7) + 1
+    try:
+        (a.lazy() / Zmodn([1, 2, 3, 0, 5], 7)).evaluate(block_size=2)
+    except ValueError as error:
+        assert "(3,)" in str(error)
+    else:
+        assert False, "Expected ValueError"
+
+    # Test a different module
+    try:
+        a.lazy() + Zmodn([1, 2, 3, 4, 5], 5)
+    except ValueError:
+        pass
+    else:
+        assert False, "Expected ValueError"
+
+
+def test_deferred_reduction():
+    # Test long chains of additions and subtractions without intermediate reductions
+    Zmodn.deferred_reduction = True
+    try:
+        for module in [7, 251, 65521, 2**32 + 15, 2**61 - 1]:
+            terms = [Zmodn([(index * 37 + offset) % module for offset in range(4)], module) for index in range(300)]
+            integers = [np.array(term.representatives.tolist(), dtype=object) for term in terms]
+            total, accumulator, expected = terms[0], +terms[0], integers[0]
+            for index in range(1, 300):
+                if index % 3:
+                    total, expected = total + terms[index], expected + integers[index]
+                    accumulator += terms[index]
+                else:
+                    total, expected = -(total - terms[index]), -(expected - integers[index])
+                    accumulator -= terms[index]
+                    accumulator = -accumulator
+            assert total == Zmodn((expected % module).tolist(), module)
+            assert accumulator == total
+            assert repr(total) == repr(Zmodn((expected % module).tolist(), module))
+            assert int((total + 3)[0]) == (int(expected[0]) + 3) % module
+    finally:
+        Zmodn.deferred_reduction = False
+
+
+def test_ring():
+    # Test that rings are interned per module and cache the arithmetic data of the module
+    ring = Zmod(720)
+    assert ring is Zmod(720) and ring is Zmodn([1, 2], 720).ring
+    zmodn = Zmodn([1, 2], 720)
+    assert zmodn.ring is ring and vars(zmodn)["ring"] is ring
+    assert ring.factorization == {2: 4, 3: 2, 5: 1}
+    assert ring.totient == 192
+    assert ring.carmichael == 12
+    assert not ring.is_prime and Zmod(2**61 - 1).is_prime
+    assert ring.inverse_table[7] * 7 % 720 == 1 and ring.inverse_table[6] == 0
+    assert ring([7, 11]) == Zmodn([7, 11], 720)
+
+    # Test that huge and negative exponents agree with Python integers, for units and non-units
+    for module in [720, 97, 2**61 - 1, 2**89 - 1]:
+        integers = [0, 1, 2, 6, 7, 30]
+        zmodn = Zmodn(integers, module)
+        for exponent in [10**30 + 7, 2**100]:
+            assert (zmodn**exponent).representatives.tolist() == [pow(x, exponent, module) for x in integers]
+        units = Zmodn([1, 7, 11], module)
+        assert (units ** -(10**20)).representatives.tolist() == [pow(x, -(10**20), module) for x in [1, 7, 11]]
+
+    # Test division and inversion through the inverse table of the ring
+    zmodn = Zmodn([7, 11, 13], 720)
+    assert zmodn / zmodn == Zmodn([1, 1, 1], 720)
+    try:
+        Zmodn([7, 6], 720).mod_inv()
+    except ValueError:
+        pass
+    else:
+        assert False, "Expected ValueError"
+
+    # Test a module that is not a positive integer
+    try:
+        Zmod(0)
+    except ValueError:
+        pass
+    else:
+        assert False, "Expected ValueError"
+
+
+def test_lookup_tables():
+    # Test powers through logarithm tables against Python integers, including zero bases and array exponents
+    for module in [2, 251, 65521]:
+        log, exp = Zmod(module).log_tables
+        assert sorted(exp.tolist()) == list(range(1, module))
+        integers = list(range(0, module, max(module // 200, 1)))
+        zmodn = Zmodn(integers, module)
+        for exponent in [0, 1, 5, module - 1, 10**20 + 3]:
+            assert (zmodn**exponent).representatives.tolist() == [pow(x, exponent, module) for x in integers]
+        exponents = np.arange(len(integers)) % 7
+        assert (zmodn**exponents).representatives.tolist() == [
+            pow(x, int(e), module) for x, e in zip(integers, exponents)
+        ]
+        units = Zmodn(integers[1:], module)
+        assert (units**-3).representatives.tolist() == [pow(x, -3, module) for x in integers[1:]]
+
+    # Test that composite moduli have inverse tables but no logarithm tables
+    assert Zmod(4096).log_tables is None
+    assert Zmod(4096).inverse_table[3] == pow(3, -1, 4096)
+    assert Zmod(65537).inverse_table is None
+
+    # Test uint64 exponents above 2**63, which do not fit in int64
+    exponents = np.array([2**64 - 1, 2**63 + 5, 1], dtype=np.uint64)
+    assert (Zmodn([2, 3, 0], 7) ** exponents).representatives.tolist() == [
+        pow(x, int(e), 7) for x, e in zip([2, 3, 0], exponents)
+    ]
+
+    # Test zero raised to a negative power
+    try:
+        Zmodn([1, 0], 251) ** -1
+    except ValueError:
+        pass
+    else:
+        assert False, "Expected ValueError"
+
+
+def test_routes():
+    # Test that moduli with large prime factors are factored by Pollard's rho method
+    ring = Zmod((2**31 - 1) * (2**31 - 19))
+    assert ring.factorization == {2**31 - 19: 1, 2**31 - 1: 1}
+    assert Zmod(2**64 - 1).factorization == {3: 1, 5: 1, 17: 1, 257: 1, 641: 1, 65537: 1, 6700417: 1}
+    assert Zmod(1000003**2 * 1000033).crt_moduli == (1000003**2, 1000033)
+
+    # Test the algorithms chosen from the size, primality and factorization of the module
+    assert Zmod(65521).routes == {"inverse": "table", "power": "table", "matrix": "field", "matrix_stack": "field"}
+    assert Zmod(10**12).routes == {
+        "inverse": "batch",
+        "power": "carmichael",
+        "matrix": "euclidean",
+        "matrix_stack": "crt",
+    }
+    assert ring.route("matrix") == "crt" and Zmod(2**61 - 1).route("matrix") == "field"
+    assert Zmod(2**89 - 1).routes["inverse"] == "object"
+    try:
+        ring.route("transpose")
+    except ValueError:
+        pass
+    else:
+        assert False, "Expected ValueError"
+
+    # Test determinants, inverses and solves split over the prime powers of the module
+    module = (2**31 - 1) * (2**31 - 19)
+    matrix = Zmodn([[2, 3, 5], [7, 11, 13], [17, 19, 23]], module)
+    assert matrix.det() == Zmodn([module - 78], module)
+    assert matrix @ matrix.inv() == Zmodn(np.eye(3, dtype=int).tolist(), module)
+    stack = Zmodn([[[2, 3], [5, 7]], [[1, 2], [3, 4]]], module)
+    assert stack.det() == Zmodn([module - 1, module - 2], module)
+    solution = stack.solve(Zmodn([[1, 1], [5, 6]], module))
+    products = np.einsum("...ij,...j->...i", stack.representatives.astype(object), solution.representatives)
+    assert (products % module).tolist() == [[1, 1], [5, 6]]
+
+    # Test a matrix that is singular modulo one prime factor only
+    try:
+        Zmodn([[1, 2], [3, 6 + 2**31 - 1]], module).inv()
+    except ValueError:
+        pass
+    else:
+        assert False, "Expected ValueError"
+
+
+def test_stream():
+    # Test elementwise operations between streams and with broadcast operands, chunk by chunk
+    module = 2**31 - 1
+    first = Zmodn(list(range(0, 3000, 3)), module)
+    second = Zmodn(list(range(5, 1005)), module)
+    stream = Zmodn.stream(first.representatives, module, chunk_size=128)
+    other = Zmodn.stream(iter(second.representatives.reshape(40, 25)), module, chunk_size=100)
+    assert isinstance(stream, ZmodnStream)
+    assert (stream * other + 7 - stream).collect() == first * second + 7 - first
+    assert (2 - stream).collect() == 2 - first and (stream**3).collect() == first**3
+    assert [len(block) for block in stream] == [128] * 7 + [104]
+
+    # Test that in-place operators with a stream operand defer to it and give a stream
+    for module in [2**31 - 1, 2**89 - 1]:
+        scalar, integers = Zmodn([5], module), Zmodn(list(range(1, 301)), module)
+        for inplace, eager in [
+            (operator.iadd, operator.add),
+            (operator.isub, operator.sub),
+            (operator.imul, operator.mul),
+            (operator.itruediv, operator.truediv),
+        ]:
+            result = inplace(Zmodn([5], module), Zmodn.stream(integers, module, chunk_size=64))
+            assert isinstance(result, ZmodnStream)
+            assert result.collect() == eager(scalar, integers)
+
+    # Test reductions against Python integers, including moduli beyond 2**63
+    for module in [26, 2**31 - 1, 2**89 - 1]:
+        integers = [3**k for k in range(300)]
+        stream = Zmodn.stream(iter([integers[:100], integers[100:]]), module, chunk_size=64)
+        assert stream.sum() == Zmodn([sum(integers) % module], module)
+        stream = Zmodn.stream(Zmodn(integers, module), module, chunk_size=64)
+        assert stream.prod() == Zmodn([math.prod(integers) % module], module)
+        assert stream.dot(stream) == Zmodn([sum(x * x for x in integers) % module], module)
+
+    # Test writing a stream to a file, an array and a function, and streaming the file back
+    module = 65521
+    stream = Zmodn.stream(first.representatives, module, chunk_size=300)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "residues.bin")
+        assert (stream * stream).write(path) == 1000
+        assert Zmodn.stream(path, module, chunk_size=77).collect() == Zmod(module)(first.representatives) ** 2
+    sink = np.zeros(1000, dtype=Zmod(module).dtype)
+    stream.write(sink)
+    assert sink.tolist() == (first.representatives % module).tolist()
+    blocks = []
+    assert stream.write(blocks.append) == 1000 and len(blocks) == 4
+
+    # Test streams of different lengths
+    try:
+        (stream + Zmodn.stream(np.arange(10), module, chunk_size=300)).sum()
+    except ValueError:
+        pass
+    else:
+        assert False, "Expected ValueError"
+
+    # Test a source that is not iterable
+    try:
+        Zmodn.stream(3.5, module)
+    except TypeError:
+        pass
+    else:
+        assert False, "Expected TypeError"
+
+
 def test_add():
     # Test addition
     zmodn = Zmodn(2, 5)
@@ -113,10 +767,19 @@ def test_add():
     else:
         assert False, "Expected ValueError"
 
-    # Test addition with a non-Zmodn object
+    # Test addition with integers and integer arrays, which broadcast and reduce modulo the module
+    zmodn = Zmodn([[1, 2], [3, 4]], 5)
+    assert zmodn + 2 == Zmodn([[3, 4], [0, 1]], 5)
+    assert 2 + zmodn == zmodn + 2
+    assert zmodn + np.int64(-1) == Zmodn([[0, 1], [2, 3]], 5)
+    assert zmodn + np.array([10, 1]) == Zmodn([[1, 3], [3, 0]], 5)
+    assert np.array([10, 1]) + zmodn == zmodn + np.array([10, 1])
+    assert zmodn + np.array([[1], [2]]) == Zmodn([[2, 3], [0, 1]], 5)
+
+    # Test addition with a non-integer object
     zmodn = Zmodn(2, 5)
     try:
-        zmodn_sum = zmodn + 2
+        zmodn_sum = zmodn + 2.0
     except TypeError:
         pass
     else:
@@ -147,10 +810,17 @@ def test_sub():
     else:
         assert False, "Expected ValueError"
 
-    # Test subtraction with a non-Zmodn object
+    # Test subtraction with integers and integer arrays on either side
+    zmodn = Zmodn([1, 2, 3], 5)
+    assert zmodn - 2 == Zmodn([4, 0, 1], 5)
+    assert 2 - zmodn == Zmodn([1, 0, 4], 5)
+    assert zmodn - np.array([3, 3, 3]) == Zmodn([3, 4, 0], 5)
+    assert np.array([3, 3, 3]) - zmodn == Zmodn([2, 1, 0], 5)
+
+    # Test subtraction with a non-integer array
     zmodn = Zmodn(2, 5)
     try:
-        zmodn_sub = zmodn - 2
+        zmodn_sub = zmodn - np.array([2.0])
     except TypeError:
         pass
     else:
@@ -181,10 +851,17 @@ def test_mul():
     else:
         assert False, "Expected ValueError"
 
-    # Test multiplication with a non-Zmodn object
+    # Test multiplication with integers and integer arrays on either side
+    zmodn = Zmodn([1, 2, 3], 5)
+    assert zmodn * 2 == Zmodn([2, 4, 1], 5)
+    assert -2 * zmodn == Zmodn([3, 1, 4], 5)
+    assert zmodn * np.array([[1], [2]]) == Zmodn([[1, 2, 3], [2, 4, 1]], 5)
+    assert np.uint8(3) * zmodn == Zmodn([3, 1, 4], 5)
+
+    # Test multiplication with a non-integer object
     zmodn = Zmodn(2, 5)
     try:
-        zmodn_product = zmodn * 2
+        zmodn_product = zmodn * 2.5
     except TypeError:
         pass
     else:
@@ -215,7 +892,12 @@ def test_matmul():
     else:
         assert False, "Expected ValueError"
 
-    # Test matrix multiplication with a non-Zmodn object
+    # Test matrix multiplication with integer arrays on either side
+    zmodn_matrix = Zmodn([[1, 2], [3, 4]], 5)
+    assert zmodn_matrix @ np.array([1, 1]) == Zmodn([3, 2], 5)
+    assert np.array([[1, 1]]) @ zmodn_matrix == Zmodn([[4, 1]], 5)
+
+    # Test matrix multiplication with a scalar
     zmodn_matrix = Zmodn([[1, 2], [3, 4]], 5)
     try:
         zmodn_matrix_product = zmodn_matrix @ 2
@@ -249,10 +931,27 @@ def test_truediv():
     else:
         assert False, "Expected ValueError"
 
-    # Test division with a non-Zmodn object
+    # Test division by integers and integer arrays on either side
+    zmodn = Zmodn([1, 2, 3], 5)
+    assert zmodn / 2 == Zmodn([3, 1, 4], 5)
+    assert 1 / zmodn == Zmodn([1, 3, 2], 5)
+    assert zmodn / np.array([1, 2, 3]) == Zmodn([1, 1, 1], 5)
+    zmodn /= 3
+    assert zmodn == Zmodn([2, 4, 1], 5)
+
+    # Test division by a scalar that is not invertible
+    zmodn = Zmodn([1, 2, 3], 6)
+    try:
+        zmodn_div = zmodn / 4
+    except ValueError:
+        pass
+    else:
+        assert False, "Expected ValueError"
+
+    # Test division with a non-integer object
     zmodn = Zmodn(2, 5)
     try:
-        zmodn_div = zmodn / 2
+        zmodn_div = zmodn / 2.0
     except TypeError:
         pass
     else:
@@ -284,6 +983,146 @@ def test_pow():
         assert False, "Expected TypeError"
 
 
+def test_array_ufunc():
+    # Test calling ufuncs directly on Zmodn objects
+    zmodn_a = Zmodn([1, 2, 3, 4], 7)
+    zmodn_b = Zmodn([6, 6, 6, 6], 7)
+    assert np.add(zmodn_a, zmodn_b) == Zmodn([0, 1, 2, 3], 7)
+    assert np.subtract(zmodn_a, zmodn_b) == Zmodn([2, 3, 4, 5], 7)
+    assert np.multiply(zmodn_a, zmodn_b) == Zmodn([6, 5, 4, 3], 7)
+    assert np.negative(zmodn_a) == Zmodn([6, 5, 4, 3], 7)
+    assert np.power(zmodn_a, 3) == Zmodn([1, 1, 6, 1], 7)
+    assert np.divide(zmodn_a, zmodn_b) == zmodn_a * Zmodn([6, 6, 6, 6], 7)
+    assert np.array_equal(np.equal(zmodn_a, zmodn_b), np.array([False, False, False, False]))
+
+    # Test writing the result into a preallocated Zmodn object
+    zmodn_out = Zmodn([0, 0, 0, 0], 7)
+    buffer = zmodn_out.representatives
+    result = np.multiply(zmodn_a, zmodn_b, out=zmodn_out)
+    assert result is zmodn_out
+    assert zmodn_out.representatives is buffer
+    assert zmodn_out == Zmodn([6, 5, 4, 3], 7)
+
+    # Test reduce, accumulate and outer
+    assert np.add.reduce(zmodn_a) == Zmodn(3, 7)
+    assert np.multiply.reduce(zmodn_a) == Zmodn(3, 7)
+    assert np.add.reduce(Zmodn([[1, 2], [3, 4]], 5), axis=1) == Zmodn([3, 2], 5)
+    assert np.add.reduce(Zmodn([5], 2**64)) == Zmodn(5, 2**64)
+    assert np.add.reduce(Zmodn([2**64 - 1, 2], 2**64)) == Zmodn(1, 2**64)
+    assert np.add.reduce(Zmodn([5], 2**130)) == Zmodn(5, 2**130)
+    assert np.add.accumulate(zmodn_a) == Zmodn([1, 3, 6, 3], 7)
+    assert np.multiply.accumulate(zmodn_a) == Zmodn([1, 2, 6, 3], 7)
+    assert np.multiply.outer(Zmodn([1, 2], 7), Zmodn([3, 4], 7)) == Zmodn([[3, 4], [6, 1]], 7)
+
+    # Test ufuncs with a different module
+    try:
+        np.add(zmodn_a, Zmodn([1, 2, 3, 4], 5))
+    except ValueError:
+        pass
+    else:
+        assert False, "Expected ValueError"
+
+    # Test writing the result into a non-Zmodn output
+    try:
+        np.add(zmodn_a, zmodn_b, out=np.zeros(4, dtype=int))
+    except TypeError:
+        pass
+    else:
+        assert False, "Expected TypeError"
+
+
+def test_inplace_operators():
+    # Test that in-place operators reuse the representatives buffer
+    zmodn = Zmodn([1, 2, 3], 7)
+    buffer = zmodn.representatives
+    zmodn += Zmodn([6, 6, 6], 7)
+    assert zmodn == Zmodn([0, 1, 2], 7)
+    zmodn -= Zmodn([3, 3, 3], 7)
+    assert zmodn == Zmodn([4, 5, 6], 7)
+    zmodn *= Zmodn([2, 2, 2], 7)
+    assert zmodn == Zmodn([1, 3, 5], 7)
+    zmodn /= Zmodn([3, 3, 3], 7)
+    assert zmodn == Zmodn([5, 1, 4], 7)
+    zmodn **= 2
+    assert zmodn == Zmodn([4, 1, 2], 7)
+    assert zmodn.representatives is buffer
+
+    # Test in-place matrix multiplication
+    zmodn_matrix = Zmodn([[1, 2], [3, 4]], 5)
+    buffer = zmodn_matrix.representatives
+    zmodn_matrix @= Zmodn([[2, 3], [1, 4]], 5)
+    assert zmodn_matrix == Zmodn([[4, 1], [0, 0]], 5)
+    assert zmodn_matrix.representatives is buffer
+
+    # Test that in-place operators do not allocate memory of the size of the array
+    for module in (1_000_000_007, 2**32 - 5, 251):
+        zmodn = Zmodn.from_array(np.arange(1 << 18), module)
+        other = Zmodn.from_array(np.arange(1 << 18)[::-1], module)
+        for inplace in (operator.iadd, operator.isub, operator.imul):
+            inplace(zmodn, other)
+            tracemalloc.start()
+            inplace(zmodn, other)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            assert peak < zmodn.representatives.nbytes // 2, (module, inplace.__name__, peak)
+
+    # Test in-place addition with a different module
+    zmodn = Zmodn([1, 2, 3], 7)
+    try:
+        zmodn += Zmodn([1, 2, 3], 5)
+    except ValueError:
+        pass
+    else:
+        assert False, "Expected ValueError"
+
+
+def test_large_module_arithmetic():
+    # Test that products, sums and powers stay exact for moduli close to 2**63
+    for module in [2**32 + 15, 2**45 + 59, 2**61 - 1, 2**62 + 2**40, 2**63 - 25]:
+        integers_a = [module - 1, module - 2, 2**40 + 1, 12345]
+        integers_b = [module - 1, 3, 2**33 + 7, module - 12345]
+        zmodn_a = Zmodn(integers_a, module)
+        zmodn_b = Zmodn(integers_b, module)
+        products = [a * b % module for a, b in zip(integers_a, integers_b)]
+        sums = [(a + b) % module for a, b in zip(integers_a, integers_b)]
+        powers = [pow(a, 65537, module) for a in integers_a]
+        assert [int(x) for x in (zmodn_a * zmodn_b).representatives] == products
+        assert [int(x) for x in (zmodn_a + zmodn_b).representatives] == sums
+        assert [int(x) for x in (zmodn_a**65537).representatives] == powers
+        dot_product = sum(a * b for a, b in zip(integers_a, integers_b)) % module
+        assert int(zmodn_a @ zmodn_b) == dot_product
+
+
+def test_pow_array_and_negative_exponents():
+    # Test per-element exponents
+    zmodn = Zmodn([2, 3, 4, 5], 11)
+    zmodn_pow = zmodn ** np.array([0, 1, 10, 123456789])
+    assert [int(x) for x in zmodn_pow.representatives] == [1, 3, 1, pow(5, 123456789, 11)]
+
+    # Test negative exponents through the modular inverse
+    zmodn_pow = zmodn**-3
+    assert [int(x) for x in zmodn_pow.representatives] == [pow(x, -3, 11) for x in [2, 3, 4, 5]]
+    zmodn_pow = zmodn ** np.array([-1, 2, -2, 0])
+    assert [int(x) for x in zmodn_pow.representatives] == [pow(2, -1, 11), 9, pow(4, -2, 11), 1]
+
+    # Test broadcasting a single base against an array of exponents
+    zmodn_pow = Zmodn(3, 2**61 - 1) ** np.arange(5)
+    assert [int(x) for x in zmodn_pow.representatives] == [3**k for k in range(5)]
+
+    # Test large exponents with a large modulus
+    module = 2**61 - 1
+    exponent = 2**200 + 12345
+    assert int(Zmodn(3, module) ** exponent) == pow(3, exponent, module)
+
+    # Test a negative exponent on a non-invertible element
+    try:
+        Zmodn([2, 3], 6) ** np.array([1, -1])
+    except ValueError:
+        pass
+    else:
+        assert False, "Expected ValueError"
+
+
 def test_neg():
     # Test negative
     zmodn = Zmodn(2, 5)
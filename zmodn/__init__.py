@@ -1,4 +1,10 @@
 import sys
 from ._zmodn import Zmodn
+from ._lazy import LazyZmodn
+from ._stream import ZmodnStream
+from ._lu import LUFactorization
+from ._multi_limb import MultiLimbZmodn
+from ._rns import RNSZmodn
+from ._ring import Zmod
 
 sys.modules["Zmodn"] = Zmodn
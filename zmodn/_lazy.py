@@ -0,0 +1,291 @@
+import numpy as np
+
+from .utils.modular_arithmetic import (
+    as_residues,
+    modular_add,
+    modular_multiply,
+    modular_negative,
+    modular_power,
+    modular_subtract,
+    representative_dtype,
+)
+from .utils.modular_inverse import unit_mask, vectorize_modular_inverse
+from .utils.thread_pool import run_tasks
+
+# Moduli up to this bound have products of two residues that fit in uint64, so whole expressions run on unsigned words
+# with reductions deferred; larger moduli apply the modular kernels to every node of the block instead.
+FUSED_MODULUS_LIMIT = 1 << 32
+# Default number of elements evaluated at once; each intermediate block then stays in the L2 cache.
+DEFAULT_BLOCK_SIZE = 1 << 14
+
+SYMBOLS = {"add": "+", "subtract": "-", "multiply": "*", "divide": "/"}
+
+
+def _zmodn_class():
+    # Imported lazily because Zmodn builds lazy expressions from its own methods.
+    from ._zmodn import Zmodn
+
+    return Zmodn
+
+
+class LazyZmodn:
+    r"""
+    Elementwise expression over :math:`\mathbb{Z}/n\mathbb{Z}` whose evaluation is deferred until :meth:`evaluate`.
+
+    :meth:`Zmodn.lazy` wraps a Zmodn object, and arithmetic on the result records a tree of operations instead of
+    computing it. :meth:`evaluate` then runs the whole tree over blocks of a few thousand elements, so intermediate
+    results never leave the cache and the array is traversed about once instead of once per operation.
+
+    For moduli up to :math:`2^{32}` the blocks are evaluated on uint32 or uint64 words while tracking an upper bound
+    of every intermediate value, and a reduction is only inserted where the next operation could overflow. Sums and
+    differences of products, such as ``a * b + c * d - e``, then need few reductions besides the last one.
+
+    Operands can be Zmodn objects, other lazy expressions, integers or integer arrays, broadcast with NumPy rules.
+
+    Group:
+        Modular Arithmetic
+    """
+
+    def __init__(self, operation, operands, module, shape):
+        self.operation = operation
+        self.operands = operands
+        self.module = module
+        self.shape = shape
+
+    @classmethod
+    def leaf(cls, representatives, module):
+        r"""
+        Creates a lazy expression holding an array of residues.
+
+        Args:
+            representatives (numpy.ndarray): Array of residues in :math:`[0, module)`
+            module (int): Positive integer modulus
+
+        Returns:
+            LazyZmodn: Lazy expression
+        """
+        return cls("leaf", (np.asarray(representatives),), int(module), np.shape(representatives))
+
+    def _node(self, other):
+        if isinstance(other, LazyZmodn):
+            if other.module != self.module:
+                raise ValueError("Modules must be equal")
+            return other
+        if isinstance(other, _zmodn_class()):
+            if other.module != self.module:
+                raise ValueError("Modules must be equal")
+            return LazyZmodn.leaf(other.representatives, self.module)
+        return LazyZmodn.leaf(as_residues(other, self.module), self.module)
+
+    def _combine(self, operation, first, second):
+        return LazyZmodn(operation, (first, second), self.module, np.broadcast_shapes(first.shape, second.shape))
+
+    def __repr__(self):
+        return f"{self._expression()} (mod {self.module}, lazy)"
+
+    def _expression(self):
+        if self.operation == "leaf":
+            return f"array{self.shape}"
+        if self.operation == "negative":
+            return f"-{self.operands[0]._expression()}"
+        if self.operation == "power":
+            return f"{self.operands[0]._expression()}**{self.operands[1]}"
+        first, second = (operand._expression() for operand in self.operands)
+        return f"({first} {SYMBOLS[self.operation]} {second})"
+
+    def __len__(self):
+        return self.shape[0] if self.shape else 1
+
+    def __add__(self, other):
+        return self._combine("add", self, self._node(other))
+
+    def __radd__(self, other):
+        return self._combine("add", self._node(other), self)
+
+    def __sub__(self, other):
+        return self._combine("subtract", self, self._node(other))
+
+    def __rsub__(self, other):
+        return self._combine("subtract", self._node(other), self)
+
+    def __mul__(self, other):
+        return self._combine("multiply", self, self._node(other))
+
+    def __rmul__(self, other):
+        return self._combine("multiply", self._node(other), self)
+
+    def __truediv__(self, other):
+        return self._combine("divide", self, self._node(other))
+
+    def __rtruediv__(self, other):
+        return self._combine("divide", self._node(other), self)
+
+    def __pow__(self, other):
+        if not isinstance(other, (int, np.integer)) or isinstance(other, bool):
+            raise TypeError("Exponent must be an integer")
+        return LazyZmodn("power", (self, int(other)), self.module, self.shape)
+
+    def __neg__(self):
+        return LazyZmodn("negative", (self,), self.module, self.shape)
+
+    def __pos__(self):
+        return self
+
+    def evaluate(self, block_size=DEFAULT_BLOCK_SIZE, workers=None):
+        r"""
+        Evaluates the expression block by block and returns the result as a Zmodn object.
+
+        Every block covers about ``block_size`` elements along the leading axis of the result. With ``workers``
+        threads the blocks are evaluated concurrently, as NumPy releases the GIL inside its loops.
+
+        Args:
+            block_size (int): Number of elements evaluated at once
+            workers (int, optional): Number of threads, defaulting to ``Zmodn.workers``
+
+        Returns:
+            Zmodn: Zmodn object
+
+        Raises:
+            ValueError: If some divisor, or base with a negative exponent, is not invertible, listing its positions
+        """
+        zmodn_class = _zmodn_class()
+        workers = zmodn_class.workers if workers is None else workers
+        shape = self.shape or (1,)
+        result = np.empty(shape, dtype=representative_dtype(self.module))
+        step = max(int(block_size) // max(int(np.prod(shape[1:])), 1), 1)
+        fused = self.module <= FUSED_MODULUS_LIMIT
+
+        def task(start):
+            rows = slice(start, start + step)
+            if fused:
+                values, top = _fused(self, rows, shape, _word(self.module))
+                result[rows] = _reduce(values, top, self.module)[0]
+            else:
+                result[rows] = _blocked(self, rows, shape)
+
+        run_tasks(task, range(0, shape[0], step), workers)
+        return zmodn_class._from_representatives(result, self.module)
+
+
+def _block(leaf, rows, shape):
+    array = leaf.reshape((1,) * (len(shape) - leaf.ndim) + leaf.shape)
+    return array[rows] if array.shape[0] > 1 else array
+
+
+def _check_units(divisors, rows, module):
+    units = unit_mask(divisors, module)
+    if units.all():
+        return
+    failing = np.argwhere(~units)[:10]
+    offset = rows.start if divisors.shape[0] > 1 else 0
+    positions = [
+        tuple(int(i) + (offset if axis == 0 else 0) for axis, i in enumerate(position)) for position in failing
+    ]
+    raise ValueError(f"Divisors at positions {positions} are not coprime with the module")
+
+
+def _wraps_around(dtype, module):
+    return (int(np.iinfo(dtype).max) + 1) % module == 0
+
+
+def _reduce(values, top, module):
+    if top < module:
+        return values, top
+    if _wraps_around(values.dtype, module):
+        return np.bitwise_and(values, values.dtype.type(module - 1), out=values), module - 1
+    return np.remainder(values, values.dtype.type(module), out=values), module - 1
+
+
+def _reduce_larger(first, first_top, second, second_top, module):
+    if first_top >= second_top:
+        return _reduce(first, first_top, module), (second, second_top)
+    return (first, first_top), _reduce(second, second_top, module)
+
+
+def _word(module):
+    # Residues modulo 2**16 and below have products that fit in uint32, which halves the memory traffic of uint64.
+    return np.dtype(np.uint32) if module <= 1 << 16 or (1 << 32) % module == 0 else np.dtype(np.uint64)
+
+
+def _fused(node, rows, shape, word):
+    r"""
+    Evaluates ``node`` on a block of unsigned words, returning the values and an upper bound of them.
+
+    Values are congruent to the exact result but only reduced when an operation could overflow: a sum needs the sum of
+    the bounds, a product their product, and a difference :math:`a - b` is computed as :math:`a + (k n - b)` with
+    :math:`k n` above the bound of ``b``. Moduli dividing the word size never need a reduction before the last one.
+    """
+    module, limit = node.module, int(np.iinfo(word).max)
+    if node.operation == "leaf":
+        values = _block(node.operands[0], rows, shape).astype(word)
+        # Broadcast scalars are bounded by their own value, so small constants leave room for more deferred terms.
+        return values, int(values.max(initial=0)) if values.size == 1 else module - 1
+    if node.operation == "power":
+        base, top = _reduce(*_fused(node.operands[0], rows, shape, word), module)
+        exponent = node.operands[1]
+        if exponent < 0:
+            _check_units(base, rows, module)
+            base, exponent = vectorize_modular_inverse(base, module).astype(word), -exponent
+        result, top = np.full_like(base, 1 % module), 1 % module
+        while exponent:
+            if exponent & 1:
+                result, top = _reduce(np.multiply(result, base, out=result), limit, module)
+            exponent >>= 1
+            if exponent:
+                base, _ = _reduce(np.multiply(base, base, out=base), limit, module)
+        return result, top
+    if node.operation == "negative":
+        values, top = _fused(node.operands[0], rows, shape, word)
+        if _wraps_around(word, module):
+            return np.negative(values, out=values), limit
+        offset = (top // module + 1) * module
+        if offset > limit:
+            (values, top), offset = _reduce(values, top, module), module
+        return np.subtract(word.type(offset), values, out=values), offset
+    (first, first_top), (second, second_top) = (_fused(operand, rows, shape, word) for operand in node.operands)
+    if node.operation == "divide":
+        second, second_top = _reduce(second, second_top, module)
+        _check_units(second, rows, module)
+        second = vectorize_modular_inverse(second, module).astype(word)
+    # Every block array is a temporary owned by this evaluation, so results overwrite whichever operand is full size.
+    full = np.broadcast_shapes(first.shape, second.shape)
+    out = first if first.shape == full else second if second.shape == full else None
+    if _wraps_around(word, module):
+        ufunc = {"add": np.add, "subtract": np.subtract}.get(node.operation, np.multiply)
+        return ufunc(first, second, out=out), limit
+    if node.operation == "add":
+        while first_top + second_top > limit:
+            (first, first_top), (second, second_top) = _reduce_larger(first, first_top, second, second_top, module)
+        return np.add(first, second, out=out), first_top + second_top
+    if node.operation == "subtract":
+        offset = (second_top // module + 1) * module
+        while first_top + offset > limit:
+            (first, first_top), (second, second_top) = _reduce_larger(first, first_top, second, second_top, module)
+            offset = (second_top // module + 1) * module
+        complement = np.subtract(word.type(offset), second, out=second)
+        return np.add(first, complement, out=out), first_top + offset
+    while first_top * second_top > limit:
+        (first, first_top), (second, second_top) = _reduce_larger(first, first_top, second, second_top, module)
+    return np.multiply(first, second, out=out), first_top * second_top
+
+
+def _blocked(node, rows, shape):
+    module = node.module
+    if node.operation == "leaf":
+        return _block(node.operands[0], rows, shape)
+    if node.operation == "power":
+        base = _blocked(node.operands[0], rows, shape)
+        if node.operands[1] < 0:
+            _check_units(base, rows, module)
+        return modular_power(base, node.operands[1], module)
+    if node.operation == "negative":
+        return modular_negative(_blocked(node.operands[0], rows, shape), module)
+    first, second = (_blocked(operand, rows, shape) for operand in node.operands)
+    if node.operation == "add":
+        return modular_add(first, second, module)
+    if node.operation == "subtract":
+        return modular_subtract(first, second, module)
+    if node.operation == "divide":
+        _check_units(second, rows, module)
+        second = vectorize_modular_inverse(second, module)
+    return modular_multiply(first, second, module)
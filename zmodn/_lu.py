@@ -0,0 +1,97 @@
+import numpy as np
+
+from .utils.modular_elimination import modular_lu
+from .utils.modular_inverse import vectorize_modular_inverse
+from .utils.modular_arithmetic import modular_matmul, modular_multiply, modular_subtract
+
+
+class LUFactorization:
+    r"""
+    LU factorization :math:`PA = LU` of a square Zmodn matrix, reusable for many right-hand sides.
+
+    The :math:`O(n^3)` elimination runs once when the factorization is built. Each call to :meth:`solve` then costs
+    two triangular substitutions, vectorized over all the columns of the right-hand side.
+
+    Group:
+        Modular Arithmetic
+    """
+
+    def __init__(self, matrix):
+        if matrix.representatives.ndim != 2 or matrix.representatives.shape[0] != matrix.representatives.shape[1]:
+            raise ValueError("Matrix is no square")
+        permutation, lower, upper = modular_lu(matrix.representatives, matrix.module)
+        self.module = matrix.module
+        self.permutation = permutation
+        self._zmodn = type(matrix)
+        self._lower = lower
+        self._upper = upper
+        self._diagonal_inverse = vectorize_modular_inverse(np.diagonal(upper).copy(), self.module)
+
+    def __repr__(self):
+        return f"LUFactorization of a {len(self.permutation)}x{len(self.permutation)} matrix (mod {self.module})"
+
+    @property
+    def P(self):
+        r"""
+        Returns the permutation matrix :math:`P`.
+
+        Returns:
+            Zmodn: Zmodn object
+        """
+        identity = np.eye(len(self.permutation), dtype=self._upper.dtype)
+        return self._zmodn.from_array(identity[self.permutation], self.module)
+
+    @property
+    def L(self):
+        r"""
+        Returns the unit lower triangular factor :math:`L`.
+
+        Returns:
+            Zmodn: Zmodn object
+        """
+        return self._zmodn.from_array(self._lower, self.module, copy=True)
+
+    @property
+    def U(self):
+        r"""
+        Returns the upper triangular factor :math:`U`.
+
+        Returns:
+            Zmodn: Zmodn object
+        """
+        return self._zmodn.from_array(self._upper, self.module, copy=True)
+
+    def solve(self, other):
+        r"""
+        Solves :math:`AX = B` for a vector or a block of right-hand sides :math:`B`.
+
+        Args:
+            other (Zmodn): Vector of length :math:`n` or matrix with :math:`n` rows
+
+        Returns:
+            Zmodn: Solution with the same shape as ``other``
+
+        Raises:
+            TypeError: If other is not a Zmodn object
+            ValueError: If the modules or the shapes do not match
+        """
+        if not isinstance(other, self._zmodn):
+            raise TypeError("Other must be a Zmodn object")
+        if other.module != self.module:
+            raise ValueError("Modules must be equal")
+        size = len(self.permutation)
+        if other.representatives.shape[0] != size:
+            raise ValueError("Right-hand side must have as many rows as the matrix")
+        solution = other.representatives[self.permutation].astype(self._upper.dtype)
+        for row in range(1, size):
+            stop = row + 1
+            current = solution[row:stop]
+            correction = modular_matmul(self._lower[row, :row], solution[:row], self.module)
+            modular_subtract(current, correction, self.module, out=current)
+        for row in reversed(range(size)):
+            stop = row + 1
+            current = solution[row:stop]
+            correction = modular_matmul(self._upper[row, stop:], solution[stop:], self.module)
+            modular_subtract(current, correction, self.module, out=current)
+            modular_multiply(current, self._diagonal_inverse[row], self.module, out=current)
+        return self._zmodn.from_array(solution, self.module)
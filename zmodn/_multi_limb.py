@@ -0,0 +1,217 @@
+import numpy as np
+
+from ._zmodn import DEFERRING_OPERANDS, Zmodn
+from .utils.modular_arithmetic import as_residues
+from .utils.multi_limb import (
+    from_limbs,
+    limb_add,
+    limb_count,
+    limb_negative,
+    limb_subtract,
+    montgomery_multiply,
+    to_limbs,
+)
+
+
+class MultiLimbZmodn(Zmodn):
+    r"""
+    Zmodn object for moduli between :math:`2^{63}` and :math:`2^{128}`, storing every residue as 32-bit limbs.
+
+    ``Zmodn`` returns an instance of this class automatically when ``module`` does not fit the word kernels. The limbs
+    live in a single uint64 array of shape ``(limbs, *shape)``, least significant limb first, so each limb of all the
+    residues is one contiguous vector. Addition, subtraction and negation propagate carries across limbs. For odd
+    moduli the residues are kept in Montgomery form, :math:`x 2^{32 L} \bmod n`, and products use vectorized
+    Montgomery multiplication; even moduli multiply through Python integers. Wider moduli keep plain ``Zmodn``
+    objects with object arrays of Python integers, which are faster there.
+
+    ``representatives`` is reconstructed as an object array of Python integers when read, so every other method of
+    ``Zmodn`` works unchanged on top of it.
+
+    Group:
+        Modular Arithmetic
+    """
+
+    @property
+    def _montgomery(self):
+        return self.module % 2 == 1
+
+    @property
+    def representatives(self):
+        limbs = self.limbs
+        if self._montgomery:
+            one = np.zeros((limbs.shape[0],), dtype=np.uint64)
+            one[0] = 1
+            limbs = montgomery_multiply(limbs, one.reshape((-1,) + (1,) * (limbs.ndim - 1)), self.module)
+        return from_limbs(limbs)
+
+    @representatives.setter
+    def representatives(self, representatives):
+        integers = np.asarray(representatives, dtype=object)
+        if self._montgomery:
+            integers = np.remainder(integers * (1 << (32 * limb_count(self.module))), self.module)
+        self.limbs = to_limbs(integers, limb_count(self.module))
+
+    def _from_limbs(self, limbs):
+        zmodn = self.__class__.__new__(self.__class__, module=self.module)
+        zmodn.module = self.module
+        zmodn.limbs = limbs
+        return zmodn
+
+    def _limb_operands(self, other):
+        if not isinstance(other, Zmodn):
+            other = self._wrap(as_residues(other, self.module))
+        self._check_module_and_type(other)
+        return self.limbs, other.limbs
+
+    def _broadcast_limbs(self, other):
+        # The limb axis leads, so the residue axes are aligned on the right before NumPy broadcasts them.
+        first, second = self._limb_operands(other)
+        ndim = max(first.ndim, second.ndim)
+        first, second = [
+            limbs.reshape(limbs.shape[:1] + (1,) * (ndim - limbs.ndim) + limbs.shape[1:]) for limbs in (first, second)
+        ]
+        return np.broadcast_arrays(first, second)
+
+    def _multiply_limbs(self, first, second):
+        if self._montgomery:
+            return montgomery_multiply(first, second, self.module)
+        product = np.remainder(from_limbs(first) * from_limbs(second), self.module)
+        return to_limbs(product, limb_count(self.module))
+
+    def __add__(self, other):
+        if isinstance(other, DEFERRING_OPERANDS):
+            return NotImplemented
+        return self._from_limbs(limb_add(*self._broadcast_limbs(other), self.module))
+
+    def __sub__(self, other):
+        if isinstance(other, DEFERRING_OPERANDS):
+            return NotImplemented
+        return self._from_limbs(limb_subtract(*self._broadcast_limbs(other), self.module))
+
+    def __rsub__(self, other):
+        return -self + other
+
+    def __mul__(self, other):
+        if isinstance(other, DEFERRING_OPERANDS):
+            return NotImplemented
+        return self._from_limbs(self._multiply_limbs(*self._broadcast_limbs(other)))
+
+    def __matmul__(self, other):
+        if not isinstance(other, Zmodn):
+            other = self._wrap(self._matrix_operand(other))
+        first, second = self._limb_operands(other)
+        vector_left, vector_right = first.ndim == 2, second.ndim == 2
+        if first.ndim < 2 or second.ndim < 2:
+            raise ValueError("Matrix product needs at least one dimension")
+        if vector_left:
+            first = first[:, np.newaxis, :]
+        if vector_right:
+            second = second[:, :, np.newaxis]
+        if first.shape[-1] != second.shape[-2]:
+            raise ValueError("Matrix dimensions do not match")
+        result = None
+        for index in range(first.shape[-1]):
+            stop = index + 1
+            term = self._multiply_limbs(*np.broadcast_arrays(first[..., index:stop], second[..., index:stop, :]))
+            result = term if result is None else limb_add(result, term, self.module)
+        if result is None:
+            result = np.zeros(np.broadcast_shapes(first[..., :1].shape, second[..., :1, :].shape), dtype=np.uint64)
+        if vector_right:
+            result = result[..., 0]
+        if vector_left:
+            result = result[..., 0] if vector_right else result[..., 0, :]
+        if result.ndim == 1:
+            result = result[:, np.newaxis]
+        return self._from_limbs(result)
+
+    def __pow__(self, other):
+        exponent = self._check_exponent(other)
+        if not self._montgomery or not isinstance(exponent, (int, np.integer)) or exponent < 0:
+            return super().__pow__(exponent)
+        exponent = self.ring.reduce_exponent(int(exponent))
+        one = self.ring.montgomery_constants[1].reshape((-1,) + (1,) * (self.limbs.ndim - 1))
+        result = np.broadcast_to(one, self.limbs.shape).copy()
+        base = self.limbs
+        while exponent:
+            if exponent & 1:
+                result = montgomery_multiply(result, base, self.module)
+            exponent >>= 1
+            if exponent:
+                base = montgomery_multiply(base, base, self.module)
+        return self._from_limbs(result)
+
+    def __neg__(self):
+        return self._from_limbs(limb_negative(self.limbs, self.module))
+
+    def __pos__(self):
+        return self._from_limbs(self.limbs.copy())
+
+    def __iadd__(self, other):
+        if isinstance(other, DEFERRING_OPERANDS):
+            return NotImplemented
+        self.limbs = (self + other).limbs
+        return self
+
+    def __isub__(self, other):
+        if isinstance(other, DEFERRING_OPERANDS):
+            return NotImplemented
+        self.limbs = (self - other).limbs
+        return self
+
+    def __imul__(self, other):
+        if isinstance(other, DEFERRING_OPERANDS):
+            return NotImplemented
+        self.limbs = (self * other).limbs
+        return self
+
+    def __imatmul__(self, other):
+        self.limbs = (self @ other).limbs
+        return self
+
+    def __itruediv__(self, other):
+        if isinstance(other, DEFERRING_OPERANDS):
+            return NotImplemented
+        self.limbs = (self / other).limbs
+        return self
+
+    def __ipow__(self, other):
+        self.limbs = (self**other).limbs
+        return self
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        out = kwargs.pop("out", ())
+        result = super().__array_ufunc__(ufunc, method, *inputs, **kwargs)
+        if not out or not isinstance(result, Zmodn):
+            return result
+        if len(out) > 1 or not isinstance(out[0], MultiLimbZmodn) or out[0].module != self.module:
+            raise TypeError("Output must be a Zmodn object with the same module")
+        out[0].limbs = result.limbs
+        return out[0]
+
+    def __eq__(self, other):
+        if not isinstance(other, MultiLimbZmodn) or other.module != self.module:
+            return False
+        return bool(np.all(self.limbs == other.limbs))
+
+    __hash__ = Zmodn.__hash__
+
+    def __getitem__(self, key):
+        key = key if isinstance(key, tuple) else (key,)
+        limbs = self.limbs[(slice(None),) + key]
+        if limbs.ndim == 1:
+            limbs = limbs[:, np.newaxis]
+        return self._from_limbs(limbs)
+
+    def __setitem__(self, key, value):
+        if not isinstance(value, int):
+            raise TypeError("Value must be an integer")
+        key = key if isinstance(key, tuple) else (key,)
+        integer = value % self.module
+        if self._montgomery:
+            integer = integer * (1 << (32 * limb_count(self.module))) % self.module
+        target = self.limbs[(slice(None),) + key]
+        limbs = to_limbs(np.array([integer], dtype=object), limb_count(self.module))
+        self.limbs[(slice(None),) + key] = limbs.reshape((-1,) + (1,) * (np.ndim(target) - 1))
+
+    def __len__(self):
+        return self.limbs.shape[1]
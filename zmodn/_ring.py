@@ -0,0 +1,293 @@
+import collections
+import functools
+import math
+import threading
+
+import numpy as np
+
+from .utils.modular_arithmetic import representative_dtype
+from .utils.lookup_tables import TABLE_MODULUS_LIMIT, cached_table, log_tables
+from .utils.modular_inverse import inverse_table
+from .utils.modular_multiplication import (
+    DIRECT_PRODUCT_LIMIT,
+    FLOAT_QUOTIENT_LIMIT,
+    WORD_MODULUS_LIMIT,
+    word_montgomery_constants,
+)
+from .utils.multi_limb import montgomery_constants
+from .utils.primality import factorize, is_prime
+
+# Number of rings kept alive by Zmod; the least recently used ring is dropped beyond it.
+RING_CACHE_SIZE = 256
+# Moduli up to this size are factored on demand to choose algorithms; larger ones are only used once factored.
+FACTOR_LIMIT = 1 << 64
+# Operations whose algorithm depends on the modulus, as reported by Zmod.routes.
+OPERATIONS = ("inverse", "power", "matrix", "matrix_stack")
+
+_RINGS = collections.OrderedDict()
+_RINGS_LOCK = threading.Lock()
+
+
+def _zmodn_class():
+    # Imported lazily because Zmodn objects look up their ring from their own methods.
+    from ._zmodn import Zmodn
+
+    return Zmodn
+
+
+class Zmod:
+    r"""
+    Ring :math:`\mathbb{Z}/n\mathbb{Z}`, holding everything that only depends on the modulus.
+
+    ``Zmod(n)`` returns the same object for the same modulus while it stays among the :data:`RING_CACHE_SIZE` most
+    recently used rings. Its attributes are computed on first access and cached: the representative dtype, the
+    Montgomery constants, primality, the factorization, Euler's totient and the Carmichael function. For moduli up to
+    :math:`2^{16}` the ring also provides lookup tables of inverses and, for primes, of discrete logarithms; these
+    live in a shared cache bounded by :data:`TABLE_MEMORY_LIMIT` bytes. Zmodn objects reach their ring through
+    :attr:`Zmodn.ring`, so inversions, divisions and powers reuse this data instead of recomputing it, and ask the
+    ring through :meth:`route` which algorithm suits the modulus best. :attr:`routes` shows these choices.
+
+    Calling the ring on integers builds Zmodn objects over it, so ``Zmod(26)([3, 5])`` equals ``Zmodn([3, 5], 26)``.
+
+    Group:
+        Modular Arithmetic
+    """
+
+    def __new__(cls, module):
+        if not isinstance(module, (np.integer, int)) or isinstance(module, bool) or module <= 0:
+            raise ValueError("Module must be a positive integer")
+        module = int(module)
+        with _RINGS_LOCK:
+            ring = _RINGS.get(module)
+            if ring is None:
+                ring = super().__new__(cls)
+                ring.module = module
+                _RINGS[module] = ring
+                if len(_RINGS) > RING_CACHE_SIZE:
+                    _RINGS.popitem(last=False)
+            else:
+                _RINGS.move_to_end(module)
+        return ring
+
+    def __call__(self, integers):
+        r"""
+        Creates a Zmodn object over the ring.
+
+        Args:
+            integers (int, list or numpy.ndarray): Integer, nested list of integers or integer array
+
+        Returns:
+            Zmodn: Zmodn object
+        """
+        zmodn_class = _zmodn_class()
+        if isinstance(integers, np.ndarray):
+            return zmodn_class.from_array(integers, self.module)
+        return zmodn_class(integers, self.module)
+
+    def __repr__(self):
+        return f"Zmod({self.module})"
+
+    def __eq__(self, other):
+        return isinstance(other, Zmod) and other.module == self.module
+
+    def __hash__(self):
+        return hash((Zmod, self.module))
+
+    def __reduce__(self):
+        return (Zmod, (self.module,))
+
+    @functools.cached_property
+    def dtype(self):
+        r"""
+        Returns the dtype of the representatives of the ring.
+
+        Returns:
+            numpy.dtype: Narrowest unsigned integer dtype holding ``module - 1``, or object beyond :math:`2^{63}`
+        """
+        return representative_dtype(self.module)
+
+    @functools.cached_property
+    def montgomery_constants(self):
+        r"""
+        Returns the constants of Montgomery multiplication, with :math:`R = 2^{64}` for word moduli and
+        :math:`R = 2^{32 L}` for moduli of :math:`L` limbs.
+
+        Returns:
+            tuple: Constants for odd moduli, or None for even moduli
+        """
+        if self.module % 2 == 0:
+            return None
+        if self.module <= WORD_MODULUS_LIMIT:
+            return word_montgomery_constants(self.module)
+        return montgomery_constants(self.module)
+
+    @functools.cached_property
+    def is_prime(self):
+        r"""
+        Returns whether the modulus is prime, so that every nonzero residue is invertible.
+
+        Returns:
+            bool: Whether the modulus is prime
+        """
+        return is_prime(self.module)
+
+    @functools.cached_property
+    def factorization(self):
+        r"""
+        Returns the factorization of the modulus into primes.
+
+        Returns:
+            dict: Prime factors mapped to their multiplicities
+        """
+        if self.is_prime:
+            return {self.module: 1}
+        return dict(factorize(self.module))
+
+    @functools.cached_property
+    def totient(self):
+        r"""
+        Returns Euler's totient :math:`\varphi(n)`, the number of units of the ring.
+
+        Returns:
+            int: Number of residues coprime with the modulus
+        """
+        return math.prod(prime ** (exponent - 1) * (prime - 1) for prime, exponent in self.factorization.items())
+
+    @functools.cached_property
+    def carmichael(self):
+        r"""
+        Returns the Carmichael function :math:`\lambda(n)`, the smallest exponent with :math:`x^{\lambda(n)} = 1` for
+        every unit :math:`x`.
+
+        Returns:
+            int: Exponent of the group of units
+        """
+        orders = []
+        for prime, exponent in self.factorization.items():
+            if prime == 2 and exponent >= 3:
+                orders.append(1 << (exponent - 2))
+            else:
+                orders.append(prime ** (exponent - 1) * (prime - 1))
+        return math.lcm(1, *orders)
+
+    @property
+    def inverse_table(self):
+        r"""
+        Returns a table with the inverse of every residue, with zeros for the residues that are not units.
+
+        Returns:
+            numpy.ndarray: Table of inverses, or None for moduli above :math:`2^{16}`
+        """
+        if self.module > TABLE_MODULUS_LIMIT:
+            return None
+        return cached_table("inverse", self.module, inverse_table)
+
+    @property
+    def log_tables(self):
+        r"""
+        Returns the tables of discrete logarithms and powers of a primitive root, see :func:`log_tables`.
+
+        Returns:
+            tuple: Arrays ``log`` and ``exp``, or None unless the modulus is a prime up to :math:`2^{16}`
+        """
+        if self.module > TABLE_MODULUS_LIMIT or not self.is_prime:
+            return None
+        return cached_table("log", self.module, log_tables)
+
+    @property
+    def _factorable(self):
+        return self.is_prime or self.module <= FACTOR_LIMIT or "factorization" in self.__dict__
+
+    @property
+    def crt_moduli(self):
+        r"""
+        Returns the prime powers of the factorization, pairwise coprime moduli whose product is the modulus.
+
+        Returns:
+            tuple: Prime powers in increasing order of the primes
+        """
+        return tuple(prime**exponent for prime, exponent in self.factorization.items())
+
+    def _splits_below(self, limit):
+        # Splitting only pays off when every factor fits a cheaper kernel than the modulus itself.
+        if self.module <= limit or self.is_prime or not self._factorable:
+            return False
+        moduli = self.crt_moduli
+        return len(moduli) > 1 and max(moduli) <= limit
+
+    def route(self, operation):
+        r"""
+        Returns the name of the algorithm Zmodn objects over the ring use for ``operation``.
+
+        The choice follows from the size, primality and factorization of the modulus:
+
+        - ``"inverse"``, elementwise inverses: ``"table"`` looks them up for moduli up to :math:`2^{16}`, ``"batch"``
+          applies Montgomery's simultaneous inversion trick to word moduli and ``"object"`` inverts every Python
+          integer on its own beyond :math:`2^{63}`.
+        - ``"power"``, powers with an integer exponent: ``"table"`` uses discrete logarithms modulo primes up to
+          :math:`2^{16}`, ``"carmichael"`` first reduces the exponent modulo :math:`\lambda(n)` when the modulus
+          can be factored, and ``"square-and-multiply"`` uses the exponent as is.
+        - ``"matrix"`` and ``"matrix_stack"``, elimination for inverses, determinants and stacked solves of a single
+          matrix or a stack: ``"crt"`` splits a composite modulus into its prime powers when all of them fit in
+          faster kernels than the modulus, :math:`2^{50}` for a single matrix and :math:`2^{32}` for a stack, and
+          recombines the results with the Chinese remainder theorem; otherwise ``"field"`` takes any nonzero pivot
+          modulo a prime and ``"euclidean"`` falls back to Euclidean row combinations where a column has no unit.
+
+        Moduli above :data:`FACTOR_LIMIT` are not factored for this unless :attr:`factorization` was computed before.
+
+        Args:
+            operation (str): One of ``"inverse"``, ``"power"``, ``"matrix"`` and ``"matrix_stack"``
+
+        Returns:
+            str: Name of the algorithm
+
+        Raises:
+            ValueError: If the operation is unknown
+        """
+        if operation == "inverse":
+            if self.module <= TABLE_MODULUS_LIMIT:
+                return "table"
+            return "batch" if self.module <= WORD_MODULUS_LIMIT else "object"
+        if operation == "power":
+            if self.module <= TABLE_MODULUS_LIMIT and self.is_prime:
+                return "table"
+            return "carmichael" if self._factorable else "square-and-multiply"
+        if operation == "matrix":
+            split = self._splits_below(FLOAT_QUOTIENT_LIMIT)
+        elif operation == "matrix_stack":
+            split = self._splits_below(DIRECT_PRODUCT_LIMIT - 1) or self._splits_below(FLOAT_QUOTIENT_LIMIT)
+        else:
+            raise ValueError(f"Operation must be one of {', '.join(OPERATIONS)}")
+        if split:
+            return "crt"
+        return "field" if self.is_prime else "euclidean"
+
+    @property
+    def routes(self):
+        r"""
+        Returns the algorithm chosen for every operation, see :meth:`route`, to inspect the dispatch when debugging.
+
+        Returns:
+            dict: Operations mapped to the names of their algorithms
+        """
+        return {operation: self.route(operation) for operation in OPERATIONS}
+
+    def reduce_exponent(self, exponent):
+        r"""
+        Returns a non-negative exponent no larger than ``exponent`` that gives the same power for every residue.
+
+        Powers of every residue, units or not, repeat with period :math:`\lambda(n)` once the exponent reaches the
+        largest multiplicity :math:`t` in the factorization, so ``exponent`` is replaced by
+        :math:`t + ((e - t) \bmod \lambda(n))`. The modulus is only factored for this when it is prime, at most
+        :data:`FACTOR_LIMIT`, or already factored.
+
+        Args:
+            exponent (int): Non-negative integer exponent
+
+        Returns:
+            int: Equivalent exponent
+        """
+        if exponent <= self.module or not self._factorable:
+            return exponent
+        threshold = max(self.factorization.values(), default=0)
+        return threshold + (exponent - threshold) % self.carmichael
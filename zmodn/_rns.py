@@ -0,0 +1,160 @@
+import math
+
+import numpy as np
+
+from .utils.modular_arithmetic import modular_matmul
+from .utils.residue_number_system import channel_column, channel_primes, channels_for, crt_reconstruct, rns_encode
+
+# Headroom factor on top of module**2 for the default channel count, so that long sums of products fit.
+DEFAULT_HEADROOM = 1 << 32
+
+
+class RNSZmodn:
+    r"""
+    Array of integers modulo a huge ``module`` stored in a residue number system.
+
+    Each value is kept as its residues modulo several word-sized channel primes, in a single uint64 array of shape
+    ``(channels, *shape)``. Additions, products and matrix products run independently on every channel, fully
+    vectorized, and represent the exact integer result as long as it stays below the product of the channel primes.
+    An upper bound of the represented integers is tracked, and operands are reduced modulo ``module`` through the
+    Chinese remainder theorem only when an operation could overflow. :meth:`to_integers` reconstructs the residues
+    modulo ``module`` as Python integers on demand.
+
+    Args:
+        integers (int or list or numpy.ndarray): Integers to represent
+        module (int): Positive integer modulus
+        channels (int, optional): Number of channel primes. By default, enough for a sum of :math:`2^{32}` products
+
+    Group:
+        Modular Arithmetic
+    """
+
+    def __init__(self, integers, module, channels=None):
+        if not isinstance(module, (np.integer, int)) or module <= 0:
+            raise ValueError("Module must be a positive integer")
+        integers = np.array(integers, dtype=object)
+        if not all(isinstance(value, (np.integer, int)) for value in integers.flat):
+            raise TypeError("Integers must be integers")
+        self.module = int(module)
+        if channels is None:
+            channels = channels_for(self.module**2 * DEFAULT_HEADROOM)
+        self.primes = channel_primes(channels)
+        if math.prod(self.primes) < self.module:
+            raise ValueError("Channel primes must cover the module")
+        self.residues = rns_encode(np.remainder(integers, self.module), self.primes)
+        self._bound = self.module
+
+    @classmethod
+    def _from_residues(cls, residues, module, primes, bound):
+        rns = cls.__new__(cls)
+        rns.module, rns.primes, rns.residues, rns._bound = module, primes, residues, bound
+        return rns
+
+    def __repr__(self):
+        return f"{self.to_integers()} (mod {self.module}, {self.channels} channels)"
+
+    @property
+    def shape(self):
+        return self.residues.shape[1:]
+
+    @property
+    def channels(self):
+        return len(self.primes)
+
+    def __len__(self):
+        return self.shape[0] if self.shape else 1
+
+    def to_integers(self):
+        r"""
+        Reconstructs the represented values as Python integers in :math:`[0, module)`.
+
+        Returns:
+            numpy.ndarray: Array of Python integers with dtype object
+        """
+        return np.remainder(crt_reconstruct(self.residues, self.primes), self.module)
+
+    def reduce(self):
+        r"""
+        Returns an equivalent object whose represented integers are reduced modulo ``module``.
+
+        Returns:
+            RNSZmodn: RNSZmodn object
+        """
+        if self._bound <= self.module:
+            return self
+        return self._from_residues(rns_encode(self.to_integers(), self.primes), self.module, self.primes, self.module)
+
+    def _check_module_and_type(self, other):
+        if not isinstance(other, RNSZmodn):
+            raise TypeError("Operand must be a RNSZmodn object")
+        if self.module != other.module or self.primes != other.primes:
+            raise ValueError("Modules and channels must be equal")
+
+    def _operands(self, other, bound):
+        r"""
+        Returns residues of both operands aligned for broadcasting, reduced first if ``bound`` would overflow.
+        """
+        first, second = self, other
+        if bound(first._bound, second._bound) > math.prod(self.primes):
+            first, second = first.reduce(), second.reduce()
+            if bound(first._bound, second._bound) > math.prod(self.primes):
+                raise ValueError("Result does not fit in the residue number system, use more channels")
+        ndim = max(len(first.shape), len(second.shape))
+        aligned = [
+            operand.residues.reshape((self.channels,) + (1,) * (ndim - len(operand.shape)) + operand.shape)
+            for operand in (first, second)
+        ]
+        return aligned[0], aligned[1], bound(first._bound, second._bound), ndim
+
+    def __add__(self, other):
+        self._check_module_and_type(other)
+        first, second, bound, ndim = self._operands(other, lambda a, b: a + b - 1)
+        column = channel_column(self.primes, ndim)
+        total = first + second
+        return self._from_residues(np.minimum(total, total - column), self.module, self.primes, bound)
+
+    def __neg__(self):
+        # The negation is represented by k * module - x with k * module at least the bound, which stays non-negative.
+        multiple = -(-self._bound // self.module) * self.module
+        column = channel_column(self.primes, len(self.shape))
+        offset = channel_column([multiple % prime for prime in self.primes], len(self.shape))
+        difference = offset + column - self.residues
+        residues = np.minimum(difference, difference - column)
+        return self._from_residues(residues, self.module, self.primes, multiple + 1)
+
+    def __sub__(self, other):
+        self._check_module_and_type(other)
+        return self + -other
+
+    def __mul__(self, other):
+        self._check_module_and_type(other)
+        first, second, bound, ndim = self._operands(other, lambda a, b: (a - 1) * (b - 1) + 1)
+        residues = np.remainder(first * second, channel_column(self.primes, ndim))
+        return self._from_residues(residues, self.module, self.primes, bound)
+
+    def __matmul__(self, other):
+        self._check_module_and_type(other)
+        if not self.shape or not other.shape:
+            raise ValueError("Matrix product needs at least one dimension")
+        inner = self.shape[-1]
+        first, second = self, other
+        if inner * (first._bound - 1) * (second._bound - 1) + 1 > math.prod(self.primes):
+            first, second = first.reduce(), second.reduce()
+        bound = inner * (first._bound - 1) * (second._bound - 1) + 1
+        if bound > math.prod(self.primes):
+            raise ValueError("Result does not fit in the residue number system, use more channels")
+        residues = np.stack(
+            [
+                modular_matmul(first.residues[channel], second.residues[channel], prime)
+                for channel, prime in enumerate(self.primes)
+            ]
+        )
+        return self._from_residues(residues, self.module, self.primes, bound)
+
+    def __eq__(self, other):
+        if not isinstance(other, RNSZmodn) or self.module != other.module or self.shape != other.shape:
+            return False
+        return bool(np.all(self.to_integers() == other.to_integers()))
+
+    def __ne__(self, other):
+        return not self == other
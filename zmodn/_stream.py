@@ -0,0 +1,272 @@
+import itertools
+import os
+
+import numpy as np
+
+from .utils.modular_arithmetic import representative_dtype
+
+# Default number of elements along the first axis in every chunk; a chunk of uint64 residues then takes 8 MiB.
+DEFAULT_STREAM_CHUNK = 1 << 20
+
+
+def _zmodn_class():
+    # Imported lazily because Zmodn creates streams from its own methods.
+    from ._zmodn import Zmodn
+
+    return Zmodn
+
+
+def _rechunk(arrays, size):
+    r"""
+    Regroups arrays along their first axis into arrays of exactly ``size`` rows, except for the last one.
+    """
+    pending, count = [], 0
+    for array in arrays:
+        while array.shape[0]:
+            missing = size - count
+            taken, array = array[:missing], array[missing:]
+            pending.append(taken)
+            count += taken.shape[0]
+            if count == size:
+                yield pending[0] if len(pending) == 1 else np.concatenate(pending)
+                pending, count = [], 0
+    if pending:
+        yield np.concatenate(pending)
+
+
+def _array_chunks(array, size):
+    for start in range(0, array.shape[0], size):
+        stop = start + size
+        yield array[start:stop]
+
+
+def _as_chunk(item):
+    if isinstance(item, _zmodn_class()):
+        return item.representatives
+    array = np.asarray(item)
+    return array.reshape(1) if array.ndim == 0 else array
+
+
+def _source_arrays(source, module, chunk_size):
+    r"""
+    Returns a function that starts a new pass over ``source``, yielding arrays of at most ``chunk_size`` rows.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        if os.fspath(source).endswith(".npy"):
+            source = np.load(source, mmap_mode="r")
+        else:
+            dtype = representative_dtype(module)
+            if dtype == np.dtype(object):
+                raise ValueError("Files can only hold residues modulo numbers up to 2**63")
+            source = np.memmap(source, dtype=dtype, mode="r")
+    if isinstance(source, _zmodn_class()):
+        if source.module != module:
+            raise ValueError("Modules must be equal")
+        source = source.representatives
+    if isinstance(source, np.ndarray):
+        array = source.reshape(1) if source.ndim == 0 else source
+        # Slices of memory-mapped files are only read from disk when a chunk is copied into a Zmodn block.
+        return lambda: _array_chunks(array, chunk_size)
+    if not hasattr(source, "__iter__"):
+        raise TypeError("Source must be a path, an array or an iterable of arrays")
+    return lambda: _rechunk(map(_as_chunk, source), chunk_size)
+
+
+class ZmodnStream:
+    r"""
+    Sequence of Zmodn blocks along the first axis of an array too large to hold in memory at once.
+
+    :meth:`Zmodn.stream` reads a ``.npy`` file, a raw binary file of residues, an array such as a ``numpy.memmap``,
+    or any iterable of integer arrays, in chunks of ``chunk_size`` elements along the first axis. Arithmetic on a
+    stream records the operation and returns a new stream, and nothing is read until the stream is consumed: by
+    iterating over its Zmodn blocks, by a reduction such as :meth:`sum`, :meth:`prod` or :meth:`dot`, or by
+    :meth:`write` into a sink. Every chunk goes through the whole pipeline before the next one is read, so memory
+    stays bounded by a few chunks however long the stream is.
+
+    Operands can be other streams of the same length, which are consumed in lockstep, or Zmodn objects, integers and
+    integer arrays that broadcast against every block. Streams over arrays and files can be consumed any number of
+    times, while streams over iterators are consumed once.
+
+    Group:
+        Modular Arithmetic
+    """
+
+    def __init__(self, source, module, chunk_size=DEFAULT_STREAM_CHUNK):
+        if not isinstance(module, (np.integer, int)) or isinstance(module, bool) or module <= 0:
+            raise ValueError("Module must be a positive integer")
+        if not isinstance(chunk_size, (np.integer, int)) or chunk_size <= 0:
+            raise ValueError("Chunk size must be a positive integer")
+        self.module = int(module)
+        self.chunk_size = int(chunk_size)
+        arrays = _source_arrays(source, self.module, self.chunk_size)
+        self._blocks = lambda: (_zmodn_class().from_array(array, self.module, copy=True) for array in arrays())
+
+    @classmethod
+    def _from_blocks(cls, blocks, module, chunk_size):
+        stream = cls.__new__(cls)
+        stream.module, stream.chunk_size, stream._blocks = module, chunk_size, blocks
+        return stream
+
+    def __repr__(self):
+        return f"ZmodnStream(mod {self.module}, chunks of {self.chunk_size})"
+
+    def __iter__(self):
+        return self._blocks()
+
+    def map(self, function):
+        r"""
+        Applies ``function`` to every block of the stream as it is read.
+
+        Args:
+            function (callable): Function taking and returning a Zmodn object
+
+        Returns:
+            ZmodnStream: Stream of the results
+        """
+        return self._from_blocks(lambda: map(function, self._blocks()), self.module, self.chunk_size)
+
+    def _aligned_blocks(self, other):
+        if other.module != self.module:
+            raise ValueError("Modules must be equal")
+        if other.chunk_size == self.chunk_size:
+            return other._blocks()
+        arrays = _rechunk((block.representatives for block in other._blocks()), self.chunk_size)
+        return (_zmodn_class()._from_representatives(array, self.module) for array in arrays)
+
+    def _combine(self, function, other):
+        if not isinstance(other, ZmodnStream):
+            return self.map(lambda block: function(block, other))
+
+        def blocks():
+            for first, second in itertools.zip_longest(self._blocks(), self._aligned_blocks(other)):
+                if first is None or second is None or len(first) != len(second):
+                    raise ValueError("Streams must have the same length")
+                yield function(first, second)
+
+        return self._from_blocks(blocks, self.module, self.chunk_size)
+
+    def __add__(self, other):
+        return self._combine(lambda first, second: first + second, other)
+
+    def __radd__(self, other):
+        return self._combine(lambda first, second: second + first, other)
+
+    def __sub__(self, other):
+        return self._combine(lambda first, second: first - second, other)
+
+    def __rsub__(self, other):
+        return self._combine(lambda first, second: second - first, other)
+
+    def __mul__(self, other):
+        return self._combine(lambda first, second: first * second, other)
+
+    def __rmul__(self, other):
+        return self._combine(lambda first, second: second * first, other)
+
+    def __truediv__(self, other):
+        return self._combine(lambda first, second: first / second, other)
+
+    def __rtruediv__(self, other):
+        return self._combine(lambda first, second: second / first, other)
+
+    def __pow__(self, other):
+        if not isinstance(other, (int, np.integer)) or isinstance(other, bool):
+            raise TypeError("Exponent must be an integer")
+        return self.map(lambda block: block**other)
+
+    def __neg__(self):
+        return self.map(lambda block: -block)
+
+    def __pos__(self):
+        return self
+
+    def _reduce(self, ufunc, identity):
+        total = None
+        for block in self._blocks():
+            partial = ufunc.reduce(block, axis=0)
+            total = partial if total is None else ufunc(total, partial)
+        if total is None:
+            return _zmodn_class()(identity % self.module, self.module)
+        return total
+
+    def sum(self):
+        r"""
+        Adds up the blocks of the stream along the first axis.
+
+        Returns:
+            Zmodn: Sum of the stream, of the shape of one row
+        """
+        return self._reduce(np.add, 0)
+
+    def prod(self):
+        r"""
+        Multiplies the blocks of the stream along the first axis.
+
+        Returns:
+            Zmodn: Product of the stream, of the shape of one row
+        """
+        return self._reduce(np.multiply, 1)
+
+    def dot(self, other):
+        r"""
+        Computes the sum of the elementwise products of the stream with ``other``, chunk by chunk.
+
+        For two streams of vectors this is their inner product, without either vector ever being held in memory.
+
+        Args:
+            other (ZmodnStream or Zmodn or int or numpy.ndarray): Stream of the same length, or operand broadcast
+                against every block
+
+        Returns:
+            Zmodn: Sum of the products, of the shape of one row
+        """
+        return (self * other).sum()
+
+    def write(self, sink):
+        r"""
+        Consumes the stream, passing every block to ``sink``.
+
+        Args:
+            sink (str or os.PathLike or file or numpy.ndarray or callable): Path or binary file object that receives
+                the raw bytes of the representatives, in the dtype of :attr:`Zmod.dtype`, so that the file can be
+                streamed again with :meth:`Zmodn.stream`; array, such as a writable ``numpy.memmap``, filled row by
+                row; or function called with every Zmodn block
+
+        Returns:
+            int: Number of rows written
+
+        Raises:
+            ValueError: If an array sink has fewer rows than the stream, or a file sink is given residues modulo a
+                number above :math:`2^{63}`, which have no fixed-size binary form
+        """
+        if isinstance(sink, (str, os.PathLike)):
+            with open(sink, "wb") as file:
+                return self.write(file)
+        rows = 0
+        for block in self._blocks():
+            representatives = block.representatives
+            stop = rows + len(representatives)
+            if isinstance(sink, np.ndarray):
+                if stop > len(sink):
+                    raise ValueError("Sink must have as many rows as the stream")
+                sink[rows:stop] = representatives
+            elif callable(sink):
+                sink(block)
+            elif representatives.dtype == np.dtype(object):
+                raise ValueError("Files can only hold residues modulo numbers up to 2**63")
+            else:
+                sink.write(np.ascontiguousarray(representatives).tobytes())
+            rows = stop
+        return rows
+
+    def collect(self):
+        r"""
+        Consumes the stream and concatenates its blocks into a single Zmodn object.
+
+        Returns:
+            Zmodn: Zmodn object holding the whole stream
+        """
+        blocks = [block.representatives for block in self._blocks()]
+        if not blocks:
+            raise ValueError("Stream is empty")
+        return _zmodn_class().from_array(np.concatenate(blocks), self.module)
@@ -1,10 +1,77 @@
+import functools
+import math
+
 import numpy as np
-from .utils.adjoint_matrix import adjoint_matrix
 from .utils.validate_matrix import validate_matrix
 from .utils.modular_inverse import vectorize_modular_inverse
+from .utils.extended_gcd import vectorize_extended_gcd
+from .utils.modular_elimination import (
+    modular_determinant,
+    modular_matrix_inverse,
+    stacked_determinant,
+    stacked_matrix_inverse,
+    stacked_solve,
+)
+from ._lazy import LazyZmodn
+from ._stream import DEFAULT_STREAM_CHUNK, ZmodnStream
+from ._lu import LUFactorization
+from ._ring import Zmod
+from .utils.modular_multiplication import WORD_MODULUS_LIMIT
+from .utils.multi_limb import MULTI_LIMB_LIMIT, limb_count
+from .utils.lookup_tables import table_power
+from .utils.chinese_remainder import crt_apply
+from .utils.thread_pool import DEFAULT_CHUNK_SIZE, parallel_elementwise
+from .utils.modular_arithmetic import (
+    DEFERRED_DTYPES,
+    modular_accumulate,
+    modular_add,
+    modular_divide,
+    modular_matmul,
+    modular_matrix_power,
+    modular_multiply,
+    modular_negative,
+    modular_positive,
+    modular_power,
+    modular_reduce,
+    modular_subtract,
+    modular_sum,
+    as_residues,
+    representative_dtype,
+)
 
 FUNCTIONS_HANDLER = dict()
 
+UFUNCS_HANDLER = {
+    np.add: modular_add,
+    np.subtract: modular_subtract,
+    np.multiply: modular_multiply,
+    np.divide: modular_divide,
+    np.power: modular_power,
+    np.negative: modular_negative,
+    np.positive: modular_positive,
+    np.matmul: modular_matmul,
+}
+
+COMPARISON_UFUNCS = (np.equal, np.not_equal, np.less, np.less_equal, np.greater, np.greater_equal)
+
+REDUCIBLE_UFUNCS = {np.add: 0, np.multiply: 1}
+
+BINARY_UFUNCS = (np.add, np.subtract, np.multiply, np.divide, np.matmul)
+
+# Operands that build their results from Zmodn objects, so Zmodn operators defer to their reflected methods.
+DEFERRING_OPERANDS = (LazyZmodn, ZmodnStream)
+
+
+def _multi_limb_class():
+    # Imported lazily because the multi-limb backend subclasses Zmodn.
+    from ._multi_limb import MultiLimbZmodn
+
+    return MultiLimbZmodn
+
+
+def _determinant_array(matrix, module):
+    return np.array([modular_determinant(matrix, module)], dtype=matrix.dtype)
+
 
 class Zmodn:
     r"""
@@ -14,6 +81,24 @@ class Zmodn:
         Modular Arithmetic
     """
 
+    # Matrix products whose dimensions all exceed this size use Strassen-Winograd recursion; None disables it.
+    strassen_cutoff = None
+    # Number of threads used by matrix products and large elementwise operations; None runs in the calling thread.
+    workers = None
+    # Number of elements handed to each thread task.
+    chunk_size = DEFAULT_CHUNK_SIZE
+    # Whether additions, subtractions and negations leave their results unreduced until they are observed.
+    deferred_reduction = False
+    # Unreduced values congruent to the representatives and an inclusive bound on them, or None once reduced.
+    _pending = None
+    _bound = None
+
+    def __new__(cls, matrix_integers=None, module=None):
+        if cls is Zmodn and isinstance(module, (np.integer, int)) and module > WORD_MODULUS_LIMIT:
+            if limb_count(int(module)) <= MULTI_LIMB_LIMIT:
+                cls = _multi_limb_class()
+        return super().__new__(cls)
+
     def __init__(self, matrix_integers, module):
         validated_matrix = validate_matrix(matrix_integers)
         if not validated_matrix:
@@ -22,8 +107,167 @@ class Zmodn:
         if not isinstance(module, (np.int64, int)) or module <= 0:
             raise ValueError("Module must be a positive integer")
 
-        self.module = module
-        self.representatives = np.array(validated_matrix) % module
+        self.module = int(module)
+        dtype = representative_dtype(self.module)
+        integers = np.array(validated_matrix, dtype=object if dtype == np.dtype(object) else None)
+        if not np.issubdtype(integers.dtype, np.integer):
+            # Integers that no single fixed-size dtype holds, such as 2**63 next to negative ones, are inferred as
+            # floats, so they are reduced as Python integers and narrowed afterwards.
+            integers = np.array(validated_matrix, dtype=object)
+        self.representatives = as_residues(integers, self.module)
+
+    @staticmethod
+    def stream(source, module, chunk_size=DEFAULT_STREAM_CHUNK):
+        r"""
+        Streams residues that do not fit in memory as Zmodn blocks of ``chunk_size`` elements along the first axis.
+
+        Nothing is read until the stream is consumed, and arithmetic, reductions and sinks then process one chunk at a
+        time, see :class:`ZmodnStream`.
+
+        Args:
+            source (str or os.PathLike or numpy.ndarray or iterable): Path of a ``.npy`` file or of a raw binary file
+                of residues in the dtype of :attr:`Zmod.dtype`, array such as a ``numpy.memmap``, or iterable of
+                integer arrays, lists or Zmodn objects
+            module (int): Positive integer modulus
+            chunk_size (int): Number of elements along the first axis in every block
+
+        Returns:
+            ZmodnStream: Stream of Zmodn blocks
+        """
+        return ZmodnStream(source, module, chunk_size)
+
+    @classmethod
+    def from_array(cls, array, module, copy=False):
+        r"""
+        Creates a Zmodn object directly from a NumPy array of integers.
+
+        Unlike the constructor, the array is not converted to a list and validated element by element. When its
+        entries already lie in :math:`[0, module)` and its dtype is the representative dtype for ``module`` (see
+        :attr:`dtype`), the array is wrapped as is, so no copy is made unless ``copy`` is set.
+
+        Args:
+            array (numpy.ndarray): Array of integers
+            module (int): Positive integer modulus
+            copy (bool): Whether to copy the array even if it could be wrapped directly
+
+        Returns:
+            Zmodn: Zmodn object
+
+        Raises:
+            TypeError: If the array does not contain integers
+            ValueError: If the module is not a positive integer
+        """
+        if not isinstance(module, (np.int64, int)) or module <= 0:
+            raise ValueError("Module must be a positive integer")
+        array = np.asarray(array)
+        if array.dtype == np.dtype(object):
+            if not all(isinstance(value, (int, np.integer)) for value in array.flat):
+                raise TypeError("Array must contain integers")
+        elif not np.issubdtype(array.dtype, np.integer):
+            raise TypeError("Array must contain integers")
+        if array.ndim == 0:
+            array = array.reshape(1)
+        dtype = representative_dtype(int(module))
+        if array.size and (array.min() < 0 or array.max() >= module):
+            array = np.remainder(array, module).astype(dtype)
+        elif copy or array.dtype != dtype:
+            array = array.astype(dtype)
+        return cls._from_representatives(array, module)
+
+    @property
+    def representatives(self):
+        self._reduce_pending()
+        return self._representatives
+
+    @representatives.setter
+    def representatives(self, representatives):
+        self._pending = None
+        self._representatives = representatives
+
+    def _reduce_pending(self):
+        pending = self._pending
+        if pending is None:
+            return
+        self._pending = None
+        residues = np.remainder(pending, pending.dtype.type(self.module), out=pending)
+        self._representatives = residues.astype(representative_dtype(self.module))
+
+    def _defers(self):
+        # Moduli filling their dtype already add and subtract without any reduction.
+        dtype = representative_dtype(self.module)
+        return self.deferred_reduction and dtype in DEFERRED_DTYPES and self.module != 1 << (8 * dtype.itemsize)
+
+    def _deferred(self):
+        if self._pending is not None:
+            return self._pending, self._bound
+        return self._representatives, self.module - 1
+
+    def _deferred_operand(self, other):
+        if not isinstance(other, Zmodn):
+            other = self._wrap(as_residues(other, self.module))
+        self._check_module_and_type(other)
+        return other
+
+    def _from_pending(self, pending, bound):
+        zmodn = self._from_representatives(None, self.module)
+        zmodn._pending, zmodn._bound = pending, bound
+        return zmodn
+
+    def _deferred_combine(self, other, operation, out=None):
+        r"""
+        Adds or subtracts without reducing, keeping an inclusive bound on the unreduced values.
+
+        A difference :math:`a - b` is stored as :math:`a + (k n - b)` with :math:`k n` above the bound of ``b``, so it
+        never goes negative. When the bound of the result would overflow the storage dtype, the operand with the larger
+        bound is reduced first.
+        """
+        storage = DEFERRED_DTYPES[representative_dtype(self.module)]
+        limit = int(np.iinfo(storage).max)
+        while True:
+            (first, first_bound), (second, second_bound) = self._deferred(), other._deferred()
+            offset = (second_bound // self.module + 1) * self.module if operation is np.subtract else 0
+            bound = first_bound + (offset or second_bound)
+            if bound <= limit:
+                break
+            (self if first_bound >= second_bound else other)._reduce_pending()
+        full = np.broadcast_shapes(first.shape, second.shape)
+        if out is not None and (first is not out or out.shape != full):
+            out = None
+        if operation is np.subtract:
+            second = np.subtract(storage.type(offset), second, dtype=storage)
+            if out is None and second.shape == full:
+                out = second
+        return np.add(first, second, out=out, dtype=storage), bound
+
+    @classmethod
+    def _from_representatives(cls, representatives, module):
+        zmodn = cls.__new__(cls, module=module)
+        zmodn.module = int(module)
+        zmodn.representatives = representatives
+        return zmodn
+
+    def _wrap(self, representatives):
+        if representatives.ndim == 0:
+            representatives = representatives.reshape(1)
+        return self._from_representatives(representatives, self.module)
+
+    def _apply(self, kernel, first, second, out=None):
+        if kernel is modular_matmul:
+            return modular_matmul(
+                first,
+                second,
+                self.module,
+                out=out,
+                cutoff=self.strassen_cutoff,
+                workers=self.workers,
+                chunk_size=self.chunk_size,
+            )
+        if kernel is modular_divide:
+            # Division reports the positions of non-invertible divisors, which chunks would renumber.
+            return kernel(first, second, self.module, out=out)
+        return parallel_elementwise(
+            kernel, first, second, self.module, out=out, workers=self.workers, chunk_size=self.chunk_size
+        )
 
     def __repr__(self):
         if len(self.representatives) == 1:
@@ -38,6 +282,63 @@ class Zmodn:
             return NotImplemented
         return FUNCTIONS_HANDLER[func](*args, **kwargs)
 
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        out = kwargs.pop("out", ())
+        arrays = []
+        for position, value in enumerate(inputs):
+            if isinstance(value, Zmodn):
+                if value.module != self.module:
+                    raise ValueError("Modules must be equal")
+                arrays.append(value.representatives)
+            elif ufunc is np.power and position == 1:
+                arrays.append(self._check_exponent(value))
+            else:
+                try:
+                    arrays.append(as_residues(value, self.module))
+                except TypeError:
+                    return NotImplemented
+
+        if ufunc in COMPARISON_UFUNCS:
+            if method != "__call__" or kwargs:
+                return NotImplemented
+            return ufunc(*arrays, out=out or None)
+
+        if ufunc not in UFUNCS_HANDLER:
+            return NotImplemented
+        if len(out) > 1 or not all(isinstance(value, Zmodn) for value in out):
+            raise TypeError("Output must be a Zmodn object")
+        if out and out[0].module != self.module:
+            raise ValueError("Modules must be equal")
+        out_array = out[0].representatives if out else None
+        kernel = UFUNCS_HANDLER[ufunc]
+
+        if method == "__call__" and not kwargs and ufunc in BINARY_UFUNCS:
+            result = self._apply(kernel, *arrays, out=out_array)
+        elif method == "__call__" and not kwargs:
+            result = kernel(*arrays, self.module, out=out_array)
+        elif method == "outer" and not kwargs and len(arrays) == 2:
+            first, second = np.asarray(arrays[0]), np.asarray(arrays[1])
+            first = first.reshape(first.shape + (1,) * second.ndim)
+            result = kernel(first, second, self.module, out=out_array)
+        elif method == "reduce" and ufunc in REDUCIBLE_UFUNCS and set(kwargs) <= {"axis", "keepdims"}:
+            axis, keepdims = kwargs.get("axis", 0), kwargs.get("keepdims", False)
+            if ufunc is np.add:
+                result = modular_sum(arrays[0], self.module, axis=axis, keepdims=keepdims)
+            else:
+                result = modular_reduce(
+                    kernel, arrays[0], self.module, axis=axis, keepdims=keepdims, identity=REDUCIBLE_UFUNCS[ufunc]
+                )
+        elif method == "accumulate" and ufunc in REDUCIBLE_UFUNCS and set(kwargs) <= {"axis"}:
+            result = modular_accumulate(kernel, arrays[0], self.module, axis=kwargs.get("axis", 0))
+        else:
+            return NotImplemented
+
+        if out:
+            if result is not out_array:
+                np.copyto(out_array, result)
+            return out[0]
+        return self._wrap(np.asarray(result))
+
     def implements(numpy_function):
         def decorator(function):
             FUNCTIONS_HANDLER[numpy_function] = function
@@ -46,29 +347,98 @@ class Zmodn:
         return decorator
 
     def _check_module_and_type(self, other):
-        if not isinstance(other, self.__class__):
+        if not isinstance(other, Zmodn):
             raise TypeError("Other must be a Zmodn object")
         if not self.module == other.module:
             raise ValueError("Modules must be equal")
 
+    def _operand(self, other):
+        if isinstance(other, Zmodn):
+            self._check_module_and_type(other)
+            return other.representatives
+        return as_residues(other, self.module)
+
+    def _matrix_operand(self, other):
+        if isinstance(other, (int, np.integer)):
+            raise TypeError("Matrix product needs a Zmodn object or an array of integers")
+        return self._operand(other)
+
+    def _divide(self, first, second, out=None):
+        table = self.ring.inverse_table
+        if table is None:
+            return self._apply(modular_divide, first, second, out=out)
+        return self._apply(
+            modular_multiply, first, vectorize_modular_inverse(second, self.module, table=table), out=out
+        )
+
+    def _power(self, exponent, out=None):
+        ring = self.ring
+        if ring.route("power") == "table":
+            return table_power(self.representatives, exponent, self.module, *ring.log_tables, out=out)
+        # Negative powers are powers of the inverse, and the ring shortens huge exponents with the Carmichael function.
+        if not isinstance(exponent, (int, np.integer)):
+            return modular_power(self.representatives, exponent, self.module, out=out)
+        exponent = int(exponent)
+        base = self.mod_inv().representatives if exponent < 0 else self.representatives
+        return modular_power(base, ring.reduce_exponent(abs(exponent)), self.module, out=out)
+
+    def _scalar_inverse(self, other):
+        divisor = int(as_residues(other, self.module))
+        if math.gcd(divisor, self.module) != 1:
+            raise ValueError("Divisor is not invertible modulo the module")
+        return np.array(pow(divisor, -1, self.module), dtype=self.dtype)
+
     def _boolean_check_module_and_type(self, other):
-        if not isinstance(other, self.__class__):
+        if not isinstance(other, Zmodn):
             return False
         if not self.module == other.module:
             return False
         return True
 
+    def _check_exponent(self, exponent):
+        if isinstance(exponent, (int, np.integer)) and not isinstance(exponent, bool):
+            return exponent
+        if isinstance(exponent, np.ndarray) and np.issubdtype(exponent.dtype, np.integer):
+            return exponent
+        raise TypeError("Exponent must be an integer or an array of integers")
+
     def _check_square_matrix(self, matrix):
-        if len(matrix.shape) != 2:
+        if len(matrix.shape) < 2:
             raise ValueError("Matrix is no two-dimensional")
-        if matrix.shape[0] != matrix.shape[1]:
+        if matrix.shape[-2] != matrix.shape[-1]:
             raise ValueError("Matrix is no square")
 
-    def _check_invertible_matrix(self, matrix):
-        determinant = int(np.linalg.det(matrix))
-        if determinant == 0:
-            raise ValueError("Matrix is no invertible")
-        return determinant
+    def _eliminate(self, function, *arrays):
+        # The ring decides whether a composite modulus is split into prime powers that run on cheaper kernels.
+        ring = self.ring
+        if ring.route("matrix_stack" if self.representatives.ndim > 2 else "matrix") == "crt":
+            return crt_apply(function, arrays, ring.crt_moduli, self.dtype)
+        return function(*arrays, self.module)
+
+    @property
+    def dtype(self):
+        r"""
+        Returns the dtype used to store the representatives.
+
+        It is the narrowest unsigned integer type that can hold ``module - 1``, so residues modulo 256 take one byte
+        and residues modulo a 31-bit prime take four. Products and sums are widened internally where needed.
+
+        Returns:
+            numpy.dtype: Dtype of the representatives
+        """
+        return self.representatives.dtype
+
+    @functools.cached_property
+    def ring(self):
+        r"""
+        Returns the ring :math:`\mathbb{Z}/n\mathbb{Z}` of the Zmodn object, which caches the data of the modulus.
+
+        The interned ring is looked up on first access and then kept on the object.
+
+        Returns:
+            Zmod: Ring of the module
+        """
+        return Zmod(self.module)
 
     @property
     def classes(self):
@@ -78,99 +448,290 @@ class Zmodn:
         Returns:
             list: List of integers
         """
-        return [
-            self.__class__(int(element), self.module)
-            for element in self.representatives
-        ]
+        return [self.__class__(int(element), self.module) for element in self.representatives]
 
     def mod_inv(self):
         r"""
-        Does not work for matrices.Computes the modular inverse of the Zmodn object using the extended Euclidean algorithm.
+        Computes the elementwise modular inverse of the Zmodn object.
+
+        All representatives are inverted at once with Montgomery's simultaneous inversion trick, which needs a
+        single modular inversion and about three vectorized products per element.
 
         Returns:
             Zmodn: Zmodn object
 
         Raises:
-            ValueError: If the Zmodn object has more than one representative
+            ValueError: If some representative is not coprime with the module, listing the failing positions
+        """
+        table = self.ring.inverse_table
+        return self._wrap(vectorize_modular_inverse(self.representatives, self.module, table=table))
+
+    def lazy(self):
+        r"""
+        Starts a lazy expression from the Zmodn object.
+
+        Arithmetic on the result records the operations instead of computing them, and ``evaluate()`` runs the whole
+        expression block by block in a single pass over the arrays, with reductions only where they are needed to
+        avoid overflow. Zmodn objects, integers and integer arrays can be mixed into the expression.
+
+        Returns:
+            LazyZmodn: Lazy expression
         """
-        integers_array = np.array(self.representatives).astype(int)
-        repr_inverse = vectorize_modular_inverse(integers_array, self.module)
-        return self.__class__(repr_inverse.tolist(), self.module)
+        return LazyZmodn.leaf(self.representatives, self.module)
+
+    def xgcd(self):
+        r"""
+        Runs the extended Euclidean algorithm on every representative and the module at once.
+
+        The coefficients ``x`` are the inverses of the representatives wherever ``g`` is one, for prime and composite
+        moduli alike. Moduli above :math:`2^{63}` run the algorithm on Python integers and return object arrays.
+
+        Returns:
+            tuple: Arrays ``g``, ``x`` and ``y`` with ``representatives * x + module * y == g``
+        """
+        return vectorize_extended_gcd(self.representatives, self.module)
 
     def inv(self):
-        if len(self.representatives) == 1:
+        r"""
+        Computes the inverse of a square matrix over :math:`\mathbb{Z}/n\mathbb{Z}`, or the elementwise inverse of a
+        single representative.
+
+        The inverse is computed exactly by Gauss-Jordan elimination with unit pivots, which takes :math:`O(n^3)`
+        integer operations and works for prime and composite moduli. A stack of shape ``(..., n, n)`` inverts every
+        matrix at once, running each elimination step on the whole stack.
+        Composite moduli whose prime powers fit in faster kernels are split with the Chinese remainder theorem,
+        see :meth:`Zmod.route`.
+
+        Returns:
+            Zmodn: Zmodn object
+
+        Raises:
+            ValueError: If the matrix is not square or not invertible modulo the module
+        """
+        if self.representatives.ndim <= 2 and len(self.representatives) == 1:
             return self.mod_inv()
-        matrix = self.representatives.astype(int)
-        self._check_square_matrix(matrix)
-        determinant = self._check_invertible_matrix(matrix)
-        adjoint = adjoint_matrix(matrix).astype(int)
-        multiplier = int(
-            self.__class__(1, self.module) / self.__class__(determinant, self.module)
-        )
-        inverse_matrix = multiplier * adjoint
-        return self.__class__(inverse_matrix.tolist(), self.module)
+        self._check_square_matrix(self.representatives)
+        if self.representatives.ndim > 2:
+            return self._wrap(self._eliminate(stacked_matrix_inverse, self.representatives))
+        return self._wrap(self._eliminate(modular_matrix_inverse, self.representatives))
 
-    @implements(np.add)
-    def __add__(self, other):
+    def lu(self):
+        r"""
+        Computes the factorization :math:`PA = LU` of a square matrix over :math:`\mathbb{Z}/n\mathbb{Z}`.
+
+        The factorization is cached on the object and reused by later calls, and by :meth:`solve`, for as long as the
+        representatives do not change.
+
+        Returns:
+            LUFactorization: Factorization object with ``P``, ``L``, ``U`` and a ``solve`` method
+
+        Raises:
+            ValueError: If the matrix is not square or has no unit pivot in some column
+        """
+        cached = getattr(self, "_lu_cache", None)
+        if cached is not None and np.array_equal(cached[0], self.representatives):
+            return cached[1]
+        factorization = LUFactorization(self)
+        self._lu_cache = (self.representatives.copy(), factorization)
+        return factorization
+
+    def solve(self, other):
+        r"""
+        Solves the linear system ``self @ x == other`` for one or several right-hand sides.
+
+        A stack of matrices of shape ``(..., n, n)`` solves all its systems at once by batched Gauss-Jordan
+        elimination. Its right-hand sides are vectors of shape ``(..., n)`` when ``other`` has one dimension less
+        than the stack, and blocks of shape ``(..., n, k)`` otherwise, broadcast against the stack.
+
+        A single matrix is solved through its cached :meth:`lu` factorization. Over composite moduli an invertible
+        matrix can have a column without unit entries, which has no such factorization, and is then solved by
+        Gauss-Jordan elimination with Euclidean row combinations instead.
+
+        Args:
+            other (Zmodn): Vector of length :math:`n` or matrix whose columns are right-hand sides
+
+        Returns:
+            Zmodn: Zmodn object
+
+        Raises:
+            ValueError: If the matrix is not square or not invertible modulo the module
+        """
+        self._check_square_matrix(self.representatives)
         self._check_module_and_type(other)
-        repr_sum = (
-            np.array(self.representatives) + np.array(other.representatives)
-        ) % self.module
-        return self.__class__(repr_sum.tolist(), self.module)
+        if self.representatives.ndim > 2:
+            return self._wrap(self._solve_stack(self.representatives, other.representatives))
+        if other.representatives.shape[0] != len(self.representatives):
+            raise ValueError("Right-hand side must have as many rows as the matrix")
+        try:
+            factorization = self.lu()
+        except ValueError:
+            try:
+                solution = self._solve_stack(self.representatives[np.newaxis], other.representatives[np.newaxis])
+            except ValueError:
+                raise ValueError("Matrix is no invertible") from None
+            return self._wrap(solution[0])
+        return factorization.solve(other)
+
+    def _solve_stack(self, matrices, rhs):
+        vector = rhs.ndim == matrices.ndim - 1
+        if vector:
+            rhs = rhs[..., np.newaxis]
+        solution = self._eliminate(stacked_solve, matrices, rhs)
+        return solution[..., 0] if vector else solution
+
+    @implements(np.linalg.matrix_power)
+    def matrix_power(self, n):
+        r"""
+        Raises a square matrix to the integer power ``n`` by repeated squaring over :math:`\mathbb{Z}/n\mathbb{Z}`.
+
+        Only :math:`O(\log |n|)` modular matrix products are computed, so huge exponents such as :math:`10^{18}` are
+        cheap. Negative powers are powers of the inverse matrix. ``numpy.linalg.matrix_power`` dispatches here.
+
+        Args:
+            n (int): Integer exponent
+
+        Returns:
+            Zmodn: Zmodn object
+
+        Raises:
+            TypeError: If the exponent is not an integer
+            ValueError: If the matrix is not square, or not invertible for a negative exponent
+        """
+        if not isinstance(n, (int, np.integer)) or isinstance(n, bool):
+            raise TypeError("Exponent must be an integer")
+        self._check_square_matrix(self.representatives)
+        base = self.inv() if n < 0 else self
+        return self._wrap(modular_matrix_power(base.representatives, abs(int(n)), self.module))
+
+    def det(self):
+        r"""
+        Computes the determinant of a square matrix over :math:`\mathbb{Z}/n\mathbb{Z}`.
+
+        The determinant is computed exactly by modular Gaussian elimination with unit pivots, falling back to
+        Euclidean row combinations for composite moduli, in :math:`O(n^3)` integer operations. A stack of shape
+        ``(..., n, n)`` returns the determinants of all its matrices, with shape ``(...)``.
+        Composite moduli whose prime powers fit in faster kernels are split with the Chinese remainder theorem,
+        see :meth:`Zmod.route`.
+
+        Returns:
+            Zmodn: Zmodn object
+
+        Raises:
+            ValueError: If the matrix is not square
+        """
+        self._check_square_matrix(self.representatives)
+        if self.representatives.ndim > 2:
+            return self._wrap(self._eliminate(stacked_determinant, self.representatives))
+        return self._wrap(self._eliminate(_determinant_array, self.representatives))
+
+    def __add__(self, other):
+        if isinstance(other, DEFERRING_OPERANDS):
+            return NotImplemented
+        if self._defers():
+            return self._from_pending(*self._deferred_combine(self._deferred_operand(other), np.add))
+        return self._wrap(self._apply(modular_add, self.representatives, self._operand(other)))
 
-    @implements(np.subtract)
     def __sub__(self, other):
-        self._check_module_and_type(other)
-        repr_sub = (
-            np.array(self.representatives) - np.array(other.representatives)
-        ) % self.module
-        return self.__class__(repr_sub.tolist(), self.module)
+        if isinstance(other, DEFERRING_OPERANDS):
+            return NotImplemented
+        if self._defers():
+            return self._from_pending(*self._deferred_combine(self._deferred_operand(other), np.subtract))
+        return self._wrap(self._apply(modular_subtract, self.representatives, self._operand(other)))
 
-    @implements(np.multiply)
     def __mul__(self, other):
-        self._check_module_and_type(other)
-        repr_mul = (
-            np.array(self.representatives) * np.array(other.representatives)
-        ) % self.module
-        return self.__class__(repr_mul.tolist(), self.module)
+        if isinstance(other, DEFERRING_OPERANDS):
+            return NotImplemented
+        return self._wrap(self._apply(modular_multiply, self.representatives, self._operand(other)))
 
     @implements(np.dot)
     def __matmul__(self, other):
-        self._check_module_and_type(other)
-        repr_mul = (
-            np.array(self.representatives) @ np.array(other.representatives)
-        ) % self.module
-        return self.__class__(repr_mul.tolist(), self.module)
+        return self._wrap(self._apply(modular_matmul, self.representatives, self._matrix_operand(other)))
 
-    @implements(np.divide)
     def __truediv__(self, other):
-        self._check_module_and_type(other)
-        repr_div = (
-            np.array(self.representatives) * np.array(other.mod_inv().representatives)
-        ) % self.module
-        return self.__class__(repr_div.tolist(), self.module)
+        if isinstance(other, DEFERRING_OPERANDS):
+            return NotImplemented
+        if isinstance(other, (int, np.integer)):
+            # A scalar divisor is inverted once, so the quotient costs a single product per element.
+            return self._wrap(self._apply(modular_multiply, self.representatives, self._scalar_inverse(other)))
+        return self._wrap(self._divide(self.representatives, self._operand(other)))
+
+    def __radd__(self, other):
+        return self + other
+
+    def __rsub__(self, other):
+        return self._wrap(self._apply(modular_subtract, self._operand(other), self.representatives))
+
+    def __rmul__(self, other):
+        return self * other
+
+    def __rmatmul__(self, other):
+        return self._wrap(self._apply(modular_matmul, self._matrix_operand(other), self.representatives))
+
+    def __rtruediv__(self, other):
+        return self._wrap(self._divide(self._operand(other), self.representatives))
 
-    @implements(np.power)
     def __pow__(self, other):
-        if not isinstance(other, int):
-            raise TypeError("Exponent must be an integer")
-        repr_pow = (np.array(self.representatives) ** other) % self.module
-        return self.__class__(repr_pow.tolist(), self.module)
+        return self._wrap(self._power(self._check_exponent(other)))
 
-    @implements(np.negative)
     def __neg__(self):
-        repr_neg = (-np.array(self.representatives)) % self.module
-        return self.__class__(repr_neg.tolist(), self.module)
+        if self._defers():
+            zero = self._wrap(np.zeros((), dtype=representative_dtype(self.module)))
+            return self._from_pending(*zero._deferred_combine(self, np.subtract))
+        return self._wrap(modular_negative(self.representatives, self.module))
 
-    @implements(np.positive)
     def __pos__(self):
-        repr_pos = (+np.array(self.representatives)) % self.module
-        return self.__class__(repr_pos.tolist(), self.module)
+        if self._pending is not None:
+            return self._from_pending(self._pending.copy(), self._bound)
+        return self._wrap(modular_positive(self.representatives, self.module))
+
+    def __iadd__(self, other):
+        if isinstance(other, DEFERRING_OPERANDS):
+            return NotImplemented
+        if self._defers():
+            out = self._pending
+            self._pending, self._bound = self._deferred_combine(self._deferred_operand(other), np.add, out=out)
+            return self
+        self._apply(modular_add, self.representatives, self._operand(other), out=self.representatives)
+        return self
+
+    def __isub__(self, other):
+        if isinstance(other, DEFERRING_OPERANDS):
+            return NotImplemented
+        if self._defers():
+            out = self._pending
+            self._pending, self._bound = self._deferred_combine(self._deferred_operand(other), np.subtract, out=out)
+            return self
+        self._apply(modular_subtract, self.representatives, self._operand(other), out=self.representatives)
+        return self
+
+    def __imul__(self, other):
+        if isinstance(other, DEFERRING_OPERANDS):
+            return NotImplemented
+        self._apply(modular_multiply, self.representatives, self._operand(other), out=self.representatives)
+        return self
+
+    def __imatmul__(self, other):
+        self._apply(modular_matmul, self.representatives, self._matrix_operand(other), out=self.representatives)
+        return self
+
+    def __itruediv__(self, other):
+        if isinstance(other, DEFERRING_OPERANDS):
+            return NotImplemented
+        if isinstance(other, (int, np.integer)):
+            inverse = self._scalar_inverse(other)
+            self._apply(modular_multiply, self.representatives, inverse, out=self.representatives)
+        else:
+            self._divide(self.representatives, self._operand(other), out=self.representatives)
+        return self
+
+    def __ipow__(self, other):
+        self._power(self._check_exponent(other), out=self.representatives)
+        return self
 
     def __eq__(self, other):
         if not self._boolean_check_module_and_type(other):
             return False
-        return all(np.array(self.representatives) == np.array(other.representatives))
+        return bool(np.all(self.representatives == other.representatives))
 
     def __ne__(self, other):
         return not self.__eq__(other)
@@ -178,28 +739,28 @@ class Zmodn:
     def __lt__(self, other):
         if not self._boolean_check_module_and_type(other):
             return False
-        return all(np.array(self.representatives) < np.array(other.representatives))
+        return bool(np.all(self.representatives < other.representatives))
 
     def __le__(self, other):
         if not self._boolean_check_module_and_type(other):
             return False
-        return all(np.array(self.representatives) <= np.array(other.representatives))
+        return bool(np.all(self.representatives <= other.representatives))
 
     def __gt__(self, other):
         if not self._boolean_check_module_and_type(other):
             return False
-        return all(np.array(self.representatives) > np.array(other.representatives))
+        return bool(np.all(self.representatives > other.representatives))
 
     def __ge__(self, other):
         if not self._boolean_check_module_and_type(other):
             return False
-        return all(np.array(self.representatives) >= np.array(other.representatives))
+        return bool(np.all(self.representatives >= other.representatives))
 
     def __hash__(self):
         return hash(tuple(self.representatives) + (self.module,))
 
     def __getitem__(self, key):
-        return self.__class__(self.representatives[key].tolist(), self.module)
+        return self._wrap(np.array(self.representatives[key]))
 
     def __setitem__(self, key, value):
         if not isinstance(value, int):
@@ -226,7 +787,5 @@ class Zmodn:
 
     def __int__(self):
         if self.representatives.size != 1:
-            raise ValueError(
-                "Cannot convert Zmodn object with more than one representative to an integer"
-            )
+            raise ValueError("Cannot convert Zmodn object with more than one representative to an integer")
         return int(self.representatives[0])
@@ -0,0 +1,78 @@
+import numpy as np
+
+from .modular_arithmetic import modular_multiply, modular_subtract, representative_dtype
+
+
+def crt_split(residues, moduli):
+    r"""
+    Reduces residues modulo every factor of a factorization into pairwise coprime moduli.
+
+    Args:
+        residues (numpy.ndarray): Array of residues modulo the product of ``moduli``
+        moduli (tuple): Pairwise coprime moduli
+
+    Returns:
+        list: Arrays of residues, one per modulus, each in the representative dtype of its modulus
+    """
+    parts = []
+    for modulus in moduli:
+        if residues.dtype == np.dtype(object):
+            part = np.remainder(residues, modulus)
+        else:
+            part = np.remainder(residues, residues.dtype.type(modulus))
+        parts.append(part.astype(representative_dtype(modulus)))
+    return parts
+
+
+def crt_combine(parts, moduli, dtype):
+    r"""
+    Recovers residues modulo the product of pairwise coprime moduli from their residues modulo each of them.
+
+    Garner's algorithm adds one modulus at a time: with :math:`x` known modulo :math:`M`, the residue :math:`r` modulo
+    :math:`m` gives :math:`x + M \cdot ((r - x) M^{-1} \bmod m)`, which only needs vectorized products modulo
+    :math:`m`.
+
+    Args:
+        parts (list): Arrays of residues, one per modulus, broadcast together
+        moduli (tuple): Pairwise coprime moduli
+        dtype (numpy.dtype): Dtype of the result, wide enough for the product of ``moduli``
+
+    Returns:
+        numpy.ndarray: Array of residues modulo the product of ``moduli``
+    """
+    result, product = parts[0].astype(dtype), 1
+    for part, modulus in zip(parts, moduli):
+        if product > 1:
+            word = representative_dtype(modulus)
+            known = np.remainder(result, modulus if dtype == np.dtype(object) else dtype.type(modulus)).astype(word)
+            difference = modular_subtract(part.astype(word), known, modulus)
+            lift = modular_multiply(difference, word.type(pow(product, -1, modulus)), modulus)
+            scale = product if dtype == np.dtype(object) else dtype.type(product)
+            result = result + lift.astype(dtype) * scale
+        product *= modulus
+    return result
+
+
+def crt_apply(function, arrays, moduli, dtype):
+    r"""
+    Computes ``function`` modulo the product of pairwise coprime moduli by computing it modulo each of them.
+
+    ``function(*parts, modulus)`` must commute with reduction, which holds for any sequence of ring operations, so
+    the results modulo each modulus are combined with :func:`crt_combine`. Splitting pays off when the moduli are small
+    enough for cheaper kernels than their product, for example below :math:`2^{32}` where products fit in a word.
+
+    Args:
+        function (callable): Function of some arrays of residues and a modulus, returning an array of residues
+        arrays (tuple): Arrays of residues modulo the product of ``moduli``
+        moduli (tuple): Pairwise coprime moduli
+        dtype (numpy.dtype): Dtype of the result
+
+    Returns:
+        numpy.ndarray: Result modulo the product of ``moduli``
+
+    Raises:
+        ValueError: If ``function`` fails modulo some of the moduli, with its message
+    """
+    splits = [crt_split(array, moduli) for array in arrays]
+    parts = [function(*(split[index] for split in splits), modulus) for index, modulus in enumerate(moduli)]
+    return crt_combine(parts, moduli, dtype)
@@ -0,0 +1,78 @@
+import numpy as np
+
+INT64_MAX = np.iinfo(np.int64).max
+
+
+def extended_gcd(a, b):
+    r"""
+    Runs the extended Euclidean algorithm on two Python integers of any size.
+
+    Returns:
+        tuple: Integers ``g``, ``x`` and ``y`` with :math:`a x + b y = g = \gcd(a, b)`
+    """
+    old_remainder, remainder, old_x, x, old_y, y = a, b, 1, 0, 0, 1
+    while remainder:
+        quotient = old_remainder // remainder
+        old_remainder, remainder = remainder, old_remainder - quotient * remainder
+        old_x, x = x, old_x - quotient * x
+        old_y, y = y, old_y - quotient * y
+    return old_remainder, old_x, old_y
+
+
+def vectorize_extended_gcd(a, b):
+    r"""
+    Runs the extended Euclidean algorithm on whole arrays of integers in lockstep.
+
+    Every lane performs one division step per pass; lanes whose remainder reaches zero are written out and dropped
+    from the working arrays, so the loop runs for as many passes as the slowest lane needs, about
+    :math:`\log_\varphi(\max(a, b))`, with no per-element Python calls. Object arrays, which hold integers beyond
+    int64, run :func:`extended_gcd` on every pair of Python integers instead.
+
+    Args:
+        a (numpy.ndarray): Array of non-negative integers below :math:`2^{63}`, or object array of Python integers
+        b (numpy.ndarray or int): Array of non-negative integers below :math:`2^{63}`, or object array of Python
+            integers, broadcast against ``a``
+
+    Returns:
+        tuple: Arrays ``g``, ``x`` and ``y`` with :math:`a x + b y = g = \gcd(a, b)`, of dtype int64, or object if
+        either input is an object array
+
+    Raises:
+        TypeError: If the inputs are not integers
+        ValueError: If the inputs are negative, or are not object arrays and do not fit in int64
+    """
+    a, b = np.asarray(a), np.asarray(b)
+    if np.dtype(object) in (a.dtype, b.dtype):
+        for integers in (a, b):
+            if integers.size and integers.min() < 0:
+                raise ValueError("Integers must be non-negative")
+        return tuple(np.asarray(array, dtype=object) for array in np.frompyfunc(extended_gcd, 2, 3)(a, b))
+    if not np.issubdtype(a.dtype, np.integer) or not np.issubdtype(b.dtype, np.integer):
+        raise TypeError("Integers must be an array of integers")
+    for integers in (a, b):
+        if integers.size and (integers.min() < 0 or integers.max() > INT64_MAX):
+            raise ValueError("Integers must be non-negative and smaller than 2**63")
+    a, b = np.broadcast_arrays(a.astype(np.int64), b.astype(np.int64))
+    shape = a.shape
+
+    old_remainder, remainder = a.ravel().copy(), b.ravel().copy()
+    old_x, x = np.ones_like(old_remainder), np.zeros_like(old_remainder)
+    old_y, y = np.zeros_like(old_remainder), np.ones_like(old_remainder)
+    gcd, bezout_x, bezout_y = old_remainder.copy(), old_x.copy(), old_y.copy()
+    lanes = np.arange(old_remainder.size)
+    while lanes.size:
+        finished = remainder == 0
+        if finished.any():
+            gcd[lanes[finished]] = old_remainder[finished]
+            bezout_x[lanes[finished]] = old_x[finished]
+            bezout_y[lanes[finished]] = old_y[finished]
+            active = ~finished
+            lanes, old_remainder, remainder = lanes[active], old_remainder[active], remainder[active]
+            old_x, x, old_y, y = old_x[active], x[active], old_y[active], y[active]
+            if not lanes.size:
+                break
+        quotient = old_remainder // remainder
+        old_remainder, remainder = remainder, old_remainder - quotient * remainder
+        old_x, x = x, old_x - quotient * x
+        old_y, y = y, old_y - quotient * y
+    return gcd.reshape(shape), bezout_x.reshape(shape), bezout_y.reshape(shape)
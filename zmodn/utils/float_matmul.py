@@ -0,0 +1,85 @@
+import numpy as np
+
+# Every integer below 2**53 is exactly representable in float64, so BLAS sums that stay below it are exact.
+FLOAT_EXACT_LIMIT = 1 << 53
+MAX_LIMBS = 8
+
+
+def split_plan(module, inner):
+    r"""
+    Chooses how to split operands into limbs so that float64 matrix products stay exact.
+
+    The left operand is cut into limbs of ``a_bits`` bits, the right operand into limbs of ``b_bits`` bits and the
+    inner dimension into tiles of ``tile`` columns, so that every dot product of two limbs over a tile is below
+    :math:`2^{53}`. The plan minimises the number of BLAS calls, one per pair of limbs and tile.
+
+    Args:
+        module (int): Positive integer modulus
+        inner (int): Length of the inner dimension of the product
+
+    Returns:
+        tuple: Number of limbs and bits per limb of each operand, followed by the tile length
+    """
+    bits = max((module - 1).bit_length(), 1)
+    best = None
+    for a_limbs in range(1, MAX_LIMBS + 1):
+        for b_limbs in range(a_limbs, MAX_LIMBS + 1):
+            a_bits, b_bits = -(-bits // a_limbs), -(-bits // b_limbs)
+            tile = (FLOAT_EXACT_LIMIT - 1) // (((1 << a_bits) - 1) * ((1 << b_bits) - 1))
+            if tile == 0:
+                continue
+            cost = a_limbs * b_limbs * -(-max(inner, 1) // tile)
+            if best is None or cost < best[0]:
+                best = (cost, a_limbs, a_bits, b_limbs, b_bits, tile)
+    return best[1:]
+
+
+def _limbs(values, limbs, limb_bits):
+    mask = np.uint64((1 << limb_bits) - 1)
+    return [((values >> np.uint64(limb_bits * index)) & mask).astype(np.float64) for index in range(limbs)]
+
+
+def float_matmul(a, b, module, add, multiply):
+    r"""
+    Computes :math:`AB \bmod n` exactly with float64 BLAS matrix products.
+
+    Operands are split into limbs and the inner dimension into tiles following :func:`split_plan`. Every limb product
+    over a tile is an exact float64 BLAS call whose result is converted back to integers and reduced. The reduced
+    partial products are then scaled by powers of two modulo ``module`` and summed with the given modular kernels.
+
+    Exactness needs :math:`k (n - 1)^2 < 2^{53}` for each BLAS call, so the cost grows with the modulus: for
+    :math:`k = 2000` one float64 product of the full size up to :math:`2^{21}`, two up to :math:`2^{26}` and three up
+    to :math:`2^{31}`, plus about 0.25 of a product for the conversions. A 2000 by 2000 product modulo
+    :math:`2^{30} - 35` thus takes about four times as long as a single float64 matrix product.
+
+    Args:
+        a (numpy.ndarray): Residues of shape ``(..., m, k)``
+        b (numpy.ndarray): Residues of shape ``(..., k, p)``
+        module (int): Positive integer modulus
+        add (callable): Modular addition kernel for uint64 arrays
+        multiply (callable): Modular multiplication kernel for uint64 arrays
+
+    Returns:
+        numpy.ndarray: Product of residues with dtype uint64
+    """
+    a, b = np.asarray(a).astype(np.uint64, copy=False), np.asarray(b).astype(np.uint64, copy=False)
+    inner = a.shape[-1]
+    a_count, a_bits, b_count, b_bits, tile = split_plan(module, inner)
+    a_limbs, b_limbs = _limbs(a, a_count, a_bits), _limbs(b, b_count, b_bits)
+    # Partial products are below 2**53, so they only need reducing for smaller moduli.
+    divisor = np.uint64(module) if module < FLOAT_EXACT_LIMIT else None
+    result = None
+    for a_index, a_limb in enumerate(a_limbs):
+        for b_index, b_limb in enumerate(b_limbs):
+            shift = a_bits * a_index + b_bits * b_index
+            weight = np.uint64(pow(2, shift, module))
+            for start in range(0, max(inner, 1), tile):
+                stop = start + tile
+                partial = np.matmul(a_limb[..., start:stop], b_limb[..., start:stop, :])
+                reduced = partial.astype(np.uint64)
+                if divisor is not None:
+                    np.remainder(reduced, divisor, out=reduced)
+                if shift:
+                    reduced = multiply(reduced, weight, module)
+                result = reduced if result is None else add(result, reduced, module, out=result)
+    return result
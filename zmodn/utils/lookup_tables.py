@@ -0,0 +1,161 @@
+import collections
+import threading
+
+import numpy as np
+
+from .primality import factorize, is_prime
+
+# Largest modulus for which lookup tables are built; each table then takes at most 128 KiB.
+TABLE_MODULUS_LIMIT = 1 << 16
+# Total size in bytes of the cached tables; the least recently used tables are dropped beyond it.
+TABLE_MEMORY_LIMIT = 64 << 20
+
+_TABLES = collections.OrderedDict()
+_TABLES_LOCK = threading.Lock()
+_table_bytes = 0
+
+
+def cached_table(kind, module, build):
+    r"""
+    Returns the tables of kind ``kind`` for ``module``, building them with ``build(module)`` on first use.
+
+    Tables of every kind and modulus share a least recently used cache of at most :data:`TABLE_MEMORY_LIMIT` bytes,
+    so programs touching many small moduli do not accumulate tables without bound. Cached arrays are read-only.
+
+    Args:
+        kind (str): Name of the kind of table
+        module (int): Positive integer modulus
+        build (callable): Function returning an array, or a tuple of arrays, for a modulus
+
+    Returns:
+        numpy.ndarray or tuple: Cached tables
+    """
+    global _table_bytes
+    key = (kind, module)
+    with _TABLES_LOCK:
+        if key in _TABLES:
+            _TABLES.move_to_end(key)
+            return _TABLES[key]
+    tables = build(module)
+    arrays = tables if isinstance(tables, tuple) else (tables,)
+    for array in arrays:
+        array.flags.writeable = False
+    with _TABLES_LOCK:
+        if key not in _TABLES:
+            _TABLES[key] = tables
+            _table_bytes += sum(array.nbytes for array in arrays)
+            while _table_bytes > TABLE_MEMORY_LIMIT and len(_TABLES) > 1:
+                _, evicted = _TABLES.popitem(last=False)
+                _table_bytes -= sum(array.nbytes for array in (evicted if isinstance(evicted, tuple) else (evicted,)))
+        return _TABLES[key]
+
+
+def primitive_root(prime):
+    r"""
+    Returns the smallest generator of the multiplicative group modulo a prime.
+
+    A candidate :math:`g` generates the group when :math:`g^{(p - 1) / q} \neq 1` for every prime factor :math:`q` of
+    :math:`p - 1`.
+
+    Args:
+        prime (int): Prime modulus
+
+    Returns:
+        int: Primitive root
+
+    Raises:
+        ValueError: If ``prime`` is not prime
+    """
+    if not is_prime(prime):
+        raise ValueError("Module must be prime")
+    order = prime - 1
+    factors = [factor for factor, _ in factorize(order)] if order > 1 else []
+    candidate = 1
+    while any(pow(candidate, order // factor, prime) == 1 for factor in factors) or candidate % prime == 0:
+        candidate += 1
+    return candidate % prime
+
+
+def log_tables(prime):
+    r"""
+    Tabulates discrete logarithms and powers of a primitive root modulo a prime up to :math:`2^{16}`.
+
+    Args:
+        prime (int): Prime modulus
+
+    Returns:
+        tuple: Array ``log`` of length ``prime``, with ``log[x]`` the exponent of ``x`` and ``log[0] = 0``, and array
+        ``exp`` of length ``prime - 1`` with ``exp[k]`` the ``k``-th power of the primitive root
+    """
+    if prime > TABLE_MODULUS_LIMIT:
+        raise ValueError("Module is too large for lookup tables")
+    root, order = primitive_root(prime), prime - 1
+    # Powers are filled by doubling: the second half of each step is the first half times root**length.
+    powers = np.ones(1, dtype=np.uint64)
+    while powers.size < order:
+        factor = np.uint64(pow(root, powers.size, prime))
+        powers = np.concatenate([powers, powers * factor % np.uint64(prime)])
+    stop = max(order, 1)
+    dtype = np.uint8 if prime <= 1 << 8 else np.uint16
+    exp = powers[:stop].astype(dtype)
+    log = np.zeros(prime, dtype=dtype)
+    log[exp] = np.arange(stop, dtype=dtype)
+    return log, exp
+
+
+def table_power(residues, exponent, prime, log, exp, out=None):
+    r"""
+    Raises residues modulo a prime to integer powers with logarithm tables.
+
+    Every nonzero residue is :math:`g^{\log x}`, so its power is the table entry at :math:`e \log x \bmod (p - 1)`: one
+    product and two lookups per element, however large the exponent. Negative exponents give inverses.
+
+    Args:
+        residues (numpy.ndarray): Array of residues in :math:`[0, prime)`
+        exponent (int or numpy.ndarray): Integer exponent or array of integer exponents broadcast against
+            ``residues``
+        prime (int): Prime modulus
+        log (numpy.ndarray): Logarithm table, as returned by :func:`log_tables`
+        exp (numpy.ndarray): Power table, as returned by :func:`log_tables`
+        out (numpy.ndarray, optional): Array where the result is stored
+
+    Returns:
+        numpy.ndarray: Array of residues
+
+    Raises:
+        ValueError: If zero is raised to a negative power, listing the failing positions
+    """
+    order = prime - 1
+    zeros = residues == 0
+    if isinstance(exponent, (int, np.integer)):
+        exponent = int(exponent)
+        if exponent < 0 and zeros.any():
+            _raise_zero_inverse(zeros)
+        logs = log[residues].astype(np.uint32)
+        logs *= np.uint32(exponent % order)
+        logs %= np.uint32(order)
+        result = exp.take(logs)
+        result[zeros] = 1 if exponent == 0 else 0
+    else:
+        exponent = np.asarray(exponent)
+        failing = zeros & (exponent < 0)
+        if failing.any():
+            _raise_zero_inverse(failing)
+        # Exponents are reduced in their own dtype first, as uint64 exponents above 2**63 do not fit in int64.
+        if exponent.dtype not in (np.dtype(np.uint64), np.dtype(object)):
+            exponent = exponent.astype(np.int64)
+        reduced = np.remainder(exponent, order).astype(np.int64)
+        logs = log[residues].astype(np.int64) * reduced % order
+        result = exp.take(logs)
+        zero_bases = np.broadcast_to(zeros, result.shape)
+        result[zero_bases] = 0
+        result[zero_bases & (exponent == 0)] = 1
+    if out is None:
+        return result.astype(residues.dtype, copy=False)
+    np.copyto(out, result, casting="unsafe")
+    return out
+
+
+def _raise_zero_inverse(failing):
+    positions = [tuple(int(i) for i in position) for position in np.argwhere(failing)[:10]]
+    raise ValueError(f"Integers at positions {positions} are not coprime with the module")
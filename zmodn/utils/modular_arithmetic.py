@@ -0,0 +1,443 @@
+import math
+import threading
+
+import numpy as np
+
+from .float_matmul import float_matmul
+from .modular_inverse import vectorize_modular_inverse
+from .modular_multiplication import WORD_MODULUS_LIMIT, multiply_words
+from .thread_pool import DEFAULT_CHUNK_SIZE, parallel_rows
+
+UINT64_MAX = np.iinfo(np.uint64).max
+
+REPRESENTATIVE_DTYPES = (np.dtype(np.uint8), np.dtype(np.uint16), np.dtype(np.uint32), np.dtype(np.uint64))
+
+WIDER_DTYPES = {
+    np.dtype(np.uint8): np.dtype(np.uint16),
+    np.dtype(np.uint16): np.dtype(np.uint32),
+    np.dtype(np.uint32): np.dtype(np.uint64),
+}
+
+# Dtypes holding unreduced sums and differences of residues, which leave room for many terms before a reduction.
+DEFERRED_DTYPES = {
+    np.dtype(np.uint8): np.dtype(np.uint16),
+    np.dtype(np.uint16): np.dtype(np.uint32),
+    np.dtype(np.uint32): np.dtype(np.uint64),
+    np.dtype(np.uint64): np.dtype(np.uint64),
+}
+
+# Temporaries of the word kernels, one buffer per dtype and thread, reused so in-place operators do not allocate.
+_SCRATCH = threading.local()
+
+
+def representative_dtype(module):
+    r"""
+    Returns the narrowest unsigned integer dtype that can hold every residue modulo ``module``.
+
+    Args:
+        module (int): Positive integer modulus
+
+    Returns:
+        numpy.dtype: One of uint8, uint16, uint32 or uint64, or object for moduli above :math:`2^{63}`, which the word
+        kernels do not support
+    """
+    if module > WORD_MODULUS_LIMIT:
+        return np.dtype(object)
+    for dtype in REPRESENTATIVE_DTYPES:
+        if module - 1 <= np.iinfo(dtype).max:
+            return dtype
+    return np.dtype(object)
+
+
+def as_residues(values, module):
+    r"""
+    Reduces an integer, or an array of integers, to representatives modulo ``module``.
+
+    Signed values are reduced to :math:`[0, module)` and the result has the representative dtype of ``module``, so it
+    can be passed straight to the kernels and broadcast against other arrays of residues. Scalars give 0-d arrays.
+
+    Args:
+        values (int or numpy.ndarray): Integer, NumPy integer scalar or array of integers
+        module (int): Positive integer modulus
+
+    Returns:
+        numpy.ndarray: Array of residues
+
+    Raises:
+        TypeError: If ``values`` is not an integer or an array of integers
+    """
+    dtype = representative_dtype(module)
+    if isinstance(values, (int, np.integer)) and not isinstance(values, bool):
+        return np.array(int(values) % module, dtype=dtype)
+    if not isinstance(values, np.ndarray):
+        raise TypeError("Operand must be an integer or an array of integers")
+    if _is_object(values.dtype):
+        if not all(isinstance(value, (int, np.integer)) for value in values.flat):
+            raise TypeError("Operand must be an integer or an array of integers")
+    elif not np.issubdtype(values.dtype, np.integer):
+        raise TypeError("Operand must be an integer or an array of integers")
+    if _is_object(dtype) or _is_object(values.dtype) or module > np.iinfo(np.int64).max:
+        return _reduce_objects(values, module).astype(dtype)
+    if np.issubdtype(values.dtype, np.signedinteger):
+        return np.remainder(values.astype(np.int64, copy=False), np.int64(module)).astype(dtype)
+    return np.remainder(values.astype(np.uint64, copy=False), np.uint64(module)).astype(dtype)
+
+
+def _is_object(dtype):
+    return dtype == np.dtype(object)
+
+
+def _reduce_objects(values, module):
+    # NumPy returns Python integers for 0-d object results, so keep them wrapped in arrays.
+    return np.asarray(np.remainder(np.asarray(values, dtype=object), module), dtype=object)
+
+
+def _wraps_around(module, dtype):
+    return module == 1 << (8 * dtype.itemsize)
+
+
+def _reduce(values, module):
+    if isinstance(values, np.ndarray):
+        return np.remainder(values, module, out=values)
+    return np.remainder(values, module)
+
+
+def _store(values, out):
+    if out is None:
+        return values
+    np.copyto(out, values, casting="unsafe")
+    return out
+
+
+def _narrow(values, dtype, out):
+    if out is None:
+        return np.asarray(values).astype(dtype, copy=False)
+    return _store(values, out)
+
+
+def _scratch(shape, dtype):
+    # The buffer is shared by every call in the thread, so it must be consumed before the next request of its dtype.
+    buffers, dtype, size = vars(_SCRATCH), np.dtype(dtype), math.prod(shape)
+    buffer = buffers.get(dtype)
+    if buffer is None or buffer.size < size:
+        buffer = buffers[dtype] = np.empty(size, dtype=dtype)
+    return buffer[:size].reshape(shape)
+
+
+def _fold(values, modulus):
+    values = np.asarray(values)
+    shifted = np.subtract(values, modulus, out=_scratch(values.shape, values.dtype))
+    return np.minimum(values, shifted, out=values)
+
+
+def _as_words(values):
+    return np.asarray(values).astype(np.uint64, copy=False)
+
+
+def modular_add(a, b, module, out=None):
+    dtype = np.result_type(a, b)
+    if _is_object(dtype):
+        return _store(_reduce_objects(np.add(a, b), module), out)
+    if _wraps_around(module, dtype):
+        return np.add(a, b, out=out)
+    modulus = dtype.type(module)
+    if 2 * (module - 1) <= np.iinfo(dtype).max:
+        return _fold(np.add(a, b, out=out), modulus)
+    # The sum can overflow the dtype, so subtract the complement of b instead and add the modulus back where it wraps.
+    shape = np.broadcast_shapes(np.shape(a), np.shape(b))
+    complement = np.subtract(modulus, b, out=_scratch(shape, dtype))
+    wraps = np.less(a, complement, out=_scratch(shape, np.bool_))
+    result = np.asarray(np.subtract(a, complement, out=out))
+    result += np.multiply(wraps, modulus, out=complement)
+    return result
+
+
+def modular_subtract(a, b, module, out=None):
+    dtype = np.result_type(a, b)
+    if _is_object(dtype):
+        return _store(_reduce_objects(np.subtract(a, b), module), out)
+    if _wraps_around(module, dtype):
+        return np.subtract(a, b, out=out)
+    modulus = dtype.type(module)
+    if 2 * (module - 1) <= np.iinfo(dtype).max:
+        result = np.asarray(np.subtract(a, b, out=out))
+        shifted = np.add(result, modulus, out=_scratch(result.shape, dtype))
+        return np.minimum(result, shifted, out=result)
+    shape = np.broadcast_shapes(np.shape(a), np.shape(b))
+    borrows = np.less(a, b, out=_scratch(shape, np.bool_))
+    result = np.asarray(np.subtract(a, b, out=out))
+    result += np.multiply(borrows, modulus, out=_scratch(shape, dtype))
+    return result
+
+
+def modular_multiply(a, b, module, out=None):
+    dtype = np.result_type(a, b)
+    if _is_object(dtype):
+        return _store(_reduce_objects(np.multiply(a, b), module), out)
+    if _wraps_around(module, dtype):
+        return np.multiply(a, b, out=out)
+    if dtype in WIDER_DTYPES:
+        wide = WIDER_DTYPES[dtype]
+        product = np.multiply(a, b, dtype=wide, out=_scratch(np.broadcast_shapes(np.shape(a), np.shape(b)), wide))
+        return _narrow(_reduce(product, wide.type(module)), dtype, out)
+    return _narrow(multiply_words(_as_words(a), _as_words(b), module), dtype, out)
+
+
+def modular_negative(a, module, out=None):
+    dtype = np.asarray(a).dtype
+    if _is_object(dtype):
+        return _store(_reduce_objects(np.negative(a), module), out)
+    if _wraps_around(module, dtype):
+        return np.negative(a, out=out)
+    modulus = dtype.type(module)
+    return _fold(np.subtract(modulus, a, out=out), modulus)
+
+
+def modular_positive(a, module, out=None):
+    if out is None:
+        return np.array(a, copy=True)
+    return _store(a, out)
+
+
+def _invert(values, module):
+    return vectorize_modular_inverse(np.asarray(values), module)
+
+
+def _power_scalar_exponent(base, exponent, module):
+    result = np.full_like(base, 1 % module)
+    while exponent:
+        if exponent & 1:
+            result = modular_multiply(result, base, module, out=result)
+        exponent >>= 1
+        if exponent:
+            base = modular_multiply(base, base, module, out=base)
+    return result
+
+
+def _power_array_exponent(base, exponent, module):
+    magnitude = np.abs(exponent).astype(np.uint64)
+    one = base.dtype.type(1 % module)
+    result = np.full_like(base, one)
+    for _ in range(int(magnitude.max(initial=0)).bit_length()):
+        factor = np.where(magnitude & np.uint64(1), base, one)
+        modular_multiply(result, factor, module, out=result)
+        magnitude >>= np.uint64(1)
+        modular_multiply(base, base, module, out=base)
+    return result
+
+
+def modular_power(a, exponent, module, out=None):
+    r"""
+    Raises residues to integer powers by square-and-multiply, reducing after every product.
+
+    The exponent can be a single integer or an integer array broadcast against ``a``. Negative exponents raise the
+    modular inverse of the corresponding base, so those bases must be invertible. Each bit of the largest exponent
+    costs two vectorized modular products.
+
+    Args:
+        a (numpy.ndarray): Array of residues
+        exponent (int or numpy.ndarray): Integer exponent or array of integer exponents
+        module (int): Positive integer modulus
+        out (numpy.ndarray): Optional array receiving the result
+
+    Returns:
+        numpy.ndarray: Array of residues
+
+    Raises:
+        ValueError: If a base with a negative exponent is not invertible
+    """
+    a = np.asarray(a)
+    if isinstance(exponent, (int, np.integer)):
+        exponent = int(exponent)
+        base = _invert(a, module) if exponent < 0 else np.array(a, copy=True)
+        return _store(_power_scalar_exponent(base, abs(exponent), module), out)
+    a, exponent = np.broadcast_arrays(a, np.asarray(exponent))
+    base = np.array(a, copy=True)
+    negative = exponent < 0
+    if negative.any():
+        base[negative] = _invert(base[negative], module)
+    return _store(_power_array_exponent(base, exponent, module), out)
+
+
+def modular_divide(a, b, module, out=None):
+    return modular_multiply(a, _invert(b, module), module, out=out)
+
+
+def _promote_matmul_operands(a, b):
+    a, b = np.asarray(a), np.asarray(b)
+    squeeze = []
+    if a.ndim == 1:
+        a = a[np.newaxis, :]
+        squeeze.append(-2)
+    if b.ndim == 1:
+        b = b[:, np.newaxis]
+        squeeze.append(-1)
+    return a, b, tuple(squeeze)
+
+
+def _pad_even(matrix):
+    padding = [(0, 0)] * (matrix.ndim - 2) + [(0, matrix.shape[-2] % 2), (0, matrix.shape[-1] % 2)]
+    return np.pad(matrix, padding) if any(after for _, after in padding) else matrix
+
+
+def _blas_product(a, b, module, workers, chunk_size):
+    def product(rows, other):
+        return float_matmul(rows, other, module, modular_add, modular_multiply)
+
+    return parallel_rows(product, a, b, workers=workers, chunk_size=chunk_size)
+
+
+def _strassen_winograd(a, b, module, cutoff, workers, chunk_size):
+    r"""
+    Multiplies matrices of uint64 residues with the Winograd variant of Strassen's recursion.
+
+    Each level takes seven half-size products and fifteen additions instead of eight products, padding odd dimensions
+    with zeros. The recursion stops as soon as a dimension is at most ``cutoff`` and the blocks are multiplied with the
+    float64 BLAS kernel. Arithmetic modulo ``module`` is exact, so the extra additions cost no accuracy.
+    """
+    rows, inner, columns = a.shape[-2], a.shape[-1], b.shape[-1]
+    if min(rows, inner, columns) <= cutoff:
+        return _blas_product(a, b, module, workers, chunk_size)
+    a, b = _pad_even(a), _pad_even(b)
+    m, k, p = a.shape[-2] // 2, a.shape[-1] // 2, b.shape[-1] // 2
+    a11, a12, a21, a22 = a[..., :m, :k], a[..., :m, k:], a[..., m:, :k], a[..., m:, k:]
+    b11, b12, b21, b22 = b[..., :k, :p], b[..., :k, p:], b[..., k:, :p], b[..., k:, p:]
+
+    def recurse(left, right):
+        return _strassen_winograd(left, right, module, cutoff, workers, chunk_size)
+
+    s1 = modular_add(a21, a22, module)
+    s2 = modular_subtract(s1, a11, module)
+    s3 = modular_subtract(a11, a21, module)
+    s4 = modular_subtract(a12, s2, module)
+    t1 = modular_subtract(b12, b11, module)
+    t2 = modular_subtract(b22, t1, module)
+    t3 = modular_subtract(b22, b12, module)
+    t4 = modular_subtract(t2, b21, module)
+
+    p1 = recurse(a11, b11)
+    u2 = modular_add(p1, recurse(s2, t2), module)
+    u3 = modular_add(u2, recurse(s3, t3), module)
+    p5 = recurse(s1, t1)
+    u4 = modular_add(u2, p5, module)
+
+    result = np.empty(np.broadcast_shapes(a.shape[:-2], b.shape[:-2]) + (2 * m, 2 * p), dtype=np.uint64)
+    modular_add(p1, recurse(a12, b21), module, out=result[..., :m, :p])
+    modular_add(u4, recurse(s4, b22), module, out=result[..., :m, p:])
+    modular_subtract(u3, recurse(a22, t4), module, out=result[..., m:, :p])
+    modular_add(u3, p5, module, out=result[..., m:, p:])
+    return result[..., :rows, :columns]
+
+
+def modular_matmul(a, b, module, out=None, cutoff=None, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    r"""
+    Computes the matrix product :math:`AB \bmod n` exactly, with the same broadcasting rules as :func:`numpy.matmul`.
+
+    Residues stored in machine words are multiplied with float64 BLAS calls through
+    :func:`~zmodn.utils.float_matmul.float_matmul`, which splits the operands into limbs and tiles the inner dimension
+    so that every float sum stays exact, and reduces only once per tile. When ``cutoff`` is given, products whose
+    dimensions all exceed it go through Strassen-Winograd recursion first. With several ``workers``, every BLAS product
+    is split into blocks of rows computed on a thread pool. Residues stored as Python integers fall back to an object
+    matrix product.
+
+    Args:
+        a (numpy.ndarray): Array of residues of shape ``(..., m, k)`` or ``(k,)``
+        b (numpy.ndarray): Array of residues of shape ``(..., k, p)`` or ``(k,)``
+        module (int): Positive integer modulus
+        out (numpy.ndarray, optional): Array where the result is stored
+        cutoff (int, optional): Dimension at or below which the Strassen-Winograd recursion stops, or ``None`` to
+            multiply directly
+        workers (int, optional): Number of threads, or ``None`` to run in the calling thread
+        chunk_size (int): Smallest number of elements of ``a`` per thread task
+
+    Returns:
+        numpy.ndarray: Product of residues
+    """
+    dtype = np.result_type(a, b)
+    if _is_object(dtype):
+        return _store(_reduce_objects(np.matmul(a, b), module), out)
+    a, b, squeeze = _promote_matmul_operands(a, b)
+    if cutoff is None:
+        product = _blas_product(a, b, module, workers, chunk_size)
+    else:
+        a, b = a.astype(np.uint64), b.astype(np.uint64)
+        product = _strassen_winograd(a, b, module, max(int(cutoff), 1), workers, chunk_size)
+    if squeeze:
+        product = product.squeeze(axis=squeeze)
+    return _narrow(product, dtype, out)
+
+
+def modular_matrix_power(matrix, exponent, module):
+    r"""
+    Raises a square matrix, or a stack of them, to a non-negative integer power by repeated squaring.
+
+    Only :math:`O(\log k)` modular matrix products are needed, each reduced before the next one.
+
+    Args:
+        matrix (numpy.ndarray): Square matrix of residues, or an array of shape ``(..., n, n)``
+        exponent (int): Non-negative integer exponent
+        module (int): Positive integer modulus
+
+    Returns:
+        numpy.ndarray: Matrix power of residues
+    """
+    if exponent < 0:
+        raise ValueError("Exponent must be non-negative")
+    size = matrix.shape[-1]
+    result = None
+    base = matrix
+    while exponent:
+        if exponent & 1:
+            result = base.copy() if result is None else modular_matmul(result, base, module)
+        exponent >>= 1
+        if exponent:
+            base = modular_matmul(base, base, module)
+    if result is None:
+        result = np.zeros_like(matrix)
+        result[..., range(size), range(size)] = 1 % module
+    return result
+
+
+def modular_reduce(kernel, array, module, axis=0, keepdims=False, identity=0):
+    array = np.asarray(array)
+    if axis is None:
+        array = array.reshape(-1)
+        axis = 0
+        if keepdims:
+            raise ValueError("keepdims is not supported with axis=None")
+    axis = axis % max(array.ndim, 1)
+    values = np.moveaxis(array, axis, 0)
+    if values.shape[0] == 0:
+        result = np.full(values.shape[1:], identity % module, dtype=values.dtype)
+    else:
+        while values.shape[0] > 1:
+            half = values.shape[0] // 2
+            stop = 2 * half
+            folded = kernel(values[:half], values[half:stop], module)
+            if values.shape[0] % 2:
+                folded = np.concatenate([folded, values[-1:]])
+            values = folded
+        # Slicing keeps object arrays as arrays, where indexing a vector would return a bare Python integer.
+        result = values[:1].reshape(values.shape[1:]).copy()
+    if keepdims:
+        result = np.expand_dims(result, axis)
+    return result
+
+
+def modular_sum(array, module, axis=0, keepdims=False):
+    array = np.asarray(array)
+    length = array.size if axis is None else array.shape[axis]
+    # Object arrays hold residues modulo numbers above 2**63, which have no uint64 scalar.
+    if not _is_object(array.dtype) and length * (module - 1) <= UINT64_MAX:
+        total = np.add.reduce(array, axis=axis, keepdims=keepdims, dtype=np.uint64)
+        return np.asarray(_reduce(total, np.uint64(module))).astype(array.dtype, copy=False)
+    return modular_reduce(modular_add, array, module, axis=axis, keepdims=keepdims)
+
+
+def modular_accumulate(kernel, array, module, axis=0):
+    values = np.moveaxis(np.array(array, copy=True), axis, 0)
+    shift = 1
+    while shift < values.shape[0]:
+        values[shift:] = kernel(values[shift:], values[:-shift], module)
+        shift *= 2
+    return np.moveaxis(values, 0, axis)
@@ -0,0 +1,521 @@
+import math
+
+import numpy as np
+
+from .extended_gcd import extended_gcd, vectorize_extended_gcd
+from .modular_arithmetic import modular_add, modular_multiply, modular_negative, modular_subtract
+from .modular_inverse import unit_mask, vectorize_modular_inverse
+from .modular_multiplication import DIRECT_PRODUCT_LIMIT
+
+ACCUMULATOR_DTYPES = (np.dtype(np.uint16), np.dtype(np.uint32), np.dtype(np.uint64))
+# Number of matrices eliminated together by the stacked routines, so that the working arrays stay in cache.
+LANE_BLOCK = 1 << 14
+
+
+def _scale_row(row, factor, module):
+    return modular_multiply(row, row.dtype.type(factor % module), module)
+
+
+def _combine_rows(matrix, pivot_row, other_row, column, module):
+    r"""
+    Replaces two rows by a unimodular combination that leaves their gcd in ``pivot_row`` and a zero in ``other_row``.
+    """
+    a, b = int(matrix[pivot_row, column]), int(matrix[other_row, column])
+    gcd, x, y = extended_gcd(a, b)
+    first, second = matrix[pivot_row].copy(), matrix[other_row].copy()
+    matrix[pivot_row] = modular_add(_scale_row(first, x, module), _scale_row(second, y, module), module)
+    matrix[other_row] = modular_subtract(
+        _scale_row(second, a // gcd, module), _scale_row(first, b // gcd, module), module
+    )
+
+
+def _unit_positions(values, module):
+    return np.flatnonzero(unit_mask(values, module))
+
+
+def _swap_rows(matrix, first, second):
+    matrix[[first, second]] = matrix[[second, first]]
+    return -1
+
+
+def _select_pivot(matrix, column, module):
+    r"""
+    Moves a unit of column ``column`` to the diagonal, swapping rows or combining them with the Euclidean algorithm.
+
+    When no unit is available every row below the diagonal is merged into the pivot row, so the rest of the column
+    is zero afterwards. Euclidean combinations have determinant one, so only the row swaps change the sign of the
+    determinant.
+
+    Returns:
+        tuple: Whether the diagonal entry is a unit modulo ``module`` afterwards, and the sign of the row swaps
+    """
+    candidates = matrix[column:, column]
+    units = _unit_positions(candidates, module)
+    if units.size:
+        pivot_row = column + int(units[0])
+        return True, _swap_rows(matrix, column, pivot_row) if pivot_row != column else 1
+    sign = 1
+    for other_row in column + 1 + np.flatnonzero(candidates[1:]):
+        if matrix[column, column] == 0:
+            sign *= _swap_rows(matrix, column, other_row)
+        else:
+            _combine_rows(matrix, column, other_row, column, module)
+    return math.gcd(int(matrix[column, column]), module) == 1, sign
+
+
+def modular_determinant(matrix, module):
+    r"""
+    Computes the determinant of a square matrix over :math:`\mathbb{Z}/n\mathbb{Z}` without floating point.
+
+    The matrix is brought to upper triangular form with unit pivots and vectorized rank-one updates. Columns without a
+    unit entry are cleared with unimodular Euclidean row combinations instead of divisions, so the result is exact for
+    composite moduli as well, in :math:`O(n^3)` integer operations.
+
+    Args:
+        matrix (numpy.ndarray): Square matrix of residues
+        module (int): Positive integer modulus
+
+    Returns:
+        int: Determinant in :math:`[0, module)`
+    """
+    matrix = matrix.copy()
+    determinant = 1 % module
+    for column in range(matrix.shape[0]):
+        unit, sign = _select_pivot(matrix, column, module)
+        pivot = int(matrix[column, column])
+        determinant = determinant * sign * pivot % module
+        if determinant == 0:
+            return 0
+        if unit:
+            below = slice(column + 1, None)
+            pivot_inverse = matrix.dtype.type(pow(pivot, -1, module))
+            factors = modular_multiply(matrix[below, column], pivot_inverse, module)
+            update = modular_multiply(factors[:, np.newaxis], matrix[np.newaxis, column, column:], module)
+            modular_subtract(matrix[below, column:], update, module, out=matrix[below, column:])
+    return determinant
+
+
+def modular_matrix_inverse(matrix, module):
+    r"""
+    Inverts a square matrix over :math:`\mathbb{Z}/n\mathbb{Z}` by Gauss-Jordan elimination on :math:`[A \mid I]`.
+
+    Each column takes a unit of the ring as pivot. When a column has no unit entry, which can happen for composite
+    moduli even if the matrix is invertible, its rows are first merged with unimodular Euclidean combinations until
+    the pivot holds the gcd of the column. Every elimination step is a single vectorized rank-one update, so the
+    whole inverse takes :math:`O(n^3)` exact integer operations.
+
+    Singular matrices are detected by the elimination itself, without a separate determinant: when that gcd is not a
+    unit, some prime factor of ``module`` divides the column below the diagonal, so modulo that prime the column is a
+    combination of the columns already reduced to the identity.
+
+    Args:
+        matrix (numpy.ndarray): Square matrix of residues
+        module (int): Positive integer modulus
+
+    Returns:
+        numpy.ndarray: Inverse matrix of residues
+
+    Raises:
+        ValueError: If the matrix is not invertible modulo ``module``
+    """
+    size = matrix.shape[0]
+    augmented = np.concatenate([matrix, np.eye(size, dtype=matrix.dtype)], axis=1)
+    for column in range(size):
+        unit, _ = _select_pivot(augmented, column, module)
+        if not unit:
+            raise ValueError("Matrix is no invertible")
+        pivot_inverse = pow(int(augmented[column, column]), -1, module)
+        pivot = _scale_row(augmented[column, column:], pivot_inverse, module)
+        augmented[column, column:] = pivot
+        factors = augmented[:, column].copy()
+        factors[column] = 0
+        update = modular_multiply(factors[:, np.newaxis], pivot[np.newaxis, :], module)
+        modular_subtract(augmented[:, column:], update, module, out=augmented[:, column:])
+    return augmented[:, size:].copy()
+
+
+def modular_lu(matrix, module):
+    r"""
+    Factors a square matrix over :math:`\mathbb{Z}/n\mathbb{Z}` as :math:`PA = LU` with unit pivots.
+
+    Args:
+        matrix (numpy.ndarray): Square matrix of residues
+        module (int): Positive integer modulus
+
+    Returns:
+        tuple: Row permutation as an index array, unit lower triangular ``L`` and upper triangular ``U``
+
+    Raises:
+        ValueError: If some column has no unit pivot, which means the matrix is not invertible modulo a prime
+    """
+    size = matrix.shape[0]
+    upper = matrix.copy()
+    lower = np.zeros_like(upper)
+    permutation = np.arange(size)
+    for column in range(size):
+        candidates = upper[column:, column]
+        units = _unit_positions(candidates, module)
+        if not units.size:
+            raise ValueError("Matrix has no LU factorization with unit pivots")
+        pivot_row = column + int(units[0])
+        if pivot_row != column:
+            for array in (upper, lower, permutation):
+                _swap_rows(array, column, pivot_row)
+        below = slice(column + 1, None)
+        pivot_inverse = upper.dtype.type(pow(int(upper[column, column]), -1, module))
+        factors = modular_multiply(upper[below, column], pivot_inverse, module)
+        lower[below, column] = factors
+        update = modular_multiply(factors[:, np.newaxis], upper[np.newaxis, column, column:], module)
+        modular_subtract(upper[below, column:], update, module, out=upper[below, column:])
+    np.fill_diagonal(lower, 1 % module)
+    return permutation, lower, upper
+
+
+def _pairwise_extended_gcd(a, b):
+    if a.dtype != np.dtype(object):
+        a, b = a.astype(np.int64), b.astype(np.int64)
+    return (a, b) + vectorize_extended_gcd(a, b)
+
+
+def _accumulator(dtype, module, updates):
+    r"""
+    Chooses how the rank-one updates of a stacked elimination are accumulated.
+
+    Below :math:`2^{32}` the product of two residues fits in a word, so the update :math:`x + f (n - p)` can replace
+    :math:`x - f p \bmod n` and grows the entries by less than :math:`n^2` each time. Reductions are then deferred
+    until the next update could overflow, in the narrowest of uint16 and uint32 that holds all ``updates`` and in
+    uint64 otherwise.
+
+    Returns:
+        tuple: Accumulator dtype and number of updates between reductions, or ``(None, 0)`` to reduce every update
+    """
+    if dtype == np.dtype(object) or module >= DIRECT_PRODUCT_LIMIT:
+        return None, 0
+    for accumulator in ACCUMULATOR_DTYPES:
+        capacity = (int(np.iinfo(accumulator).max) - module + 1) // max(module * (module - 1), 1)
+        if capacity >= updates or accumulator == ACCUMULATOR_DTYPES[-1]:
+            return accumulator, capacity
+    return None, 0
+
+
+def _to_lanes(matrices, dtype):
+    r"""
+    Copies a stack of shape ``(batch, n, m)`` to a new array of shape ``(n, m, batch)``, so every entry is a contiguous
+    vector over the batch and each NumPy call of the elimination runs over whole lanes instead of rows of a few entries.
+    """
+    return np.array(matrices.transpose(1, 2, 0), dtype=dtype, order="C")
+
+
+def _from_lanes(stack):
+    return stack.transpose(2, 0, 1)
+
+
+def _lane_blocks(count):
+    for start in range(0, count, LANE_BLOCK):
+        yield slice(start, start + LANE_BLOCK)
+
+
+def _reduced(values, module, accumulator):
+    if accumulator is None:
+        return values.copy()
+    modulus = accumulator.type(module)
+    if accumulator.itemsize < 8:
+        # NumPy divides narrow integers by a scalar with a multiplication, which beats its remainder several times.
+        return values - values // modulus * modulus
+    return np.remainder(values, modulus)
+
+
+def _residues(values, module):
+    # Rows accumulated without reduction must be reduced before the modular kernels combine them, while rows stored
+    # in a dtype too narrow to hold ``module`` are reduced already.
+    if values.dtype == np.dtype(object):
+        return np.remainder(values, module)
+    if module > np.iinfo(values.dtype).max:
+        return values
+    return np.remainder(values, values.dtype.type(module))
+
+
+def _subtract_outer(target, factors, pivot, module, accumulator):
+    r"""
+    Subtracts the outer products of ``factors`` and ``pivot`` from ``target`` in place, lane by lane.
+    """
+    if accumulator is None:
+        update = modular_multiply(factors[:, np.newaxis], pivot[np.newaxis], module)
+        modular_subtract(target, update, module, out=target)
+    else:
+        complement = accumulator.type(module) - pivot.astype(accumulator)
+        target += factors.astype(accumulator, copy=False)[:, np.newaxis] * complement[np.newaxis]
+
+
+def _first_units(units, column):
+    r"""
+    Returns, in every lane, the first row from ``column`` down whose entry is a unit, and whether there is one.
+    """
+    pivot_rows = np.full(units.shape[-1], column)
+    found = units[0].copy()
+    # Most lanes already have a unit on the diagonal, which spares the search down the column.
+    if found.all():
+        return pivot_rows, found
+    for offset in range(len(units) - 1, 0, -1):
+        pivot_rows = np.where(units[offset], column + offset, pivot_rows)
+        found |= units[offset]
+    return np.where(units[0], column, pivot_rows), found
+
+
+def _swap_stacked_rows(stack, column, pivot_rows):
+    swapped = pivot_rows != column
+    lanes = np.flatnonzero(swapped)
+    if lanes.size:
+        rows = pivot_rows[lanes]
+        pivots = stack[rows, :, lanes]
+        stack[rows, :, lanes] = stack[column][:, lanes].T
+        stack[column][:, lanes] = pivots.T
+    return swapped
+
+
+def _combine_stacked_rows(stack, lanes, pivot_row, other_row, column, module):
+    r"""
+    Applies :func:`_combine_rows` to the lanes ``lanes`` of a stack at once, with vectorized Bezout coefficients.
+    """
+    first, second = _residues(stack[pivot_row][:, lanes], module), _residues(stack[other_row][:, lanes], module)
+    a, b, gcd, x, y = _pairwise_extended_gcd(first[column], second[column])
+    # Two zero entries have no gcd to divide by; the identity combination keeps both rows.
+    empty = gcd == 0
+    gcd = np.where(empty, 1, gcd)
+    pivot_factor = np.where(empty, 1, a // gcd)
+    other_factor = np.where(empty, 0, b // gcd)
+    x, y, pivot_factor, other_factor = (
+        np.remainder(coefficient, module).astype(stack.dtype) for coefficient in (x, y, pivot_factor, other_factor)
+    )
+    stack[pivot_row][:, lanes] = modular_add(
+        modular_multiply(first, x, module), modular_multiply(second, y, module), module
+    )
+    stack[other_row][:, lanes] = modular_subtract(
+        modular_multiply(second, pivot_factor, module), modular_multiply(first, other_factor, module), module
+    )
+
+
+def _select_stacked_pivots(stack, column, module):
+    r"""
+    Moves a unit of column ``column`` to the diagonal in every lane of a stack of shape ``(n, m, batch)`` at once.
+
+    This is :func:`_select_pivot` vectorized over the batch: the first unit below the diagonal is swapped up, and the
+    lanes without any unit in the column merge their rows with Euclidean combinations, one row at a time for all of
+    them together. The column must be reduced.
+
+    Returns:
+        tuple: Boolean array marking the lanes whose diagonal entry is a unit afterwards, and whether rows were swapped
+    """
+    pivot_rows, found = _first_units(unit_mask(stack[column:, column], module), column)
+    swapped = _swap_stacked_rows(stack, column, pivot_rows)
+    missing = np.flatnonzero(~found)
+    if missing.size:
+        for other_row in range(column + 1, stack.shape[0]):
+            _combine_stacked_rows(stack, missing, column, other_row, column, module)
+        found[missing] = unit_mask(stack[column, column, missing], module)
+    return found, swapped
+
+
+def _gauss_jordan(augmented, module):
+    r"""
+    Reduces a stack of augmented matrices :math:`[A_i \mid B_i]` of shape ``(n, n + k, batch)`` in place to
+    :math:`[I \mid A_i^{-1} B_i]`.
+
+    Returns:
+        numpy.ndarray: Boolean array marking the invertible lanes; the others hold meaningless values
+    """
+    size = augmented.shape[0]
+    accumulator, capacity = _accumulator(augmented.dtype, module, size)
+    stack = augmented if accumulator is None else augmented.astype(accumulator)
+    invertible = np.ones(stack.shape[-1], dtype=bool)
+    pending = 0
+    for column in range(size):
+        if pending == capacity and accumulator is not None:
+            stack[...] = _reduced(stack, module, accumulator)
+            pending = 0
+        stack[:, column] = _reduced(stack[:, column], module, accumulator)
+        unit, _ = _select_stacked_pivots(stack, column, module)
+        invertible &= unit
+        pivot = _reduced(stack[column, column:], module, accumulator).astype(augmented.dtype)
+        pivot[0, ~invertible] = 1 % module
+        pivot = modular_multiply(pivot, vectorize_modular_inverse(pivot[0].copy(), module), module)
+        factors = stack[:, column].copy()
+        factors[column] = 0
+        _subtract_outer(stack[:, column:], factors, pivot, module, accumulator)
+        stack[column, column:] = pivot
+        pending += 1
+    if accumulator is not None:
+        augmented[...] = _reduced(stack, module, accumulator)
+    return invertible
+
+
+def _raise_not_invertible(invertible, batch):
+    failing = np.flatnonzero(~invertible)[:10]
+    positions = [tuple(int(i) for i in position) for position in zip(*np.unravel_index(failing, batch))]
+    if len(batch) == 1:
+        positions = [position for position, in positions]
+    raise ValueError(f"Matrices at positions {positions} are no invertible")
+
+
+def _determinant_lanes(matrices, module):
+    size, dtype = matrices.shape[-1], matrices.dtype
+    accumulator, capacity = _accumulator(dtype, module, size)
+    stack = _to_lanes(matrices, accumulator or dtype)
+    determinants = np.full(stack.shape[-1], 1 % module, dtype=dtype)
+    pending = 0
+    for column in range(size):
+        if pending == capacity and accumulator is not None:
+            stack[...] = _reduced(stack, module, accumulator)
+            pending = 0
+        stack[column:, column] = _reduced(stack[column:, column], module, accumulator)
+        unit, swapped = _select_stacked_pivots(stack, column, module)
+        pivot = _reduced(stack[column, column:], module, accumulator).astype(dtype)
+        determinants = modular_multiply(determinants, pivot[0], module)
+        determinants = np.where(swapped, modular_negative(determinants, module), determinants)
+        following = column + 1
+        if following == size:
+            break
+        # Columns without a unit were cleared by the Euclidean combinations, so a zero factor leaves them unchanged.
+        inverses = np.zeros_like(pivot[0])
+        inverses[unit] = vectorize_modular_inverse(pivot[0, unit], module)
+        factors = modular_multiply(stack[following:, column].astype(dtype), inverses, module)
+        _subtract_outer(stack[following:, column:], factors, pivot, module, accumulator)
+        pending += 1
+    return determinants
+
+
+def _inverse_lanes(matrices, module):
+    r"""
+    Inverts a block of matrices of shape ``(batch, n, n)`` with the classic in-place Gauss-Jordan algorithm.
+
+    Returns:
+        tuple: Lane-last inverses, and a boolean array marking the lanes that had no unit pivot in some column
+    """
+    size, dtype = matrices.shape[-1], matrices.dtype
+    accumulator, capacity = _accumulator(dtype, module, size)
+    stack = _to_lanes(matrices, accumulator or dtype)
+    merged = np.zeros(stack.shape[-1], dtype=bool)
+    pivot_rows = []
+    pending = 0
+    for column in range(size):
+        if pending == capacity and accumulator is not None:
+            stack[...] = _reduced(stack, module, accumulator)
+            pending = 0
+        stack[:, column] = _reduced(stack[:, column], module, accumulator)
+        rows, found = _first_units(unit_mask(stack[column:, column], module), column)
+        merged |= ~found
+        pivot_rows.append(rows)
+        _swap_stacked_rows(stack, column, rows)
+        pivot = _reduced(stack[column], module, accumulator).astype(dtype)
+        pivot[column, merged] = 1 % module
+        pivot_inverses = vectorize_modular_inverse(pivot[column].copy(), module)
+        pivot[column] = 1 % module
+        pivot = modular_multiply(pivot, pivot_inverses, module)
+        factors = stack[:, column].copy()
+        factors[column] = 0
+        stack[:, column] = 0
+        _subtract_outer(stack, factors, pivot, module, accumulator)
+        stack[column] = pivot
+        pending += 1
+    inverses = _reduced(stack, module, accumulator).astype(dtype)
+    for column in reversed(range(size)):
+        # Undo the row swaps on the columns of the inverses, last swap first.
+        _swap_stacked_rows(inverses.transpose(1, 0, 2), column, pivot_rows[column])
+    return inverses, merged
+
+
+def stacked_determinant(matrices, module):
+    r"""
+    Computes the determinants of a stack of square matrices over :math:`\mathbb{Z}/n\mathbb{Z}` all at once.
+
+    Every step of :func:`modular_determinant` runs on a whole block of matrices: one pivot selection and one rank-one
+    update per column, vectorized over the matrices, so a million small matrices cost a few NumPy calls per column
+    and block.
+
+    Args:
+        matrices (numpy.ndarray): Array of residues of shape ``(..., n, n)``
+        module (int): Positive integer modulus
+
+    Returns:
+        numpy.ndarray: Determinants in :math:`[0, module)` with shape ``(...)``
+    """
+    flat = matrices.reshape((-1,) + matrices.shape[-2:])
+    determinants = np.empty(len(flat), dtype=matrices.dtype)
+    for block in _lane_blocks(len(flat)):
+        determinants[block] = _determinant_lanes(flat[block], module)
+    return determinants.reshape(matrices.shape[:-2])
+
+
+def stacked_solve(matrices, rhs, module):
+    r"""
+    Solves the linear systems :math:`A_i X_i = B_i` of a stack of square matrices by batched Gauss-Jordan elimination.
+
+    Every step of :func:`modular_matrix_inverse` runs on a whole block of augmented matrices :math:`[A_i \mid B_i]`:
+    one pivot selection, one vectorized inversion of all the pivots and one rank-one update per column. For moduli
+    below :math:`2^{32}` the updates are accumulated without reduction for as long as they cannot overflow.
+
+    Args:
+        matrices (numpy.ndarray): Array of residues of shape ``(..., n, n)``
+        rhs (numpy.ndarray): Array of residues of shape ``(..., n, k)``, broadcast against ``matrices``
+        module (int): Positive integer modulus
+
+    Returns:
+        numpy.ndarray: Solutions of shape ``(..., n, k)``
+
+    Raises:
+        ValueError: If some matrix is not invertible modulo ``module``, listing the failing positions
+    """
+    size = matrices.shape[-1]
+    if rhs.ndim < 2 or rhs.shape[-2] != size:
+        raise ValueError("Right-hand side must have as many rows as the matrix")
+    batch = np.broadcast_shapes(matrices.shape[:-2], rhs.shape[:-2])
+    dtype = np.result_type(matrices, rhs)
+    matrices = np.broadcast_to(matrices, batch + matrices.shape[-2:]).reshape((-1, size, size))
+    rhs = np.broadcast_to(rhs, batch + rhs.shape[-2:]).reshape((-1,) + rhs.shape[-2:])
+    solutions = np.empty(rhs.shape, dtype=dtype)
+    invertible = np.ones(len(rhs), dtype=bool)
+    for block in _lane_blocks(len(rhs)):
+        augmented = np.concatenate([_to_lanes(matrices[block], dtype), _to_lanes(rhs[block], dtype)], axis=1)
+        invertible[block] = _gauss_jordan(augmented, module)
+        solutions[block] = _from_lanes(augmented[:, size:])
+    if not invertible.all():
+        _raise_not_invertible(invertible, batch)
+    return solutions.reshape(batch + rhs.shape[-2:])
+
+
+def stacked_matrix_inverse(matrices, module):
+    r"""
+    Inverts a stack of square matrices over :math:`\mathbb{Z}/n\mathbb{Z}` by batched in-place Gauss-Jordan elimination.
+
+    The inverses overwrite the matrices column by column, as in the classic in-place algorithm, so each step updates
+    :math:`n^2` entries per matrix instead of the :math:`2n^2` of an augmented matrix, and the row swaps are undone
+    on the columns at the end. Matrices that need Euclidean row combinations, which only happens for composite
+    moduli, are inverted afterwards by Gauss-Jordan elimination on the matrix augmented with the identity.
+
+    Args:
+        matrices (numpy.ndarray): Array of residues of shape ``(..., n, n)``
+        module (int): Positive integer modulus
+
+    Returns:
+        numpy.ndarray: Inverse matrices of residues
+
+    Raises:
+        ValueError: If some matrix is not invertible modulo ``module``, listing the failing positions
+    """
+    size = matrices.shape[-1]
+    flat = matrices.reshape((-1, size, size))
+    inverses = np.empty_like(flat)
+    merged = np.zeros(len(flat), dtype=bool)
+    for block in _lane_blocks(len(flat)):
+        stack, merged[block] = _inverse_lanes(flat[block], module)
+        inverses[block] = _from_lanes(stack)
+    if merged.any():
+        lanes = np.flatnonzero(merged)
+        identity = np.broadcast_to(np.eye(size, dtype=matrices.dtype)[..., np.newaxis], (size, size, lanes.size))
+        augmented = np.concatenate([_to_lanes(flat[lanes], matrices.dtype), identity], axis=1)
+        invertible = np.ones(len(flat), dtype=bool)
+        invertible[lanes] = _gauss_jordan(augmented, module)
+        if not invertible.all():
+            _raise_not_invertible(invertible, matrices.shape[:-2])
+        inverses[lanes] = _from_lanes(augmented[:, size:])
+    return inverses.reshape(matrices.shape)
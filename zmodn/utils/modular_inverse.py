@@ -1,15 +1,146 @@
+import functools
+
 import numpy as np
 
+from .modular_multiplication import multiply_words
+from .primality import is_prime
+
+# Moduli up to this size test units with a cached lookup table instead of a gcd per entry.
+UNIT_TABLE_LIMIT = 1 << 16
+
+
+@functools.lru_cache(maxsize=16)
+def _unit_table(module):
+    return np.gcd(np.arange(module), module) == 1
+
+
+def inverse_table(module):
+    r"""
+    Tabulates the inverse of every residue modulo ``module``, with zeros for the residues that are not units.
+
+    Args:
+        module (int): Positive integer modulus, at most :math:`2^{16}`
+
+    Returns:
+        numpy.ndarray: Array of inverses of length ``module``, with the representative dtype of ``module``
+    """
+    if module > UNIT_TABLE_LIMIT:
+        raise ValueError("Module is too large for an inverse table")
+    residues = np.arange(module, dtype=np.uint64)
+    inverses, _ = batch_modular_inverse(residues, module)
+    return inverses.astype(np.uint8 if module <= 1 << 8 else np.uint16)
+
+
+def unit_mask(integers, module):
+    r"""
+    Marks the residues that are units modulo ``module``, that is, coprime with it.
+
+    Modulo a prime only zero is not a unit, and moduli up to :math:`2^{16}` look the residues up in a cached table, so
+    a gcd per element is only computed for large composite moduli.
+
+    Args:
+        integers (numpy.ndarray): Array of residues in :math:`[0, module)`
+        module (int): Positive integer modulus
+
+    Returns:
+        numpy.ndarray: Boolean array with the shape of ``integers``
+    """
+    integers = np.asarray(integers)
+    if is_prime(module):
+        return integers != 0
+    if integers.dtype == np.dtype(object):
+        return np.gcd(integers, module) == 1
+    if module <= UNIT_TABLE_LIMIT:
+        return _unit_table(module)[integers]
+    return np.gcd(integers.astype(np.uint64), np.uint64(module)) == 1
+
 
-def vectorize_modular_inverse(integers, module):
+def _product_tree(leaves, module):
+    levels = [leaves]
+    while levels[-1].size > 1:
+        level = levels[-1]
+        if level.size % 2:
+            level = np.append(level, np.uint64(1 % module))
+        levels.append(multiply_words(level[0::2], level[1::2], module))
+    return levels
+
+
+def batch_modular_inverse(integers, module):
+    r"""
+    Inverts every residue of an array at once with Montgomery's simultaneous inversion trick.
+
+    The residues are multiplied pairwise into a product tree, the root is inverted with a single modular inversion
+    and the inverses are pushed back down the tree, two products per node. This costs about :math:`3n` vectorized
+    modular products and :math:`\log_2 n` passes for :math:`n` residues, and works for composite moduli as well.
+
+    Args:
+        integers (numpy.ndarray): Array of residues in :math:`[0, module)`
+        module (int): Positive integer modulus
+
+    Returns:
+        tuple: Array of inverses, with zeros where no inverse exists, and a boolean array marking invertible entries
+    """
+    integers = np.asarray(integers)
+    words = integers.astype(np.uint64).ravel()
+    invertible = unit_mask(words, module)
+    levels = _product_tree(np.where(invertible, words, np.uint64(1 % module)), module)
+    inverses = np.array([pow(int(levels[-1][0]), -1, module)], dtype=np.uint64) if words.size else levels[-1]
+    for level in reversed(levels[:-1]):
+        padded = np.append(level, np.uint64(1 % module)) if level.size % 2 else level
+        children = np.empty_like(padded)
+        children[0::2] = multiply_words(inverses, padded[1::2], module)
+        children[1::2] = multiply_words(inverses, padded[0::2], module)
+        stop = level.size
+        inverses = children[:stop]
+    inverses = np.where(invertible, inverses, np.uint64(0))
+    return inverses.astype(integers.dtype).reshape(integers.shape), invertible.reshape(integers.shape)
+
+
+def _object_modular_inverse(integers, module):
+    inverses = np.zeros(integers.shape, dtype=object)
+    invertible = unit_mask(integers, module)
+    inverses[invertible] = [pow(int(integer), -1, module) for integer in integers[invertible]]
+    return inverses, invertible
+
+
+def vectorize_modular_inverse(integers, module, table=None):
+    r"""
+    Computes the modular inverse of every entry of an integer array.
+
+    Args:
+        integers (numpy.ndarray): Array of integers
+        module (int): Positive integer modulus
+        table (numpy.ndarray, optional): Inverses of all residues, as returned by :func:`inverse_table`, which are then
+            looked up instead of computed
+
+    Returns:
+        numpy.ndarray: Array of inverses in :math:`[0, module)`
+
+    Raises:
+        ValueError: If some entry is not coprime with the module, listing the failing positions
+    """
     if not isinstance(integers, np.ndarray):
         raise TypeError("Integers must be a numpy array")
-    if not np.issubdtype(integers.dtype, np.integer):
+    is_object = integers.dtype == np.dtype(object)
+    if is_object and not all(isinstance(integer, (int, np.integer)) for integer in integers.flat):
+        raise TypeError("Integers must be an array of integers")
+    if not is_object and not np.issubdtype(integers.dtype, np.integer):
         raise TypeError("Integers must be an array of integers")
     if not isinstance(module, (np.int64, int)):
         raise TypeError("Module must be an integer")
     if not module > 0:
         raise ValueError("Module must be positive")
-    if not np.all(np.gcd(integers, module) == 1):
-        raise ValueError("All integers and module must be coprime")
-    return np.vectorize(lambda integer, module: pow(integer, module - 2, module), otypes=[int])(integers, module)
+    if integers.size and (integers.min() < 0 or integers.max() >= module):
+        integers = np.remainder(integers, module)
+    if table is not None:
+        inverses = table[integers]
+        # Units never have a zero inverse, except modulo one where every residue is zero.
+        invertible = (inverses != 0) | (module == 1)
+    elif is_object:
+        inverses, invertible = _object_modular_inverse(integers, module)
+    else:
+        inverses, invertible = batch_modular_inverse(integers, module)
+    if not invertible.all():
+        positions = [tuple(int(i) for i in position) for position in np.argwhere(~invertible)[:10]]
+        raise ValueError(f"Integers at positions {positions} are not coprime with the module")
+    return inverses
@@ -0,0 +1,129 @@
+import functools
+
+import numpy as np
+
+UINT64_MASK = (1 << 64) - 1
+MASK32 = np.uint64(0xFFFFFFFF)
+SHIFT32 = np.uint64(32)
+
+# Largest modulus for which every product of two residues fits in an unsigned 64-bit word.
+DIRECT_PRODUCT_LIMIT = 1 << 32
+# Largest modulus for which a float64 estimate of the quotient is off by at most one.
+FLOAT_QUOTIENT_LIMIT = 1 << 50
+# Largest modulus handled by the Montgomery kernel, which needs 2 * module to fit in a word.
+WORD_MODULUS_LIMIT = 1 << 63
+# Number of elements processed at a time by the multi-pass kernels, so that temporaries stay in cache.
+CHUNK_SIZE = 1 << 14
+
+
+def multiply_wide(x, y):
+    r"""
+    Computes the full 128-bit products of two arrays of unsigned 64-bit integers.
+
+    Returns:
+        tuple: High and low 64-bit words of the products
+    """
+    x_low, x_high = x & MASK32, x >> SHIFT32
+    y_low, y_high = y & MASK32, y >> SHIFT32
+    low_high = x_low * y_high
+    high_low = x_high * y_low
+    middle = x_low * y_low
+    middle >>= SHIFT32
+    middle += low_high & MASK32
+    middle += high_low & MASK32
+    middle >>= SHIFT32
+    high = x_high * y_high
+    high += low_high >> SHIFT32
+    high += high_low >> SHIFT32
+    high += middle
+    return high, x * y
+
+
+def _conditional_subtract(values, module):
+    return np.minimum(values, values - module, out=values)
+
+
+def _multiply_direct(a, b, module):
+    return np.remainder(a * b, np.uint64(module))
+
+
+def _multiply_float_quotient(a, b, module):
+    quotient = np.floor(a.astype(np.float64) * b.astype(np.float64) / float(module))
+    modulus = np.uint64(module)
+    remainder = a * b - quotient.astype(np.uint64) * modulus
+    remainder += modulus
+    _conditional_subtract(remainder, modulus)
+    return _conditional_subtract(remainder, modulus)
+
+
+def _montgomery_reduce(high, low, module, negative_inverse):
+    quotient = low * negative_inverse
+    product_high, _ = multiply_wide(quotient, module)
+    high += product_high
+    high += low != 0
+    return _conditional_subtract(high, module)
+
+
+@functools.lru_cache(maxsize=64)
+def word_montgomery_constants(module):
+    r"""
+    Returns the constants of Montgomery arithmetic with :math:`R = 2^{64}` for an odd word ``module``.
+
+    Returns:
+        tuple: :math:`-n^{-1} \bmod 2^{64}` and :math:`R^2 \bmod n`, as uint64 scalars
+    """
+    return np.uint64(-pow(module, -1, 1 << 64) & UINT64_MASK), np.uint64(pow(2, 128, module))
+
+
+def _multiply_montgomery(a, b, module):
+    negative_inverse, montgomery_square = word_montgomery_constants(module)
+    module = np.uint64(module)
+    result = np.empty(np.broadcast_shapes(a.shape, b.shape), dtype=np.uint64)
+    a, b, flat = np.broadcast_to(a, result.shape).ravel(), np.broadcast_to(b, result.shape).ravel(), result.ravel()
+    for start in range(0, flat.size, CHUNK_SIZE):
+        stop = start + CHUNK_SIZE
+        reduced = _montgomery_reduce(*multiply_wide(a[start:stop], b[start:stop]), module, negative_inverse)
+        high, low = multiply_wide(reduced, montgomery_square)
+        flat[start:stop] = _montgomery_reduce(high, low, module, negative_inverse)
+    return result
+
+
+def _multiply_odd(a, b, module):
+    if module <= DIRECT_PRODUCT_LIMIT:
+        return _multiply_direct(a, b, module)
+    if module <= FLOAT_QUOTIENT_LIMIT:
+        return _multiply_float_quotient(a, b, module)
+    return _multiply_montgomery(a, b, module)
+
+
+def multiply_words(a, b, module):
+    r"""
+    Computes :math:`a b \bmod n` exactly for arrays of unsigned 64-bit residues and any modulus below :math:`2^{63}`.
+
+    Small moduli multiply directly in 64 bits, moduli up to :math:`2^{50}` correct a float64 quotient estimate and
+    larger odd moduli use Montgomery reduction on 32-bit limbs. Even moduli are split into a power of two, where the
+    product is simply truncated, and an odd part, and recombined with the Chinese remainder theorem.
+
+    Args:
+        a (numpy.ndarray): Array of residues with dtype uint64
+        b (numpy.ndarray): Array of residues with dtype uint64
+        module (int): Modulus below :math:`2^{63}`
+
+    Returns:
+        numpy.ndarray: Array of residues with dtype uint64
+    """
+    if module > WORD_MODULUS_LIMIT:
+        raise ValueError("Module must be smaller than 2**63")
+    if module & 1 or module <= DIRECT_PRODUCT_LIMIT:
+        return _multiply_odd(a, b, module)
+    exponent = (module & -module).bit_length() - 1
+    odd_part = module >> exponent
+    power_mask = np.uint64((1 << exponent) - 1)
+    power_part = (a * b) & power_mask
+    if odd_part == 1:
+        return power_part
+    odd_module = np.uint64(odd_part)
+    odd_residue = _multiply_odd(a % odd_module, b % odd_module, odd_part)
+    odd_inverse = np.uint64(pow(odd_part, -1, 1 << 64))
+    lift = ((power_part - odd_residue) * odd_inverse) & power_mask
+    return odd_residue + odd_module * lift
@@ -0,0 +1,199 @@
+import functools
+
+import numpy as np
+
+LIMB_BITS = 32
+LIMB_MASK = np.uint64((1 << LIMB_BITS) - 1)
+LIMB_SHIFT = np.uint64(LIMB_BITS)
+# Widest modulus, in limbs, handled by the limb kernels. Beyond 4 limbs (128 bits) the quadratic number of vectorized
+# limb products is slower than Python's own big-integer arithmetic on object arrays.
+MULTI_LIMB_LIMIT = 4
+
+
+def limb_count(module):
+    r"""
+    Returns the number of 32-bit limbs needed to hold ``module`` itself, and so every residue modulo ``module``.
+    """
+    return max(-(-module.bit_length() // LIMB_BITS), 1)
+
+
+def to_limbs(integers, count):
+    r"""
+    Splits an array of non-negative integers below :math:`2^{32 count}` into 32-bit limbs.
+
+    Args:
+        integers (numpy.ndarray): Array of Python integers
+        count (int): Number of limbs
+
+    Returns:
+        numpy.ndarray: Limbs with dtype uint64 and shape ``(count, *integers.shape)``, least significant first
+    """
+    integers = np.asarray(integers, dtype=object)
+    data = b"".join(int(integer).to_bytes(4 * count, "little") for integer in integers.flat)
+    limbs = np.frombuffer(data, dtype="<u4").reshape(integers.size, count).T.astype(np.uint64)
+    return limbs.reshape((count,) + integers.shape)
+
+
+def from_limbs(limbs):
+    r"""
+    Joins 32-bit limbs back into Python integers.
+
+    Args:
+        limbs (numpy.ndarray): Limbs of shape ``(count, ...)``, least significant first
+
+    Returns:
+        numpy.ndarray: Array of Python integers with dtype object
+    """
+    count = limbs.shape[0]
+    rows = np.ascontiguousarray(limbs.reshape(count, -1).T).astype("<u4")
+    result = np.empty(len(rows), dtype=object)
+    result[:] = [int.from_bytes(row.tobytes(), "little") for row in rows]
+    return result.reshape(limbs.shape[1:])
+
+
+@functools.lru_cache(maxsize=64)
+def _modulus_limbs(module):
+    return to_limbs(np.array([module], dtype=object), limb_count(module))[:, 0]
+
+
+@functools.lru_cache(maxsize=64)
+def montgomery_constants(module):
+    r"""
+    Returns the constants of Montgomery arithmetic with :math:`R = 2^{32 L}` for an odd ``module`` of ``L`` limbs.
+
+    Returns:
+        tuple: :math:`-n^{-1} \bmod 2^{32}`, and the limbs of :math:`R \bmod n` and :math:`R^2 \bmod n`
+    """
+    count = limb_count(module)
+    radix = 1 << (LIMB_BITS * count)
+    negative_inverse = np.uint64(-pow(module, -1, 1 << LIMB_BITS) % (1 << LIMB_BITS))
+    constants = to_limbs(np.array([radix % module, radix * radix % module], dtype=object), count)
+    return negative_inverse, constants[:, 0], constants[:, 1]
+
+
+def _column(limbs, ndim):
+    return limbs.reshape((len(limbs),) + (1,) * ndim)
+
+
+def _propagate_carries(values):
+    for limb in range(values.shape[0] - 1):
+        following = limb + 1
+        values[following] += values[limb] >> LIMB_SHIFT
+        values[limb] &= LIMB_MASK
+    return values
+
+
+def _subtract_modulus_if_greater(values, module):
+    r"""
+    Returns ``values - module`` where it is non-negative and ``values`` elsewhere, for normalized limbs of one limb
+    more than the modulus.
+    """
+    count = values.shape[0] - 1
+    modulus = _column(_modulus_limbs(module).astype(np.int64), values.ndim - 1)
+    difference = values.astype(np.int64)
+    difference[:count] -= modulus
+    for limb in range(count):
+        following = limb + 1
+        borrow = difference[limb] < 0
+        difference[limb] += borrow.astype(np.int64) << LIMB_BITS
+        difference[following] -= borrow
+    keep = difference[count] >= 0
+    return np.where(keep, difference[:count].astype(np.uint64), values[:count])
+
+
+def limb_add(a, b, module):
+    r"""
+    Adds residues stored as 32-bit limbs modulo ``module``, propagating carries across limbs.
+
+    Args:
+        a (numpy.ndarray): Limbs of shape ``(count, ...)``
+        b (numpy.ndarray): Limbs of shape ``(count, ...)``, broadcast against ``a``
+        module (int): Modulus of ``count`` limbs
+
+    Returns:
+        numpy.ndarray: Limbs of the sums
+    """
+    a, b = np.broadcast_arrays(a, b)
+    total = np.zeros((a.shape[0] + 1,) + a.shape[1:], dtype=np.uint64)
+    np.add(a, b, out=total[:-1])
+    return _subtract_modulus_if_greater(_propagate_carries(total), module)
+
+
+def limb_subtract(a, b, module):
+    r"""
+    Subtracts residues stored as 32-bit limbs modulo ``module``, propagating borrows across limbs.
+
+    Args:
+        a (numpy.ndarray): Limbs of shape ``(count, ...)``
+        b (numpy.ndarray): Limbs of shape ``(count, ...)``, broadcast against ``a``
+        module (int): Modulus of ``count`` limbs
+
+    Returns:
+        numpy.ndarray: Limbs of the differences
+    """
+    a, b = np.broadcast_arrays(a, b)
+    count = a.shape[0]
+    difference = np.zeros((count + 1,) + a.shape[1:], dtype=np.int64)
+    np.subtract(a.astype(np.int64), b.astype(np.int64), out=difference[:count])
+    for limb in range(count):
+        following = limb + 1
+        borrow = difference[limb] < 0
+        difference[limb] += borrow.astype(np.int64) << LIMB_BITS
+        difference[following] -= borrow
+    wrapped = difference[count] < 0
+    modulus = _column(_modulus_limbs(module), a.ndim - 1)
+    total = np.zeros((count + 1,) + a.shape[1:], dtype=np.uint64)
+    total[:count] = difference[:count].astype(np.uint64)
+    total[:count] += np.where(wrapped, modulus, np.uint64(0))
+    return _propagate_carries(total)[:count]
+
+
+def limb_negative(a, module):
+    r"""
+    Negates residues stored as 32-bit limbs modulo ``module``.
+    """
+    return limb_subtract(np.zeros_like(a), a, module)
+
+
+def montgomery_multiply(a, b, module):
+    r"""
+    Computes the Montgomery products :math:`a b R^{-1} \bmod n` of residues stored as 32-bit limbs.
+
+    The operand-scanning loop runs once per limb of ``a`` and is vectorized over all the elements and all the limbs
+    of ``b`` at once. Partial products are split into 32-bit halves and accumulated without carries, which is exact
+    because each accumulator receives fewer than :math:`2^{31}` terms, and carries are propagated only once at the
+    end.
+
+    Args:
+        a (numpy.ndarray): Limbs of shape ``(count, ...)``
+        b (numpy.ndarray): Limbs of shape ``(count, ...)``, broadcast against ``a``
+        module (int): Odd modulus of ``count`` limbs
+
+    Returns:
+        numpy.ndarray: Limbs of the Montgomery products, in :math:`[0, n)`
+    """
+    negative_inverse = montgomery_constants(module)[0]
+    a, b = np.broadcast_arrays(a, b)
+    count, shape = a.shape[0], a.shape[1:]
+    a, b = a.reshape(count, -1), b.reshape(count, -1)
+    modulus = _modulus_limbs(module)[:, np.newaxis]
+    accumulator = np.zeros((2 * count + 1, a.shape[1]), dtype=np.uint64)
+    low, high = np.empty_like(b), np.empty_like(b)
+    for limb in range(count):
+        stop = limb + count + 1
+        window = accumulator[limb:stop]
+        np.multiply(a[limb], b, out=low)
+        np.right_shift(low, LIMB_SHIFT, out=high)
+        low &= LIMB_MASK
+        window[:count] += low
+        window[1:] += high
+        quotient = (window[0] * negative_inverse) & LIMB_MASK
+        np.multiply(quotient, modulus, out=low)
+        np.right_shift(low, LIMB_SHIFT, out=high)
+        low &= LIMB_MASK
+        window[:count] += low
+        window[1:] += high
+        window[1] += window[0] >> LIMB_SHIFT
+    stop = 2 * count + 1
+    result = _propagate_carries(accumulator[count:stop])
+    return _subtract_modulus_if_greater(result, module).reshape((count,) + shape)
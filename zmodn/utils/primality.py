@@ -0,0 +1,150 @@
+import collections
+import functools
+import itertools
+import math
+
+# Bases for which the Miller-Rabin test is deterministic below 4759123141.
+WORD_WITNESSES = (2, 7, 61)
+WORD_WITNESS_LIMIT = 4759123141
+# Bases for which the Miller-Rabin test is deterministic below 2**64.
+LONG_WITNESSES = (2, 325, 9375, 28178, 450775, 9780504, 1795265022)
+LONG_WITNESS_LIMIT = 1 << 64
+# Bases for which the Miller-Rabin test is deterministic below 3317044064679887385961981; beyond this bound the
+# test only certifies strong probable primes.
+WIDE_WITNESSES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+# Factors below this bound are found by trial division, larger ones by Pollard's rho method.
+TRIAL_DIVISION_LIMIT = 1 << 10
+# Number of steps of the rho walk whose differences share a single gcd.
+RHO_BATCH = 128
+
+
+def _is_strong_probable_prime(number, witness, odd_part, exponent):
+    value = pow(witness, odd_part, number)
+    if value in (1, number - 1):
+        return True
+    for _ in range(exponent - 1):
+        value = value * value % number
+        if value == number - 1:
+            return True
+    return False
+
+
+@functools.lru_cache(maxsize=1024)
+def is_prime(number):
+    r"""
+    Tests whether ``number`` is prime with the Miller-Rabin test.
+
+    The witnesses are chosen from the size of ``number`` so that the answer is exact for every integer below
+    :math:`3.3 \cdot 10^{24}`, which covers every modulus the word kernels handle. Results are cached.
+
+    Args:
+        number (int): Integer to test
+
+    Returns:
+        bool: Whether ``number`` is prime
+    """
+    number = int(number)
+    if number < 2 or number % 2 == 0:
+        return number == 2
+    if number < WORD_WITNESS_LIMIT:
+        witnesses = WORD_WITNESSES
+    elif number < LONG_WITNESS_LIMIT:
+        witnesses = LONG_WITNESSES
+    else:
+        witnesses = WIDE_WITNESSES
+    odd_part, exponent = number - 1, 0
+    while odd_part % 2 == 0:
+        odd_part, exponent = odd_part // 2, exponent + 1
+    for witness in witnesses:
+        if witness % number == 0:
+            continue
+        if not _is_strong_probable_prime(number, witness, odd_part, exponent):
+            return False
+    return True
+
+
+def _pollard_brent(number):
+    r"""
+    Finds a nontrivial factor of an odd composite ``number`` with Brent's variant of Pollard's rho method.
+
+    The walk :math:`x \mapsto x^2 + c` is run with cycle detection by powers of two, and the differences are multiplied
+    together so that a single gcd covers :data:`RHO_BATCH` steps. A walk that collapses to ``number`` itself is
+    retried with the next constant ``c``.
+    """
+    for constant in itertools.count(1):
+        x = y = saved = 2
+        factor, product, length = 1, 1, 1
+        while factor == 1:
+            x = y
+            for _ in range(length):
+                y = (y * y + constant) % number
+            steps = 0
+            while steps < length and factor == 1:
+                saved = y
+                for _ in range(min(RHO_BATCH, length - steps)):
+                    y = (y * y + constant) % number
+                    product = product * abs(x - y) % number
+                factor = math.gcd(product, number)
+                steps += RHO_BATCH
+            length *= 2
+        if factor == number:
+            # The batch overshot the collision, so the steps since the last gcd are replayed one by one.
+            factor = 1
+            while factor == 1:
+                saved = (saved * saved + constant) % number
+                factor = math.gcd(abs(x - saved), number)
+        if factor != number:
+            return factor
+
+
+def _prime_factors(number):
+    if is_prime(number):
+        return [number]
+    factor = _pollard_brent(number)
+    return _prime_factors(factor) + _prime_factors(number // factor)
+
+
+@functools.lru_cache(maxsize=256)
+def factorize(number):
+    r"""
+    Factors a positive integer into primes by trial division and Pollard's rho method.
+
+    Factors below :data:`TRIAL_DIVISION_LIMIT` are divided out over the divisors :math:`6k \pm 1`, and composite
+    cofactors are then split with Brent's variant of Pollard's rho method, which finds a prime factor :math:`p` in
+    about :math:`\sqrt{p}` steps. Every 64-bit integer is factored within milliseconds, but products of two primes
+    above :math:`2^{40}` take long. Results are cached.
+
+    Args:
+        number (int): Positive integer to factor
+
+    Returns:
+        tuple: Pairs ``(prime, exponent)`` in increasing order of the primes
+
+    Raises:
+        ValueError: If ``number`` is not positive
+    """
+    number = int(number)
+    if number < 1:
+        raise ValueError("Number must be positive")
+    factors = []
+
+    def divide_out(divisor):
+        nonlocal number
+        exponent = 0
+        while number % divisor == 0:
+            number, exponent = number // divisor, exponent + 1
+        if exponent:
+            factors.append((divisor, exponent))
+
+    divide_out(2)
+    divide_out(3)
+    divisor = 5
+    while divisor < TRIAL_DIVISION_LIMIT and divisor * divisor <= number:
+        divide_out(divisor)
+        divide_out(divisor + 2)
+        divisor += 6
+    if number > 1 and divisor * divisor > number:
+        factors.append((number, 1))
+    elif number > 1:
+        factors.extend(collections.Counter(_prime_factors(number)).items())
+    return tuple(sorted(factors))
@@ -0,0 +1,114 @@
+import functools
+import math
+
+import numpy as np
+
+from .primality import is_prime
+
+# Channel moduli stay below 2**32 so that the product of two residues fits in an unsigned 64-bit word.
+CHANNEL_LIMIT = 1 << 32
+
+
+@functools.lru_cache(maxsize=None)
+def channel_primes(count):
+    r"""
+    Returns the ``count`` largest primes below :math:`2^{32}`, in decreasing order.
+
+    Args:
+        count (int): Number of channels
+
+    Returns:
+        tuple: Channel primes
+    """
+    primes = []
+    candidate = CHANNEL_LIMIT - 1
+    while len(primes) < count:
+        if is_prime(candidate):
+            primes.append(candidate)
+        candidate -= 2
+    return tuple(primes)
+
+
+def channels_for(bound):
+    r"""
+    Returns the number of channel primes whose product exceeds ``bound``.
+
+    Args:
+        bound (int): Exclusive upper bound of the integers to represent
+
+    Returns:
+        int: Number of channels
+    """
+    count, product = 0, 1
+    while product < bound:
+        count += 1
+        product = math.prod(channel_primes(count))
+    return max(count, 1)
+
+
+def channel_column(primes, ndim):
+    r"""
+    Returns the channel primes as a uint64 array that broadcasts against residues with ``ndim`` value dimensions.
+    """
+    return np.array(primes, dtype=np.uint64).reshape((len(primes),) + (1,) * ndim)
+
+
+def rns_encode(integers, primes):
+    r"""
+    Converts an array of non-negative integers to its residues modulo every channel prime.
+
+    Args:
+        integers (numpy.ndarray): Array of non-negative integers, of any dtype including object
+        primes (tuple): Channel primes
+
+    Returns:
+        numpy.ndarray: Residues with dtype uint64 and shape ``(len(primes), *integers.shape)``
+    """
+    integers = np.asarray(integers, dtype=object)
+    residues = np.empty((len(primes),) + integers.shape, dtype=np.uint64)
+    for channel, prime in enumerate(primes):
+        residues[channel] = np.remainder(integers, prime).astype(np.uint64)
+    return residues
+
+
+def _limb_matrix(integers, limbs):
+    data = b"".join(integer.to_bytes(2 * limbs, "little") for integer in integers)
+    return np.frombuffer(data, dtype="<u2").reshape(len(integers), limbs).astype(np.float64)
+
+
+def crt_reconstruct(residues, primes):
+    r"""
+    Recovers the integers in :math:`[0, \prod p_i)` with the given residues by the Chinese remainder theorem.
+
+    The reconstruction :math:`\sum_i t_i M_i` is computed as a float64 matrix product of the 16-bit halves of the
+    scaled residues :math:`t_i` with the 16-bit limbs of the cofactors :math:`M_i`, which is exact because every sum
+    stays below :math:`2^{53}`. Carries are then propagated limb by limb over the whole array, so only the final
+    conversion to Python integers runs per element.
+
+    Args:
+        residues (numpy.ndarray): Residues of shape ``(len(primes), ...)``
+        primes (tuple): Channel primes
+
+    Returns:
+        numpy.ndarray: Array of Python integers with dtype object
+    """
+    product = math.prod(primes)
+    column = channel_column(primes, residues.ndim - 1)
+    cofactors = [product // prime for prime in primes]
+    inverses = channel_column(
+        [pow(cofactor, -1, prime) for cofactor, prime in zip(cofactors, primes)], residues.ndim - 1
+    )
+    scaled = np.remainder(residues * inverses, column).reshape(len(primes), -1).T
+    # The sum is below len(primes) * product, so a few limbs on top of those of the product absorb the carries.
+    limbs = -(-(product * len(primes)).bit_length() // 16) + 1
+    cofactor_limbs = _limb_matrix(cofactors, limbs)
+    low = np.matmul((scaled & np.uint64(0xFFFF)).astype(np.float64), cofactor_limbs).astype(np.uint64)
+    high = np.matmul((scaled >> np.uint64(16)).astype(np.float64), cofactor_limbs).astype(np.uint64)
+    sums = low + (high << np.uint64(16))
+    for limb in range(limbs - 1):
+        following = limb + 1
+        sums[:, following] += sums[:, limb] >> np.uint64(16)
+    data = (sums & np.uint64(0xFFFF)).astype("<u2")
+    result = np.empty(len(data), dtype=object)
+    result[:] = [int.from_bytes(row.tobytes(), "little") % product for row in data]
+    return result.reshape(residues.shape[1:])
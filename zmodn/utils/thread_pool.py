@@ -0,0 +1,95 @@
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Default number of elements per task; smaller chunks cost more in scheduling than they gain in parallelism.
+DEFAULT_CHUNK_SIZE = 1 << 18
+
+
+def run_tasks(task, starts, workers):
+    r"""
+    Calls ``task`` on every start index, spread over a pool of ``workers`` threads.
+
+    NumPy releases the GIL inside its loops, so tasks made of large array operations run on several cores at once.
+    Exceptions raised by a task propagate to the caller.
+    """
+    starts = list(starts)
+    if workers is None or workers < 2 or len(starts) < 2:
+        for start in starts:
+            task(start)
+        return
+    with ThreadPoolExecutor(max_workers=min(workers, len(starts))) as pool:
+        for _ in pool.map(task, starts):
+            pass
+
+
+def parallel_elementwise(kernel, a, b, module, out=None, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    r"""
+    Applies a binary elementwise kernel in chunks spread over a thread pool.
+
+    Operands with the full broadcast shape are split into flat chunks of ``chunk_size`` elements; operands that need
+    broadcasting are split along their leading axis instead. Arrays with at most ``chunk_size`` elements, or a single
+    worker, call the kernel directly.
+
+    Args:
+        kernel (callable): Kernel with signature ``kernel(a, b, module, out=None)``
+        a (numpy.ndarray): First array of residues
+        b (numpy.ndarray): Second array of residues
+        module (int): Positive integer modulus
+        out (numpy.ndarray, optional): Array where the result is stored
+        workers (int, optional): Number of threads, or ``None`` to run in the calling thread
+        chunk_size (int): Number of elements per task
+
+    Returns:
+        numpy.ndarray: Result of the kernel
+    """
+    a, b = np.asarray(a), np.asarray(b)
+    shape = np.broadcast_shapes(a.shape, b.shape)
+    chunk_size = max(int(chunk_size), 1)
+    if workers is None or workers < 2 or math.prod(shape) <= chunk_size:
+        return kernel(a, b, module, out=out)
+    result = np.empty(shape, dtype=np.result_type(a, b)) if out is None else out
+    if result.flags.c_contiguous and all(operand.shape == shape or operand.size == 1 for operand in (a, b)):
+        operands = [operand.reshape(-1) if operand.shape == shape else operand.reshape(1) for operand in (a, b)]
+        target, step = result.reshape(-1), chunk_size
+    else:
+        operands = [operand.reshape((1,) * (len(shape) - operand.ndim) + operand.shape) for operand in (a, b)]
+        target, step = result, max(chunk_size // max(math.prod(shape[1:]), 1), 1)
+
+    def task(start):
+        stop = start + step
+        chunks = [operand[start:stop] if operand.shape[0] > 1 else operand for operand in operands]
+        kernel(*chunks, module, out=target[start:stop])
+
+    run_tasks(task, range(0, target.shape[0], step), workers)
+    return result
+
+
+def parallel_rows(product, a, b, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    r"""
+    Computes a matrix product in blocks of rows of ``a`` spread over a thread pool.
+
+    Args:
+        product (callable): Function returning the product of a block of rows of ``a`` with ``b``
+        a (numpy.ndarray): Array of shape ``(..., m, k)``
+        b (numpy.ndarray): Array of shape ``(..., k, p)``
+        workers (int, optional): Number of threads, or ``None`` to run in the calling thread
+        chunk_size (int): Smallest number of elements of ``a`` per task
+
+    Returns:
+        numpy.ndarray: Product of ``a`` and ``b``
+    """
+    rows = a.shape[-2]
+    step = max(-(-rows // workers) if workers else rows, -(-max(int(chunk_size), 1) // max(a.shape[-1], 1)), 1)
+    if workers is None or workers < 2 or step >= rows:
+        return product(a, b)
+    blocks = {}
+
+    def task(start):
+        stop = start + step
+        blocks[start] = product(a[..., start:stop, :], b)
+
+    starts = range(0, rows, step)
+    run_tasks(task, starts, workers)
+    return np.concatenate([blocks[start] for start in starts], axis=-2)
@@ -2,26 +2,17 @@ def validate_matrix(matrix):
     if not isinstance(matrix, list) and not isinstance(matrix, int):
         return False
 
-    row_length = None
     if isinstance(matrix, int):
         return [matrix]
 
-    for row in matrix:
-        if isinstance(row, int):
-            if row_length is None:
-                row_length = 1
-            elif row_length != 1:
-                return False
-        elif isinstance(row, list):
-            if row_length is None:
-                row_length = len(row)
-            elif row_length != len(row):
-                return False
-
-            for element in row:
-                if not isinstance(element, int):
-                    return False
-        else:
+    # Walk the nested lists one depth at a time, so stacks of matrices of any depth are accepted as long as every list
+    # at the same depth has the same length and the innermost lists hold integers only.
+    rows = [matrix]
+    while rows:
+        if all(isinstance(row, int) for row in rows):
+            return matrix
+        if not all(isinstance(row, list) and len(row) == len(rows[0]) for row in rows):
             return False
+        rows = [element for row in rows for element in row]
 
     return matrix